@@ -0,0 +1,16 @@
+"""
+benchmarks
+----------
+Mediciones de rendimiento del compilador CAOS y del IDE.
+
+Cada módulo se ejecuta por separado desde la raíz del repositorio:
+    python -m benchmarks.bench_tokens
+    python -m benchmarks.bench_highlight     (necesita pantalla: usa Tk)
+    python -m benchmarks.bench_highlight_pipeline
+    python -m benchmarks.bench_lexer         (resultados en JSON)
+    python -m benchmarks.bench_intermedio    (resultados en JSON)
+
+corpus.py genera los programas CAOS sintéticos de tamaño y mezcla
+configurables que usan las mediciones (python -m benchmarks.corpus);
+medicion.py, el cronómetro y el programa de muestra que comparten.
+"""
@@ -0,0 +1,117 @@
+"""
+bench_highlight.py
+------------------
+Compara el resaltado de sintaxis del IDE sobre archivos generados a partir
+de ide/samples/TestIDE.caos:
+
+    antiguo → el algoritmo anterior: quitar todos los tags, recorrer el texto
+              completo con el regex, convertir cada extremo con
+              text.index("1.0 + Nc") (una consulta a Tk que recorre el texto
+              desde el inicio) y un tag_add por token
+    nuevo   → SyntaxHighlighter con viewport=False (documento completo):
+              tokens del DFALexer (TokenCache nueva en cada vuelta, así que
+              incluye la tokenización), posiciones → línea.columna con la
+              tabla de inicios de línea y un tag_add por tag con muchos rangos
+    tecla   → el nuevo, tras insertar un carácter a mitad del archivo
+
+Necesita una pantalla (crea una ventana Tk oculta). El algoritmo antiguo es
+cuadrático, así que solo se mide hasta --max-antiguo líneas.
+
+Uso:
+    python -m benchmarks.bench_highlight [--lineas 1000 5000 20000] [--max-antiguo N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tkinter as tk
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_IDE_DIR = os.path.join(_RAIZ, "ide")
+if _IDE_DIR not in sys.path:
+    sys.path.insert(0, _IDE_DIR)
+
+from core.token_cache import LEXER_DISPONIBLE, TokenCache  # noqa: E402
+from ui.highlighter import (  # noqa: E402
+    RESERVED_WORDS,
+    TAG_COLORS,
+    SyntaxHighlighter,
+    _COMBINED_PATTERN,
+)
+
+from benchmarks.medicion import cronometrar, generar_muestra  # noqa: E402
+
+
+def _resaltar_antiguo(text: tk.Text) -> None:
+    """Réplica del _apply_highlight anterior (documento completo)."""
+    content = text.get("1.0", tk.END)
+    for tag in TAG_COLORS:
+        text.tag_remove(tag, "1.0", tk.END)
+    for match in _COMBINED_PATTERN.finditer(content):
+        start = text.index(f"1.0 + {match.start()}c")
+        end = text.index(f"1.0 + {match.end()}c")
+        tag = None
+        for group_name, value in match.groupdict().items():
+            if value is not None:
+                tag = group_name.rsplit("_", 1)[0]
+                break
+        if tag == "identifier" and match.group() in RESERVED_WORDS:
+            tag = "reserved"
+        text.tag_add(tag, start, end)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del resaltado de sintaxis")
+    parser.add_argument("--lineas", type=int, nargs="+", default=[1000, 5000, 20000],
+                        help="Tamaños de archivo a medir, en líneas")
+    parser.add_argument("--max-antiguo", type=int, default=5000,
+                        help="Tamaño máximo para el algoritmo antiguo (por defecto: 5000)")
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    root.withdraw()
+
+    print(f"{'líneas':>8} {'antiguo (s)':>12} {'nuevo (s)':>10} {'tecla (ms)':>11} {'aceleración':>12}")
+    print("-" * 57)
+    for lineas in args.lineas:
+        source = generar_muestra(lineas)
+
+        antiguo = None
+        if lineas <= args.max_antiguo:
+            text = tk.Text(root)
+            text.insert("1.0", source)
+            antiguo = cronometrar(lambda: _resaltar_antiguo(text), vueltas=1)
+            text.destroy()
+
+        text = tk.Text(root)
+        text.insert("1.0", source)
+        highlighter = SyntaxHighlighter(text, viewport=False)
+
+        def completo():
+            if LEXER_DISPONIBLE:
+                highlighter.token_cache = TokenCache()
+            highlighter._reiniciar_cache()
+            highlighter._apply_highlight()
+
+        def tecla():
+            text.insert(f"{lineas // 2}.0", "x")
+            highlighter._apply_highlight()
+
+        nuevo = cronometrar(completo)
+        por_tecla = cronometrar(tecla, vueltas=10)
+        text.destroy()
+
+        columna_antiguo = f"{antiguo:>12.3f}" if antiguo is not None else f"{'—':>12}"
+        aceleracion = f"{antiguo / nuevo:>11.1f}x" if antiguo is not None else f"{'—':>12}"
+        print(f"{lineas:>8} {columna_antiguo} {nuevo:>10.3f} {por_tecla * 1000:>11.2f} {aceleracion}")
+
+    root.destroy()
+    print("\nantiguo = text.index() por extremo de token y un tag_add por token")
+    print("nuevo   = tokens del DFALexer, tabla de inicios de línea y tag_add por lotes")
+    print("tecla   = reanálisis tras insertar un carácter a mitad del archivo")
+
+
+if __name__ == "__main__":
+    main()
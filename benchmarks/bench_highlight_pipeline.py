@@ -0,0 +1,108 @@
+"""
+bench_highlight_pipeline.py
+---------------------------
+Micro-benchmark del etiquetado del resaltador (respaldo con regex), sin Tk,
+sobre archivos generados a partir de ide/samples/TestIDE.caos:
+
+    antiguo → el _get_tag anterior: por cada match, groupdict() de todos los
+              grupos nombrados, rsplit del nombre y consulta de
+              RESERVED_WORDS para los identificadores; tramos (tag, ini, fin)
+    nuevo   → match.lastindex y la tabla _TAG_POR_GRUPO (las palabras
+              reservadas son un patrón más); tripletas (id de tag, ini, fin)
+    tramos  → SyntaxHighlighter._analizar_tramo completo: lo anterior más el
+              paso a línea/columna y el estado de comentario por línea
+
+Antes de medir se comprueba que antiguo y nuevo dan los mismos tags.
+
+Uso:
+    python -m benchmarks.bench_highlight_pipeline [--lineas 1000 5000 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_IDE_DIR = os.path.join(_RAIZ, "ide")
+if _IDE_DIR not in sys.path:
+    sys.path.insert(0, _IDE_DIR)
+
+from ui.highlighter import (  # noqa: E402
+    FUERA_DE_COMENTARIO,
+    RESERVED_WORDS,
+    TAGS,
+    TOKEN_PATTERNS,
+    SyntaxHighlighter,
+    _COMBINED_PATTERN,
+    _TAG_POR_GRUPO,
+)
+
+from benchmarks.medicion import cronometrar, generar_muestra  # noqa: E402
+
+# Regex anterior: los mismos patrones sin el de palabras reservadas
+_PATRON_ANTIGUO = re.compile(
+    "|".join(f"(?P<{tag}_{i}>{pattern})"
+             for i, (tag, pattern) in enumerate(TOKEN_PATTERNS) if tag != "reserved"),
+    re.MULTILINE,
+)
+
+
+def _antiguo(texto: str) -> list[tuple[str, int, int]]:
+    """Réplica del despacho anterior (groupdict + rsplit + RESERVED_WORDS)."""
+    tramos = []
+    for match in _PATRON_ANTIGUO.finditer(texto):
+        tag = None
+        for group_name, value in match.groupdict().items():
+            if value is not None:
+                tag = group_name.rsplit("_", 1)[0]
+                break
+        if tag == "identifier" and match.group() in RESERVED_WORDS:
+            tag = "reserved"
+        tramos.append((tag, match.start(), match.end()))
+    return tramos
+
+
+def _nuevo(texto: str) -> list[tuple[int, int, int]]:
+    """Despacho por match.lastindex con la tabla grupo → id de tag."""
+    tags = _TAG_POR_GRUPO
+    return [
+        (tags[match.lastindex], *match.span())
+        for match in _COMBINED_PATTERN.finditer(texto)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark del etiquetado del resaltador")
+    parser.add_argument("--lineas", type=int, nargs="+", default=[1000, 5000, 20000],
+                        help="Tamaños de archivo a medir, en líneas")
+    args = parser.parse_args()
+
+    print(f"{'líneas':>8} {'matches':>9} {'antiguo (ms)':>13} {'nuevo (ms)':>11} "
+          f"{'tramos (ms)':>12} {'aceleración':>12}")
+    print("-" * 70)
+    for lineas in args.lineas:
+        texto = generar_muestra(lineas)
+
+        esperado = _antiguo(texto)
+        obtenido = [(TAGS[tag], inicio, fin) for tag, inicio, fin in _nuevo(texto)]
+        if obtenido != esperado:
+            raise SystemExit(f"Los tags del despacho nuevo difieren del anterior ({lineas} líneas)")
+
+        antiguo = cronometrar(lambda: _antiguo(texto), vueltas=5)
+        nuevo = cronometrar(lambda: _nuevo(texto), vueltas=5)
+        tramos = cronometrar(
+            lambda: SyntaxHighlighter._analizar_tramo(texto, FUERA_DE_COMENTARIO), vueltas=5
+        )
+        print(f"{lineas:>8} {len(esperado):>9} {antiguo * 1000:>13.2f} {nuevo * 1000:>11.2f} "
+              f"{tramos * 1000:>12.2f} {antiguo / nuevo:>11.1f}x")
+
+    print("\nantiguo = groupdict() + rsplit + RESERVED_WORDS por match")
+    print("nuevo   = match.lastindex → id de tag (tripletas)")
+    print("tramos  = _analizar_tramo completo (línea/columna y estado por línea)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+bench_intermedio.py
+-------------------
+Suite de rendimiento de la generación de código intermedio sobre un corpus
+sintético (benchmarks/corpus.py) sin errores léxicos y con switch y for. El
+corpus no declara sus variables: los errores semánticos se ignoran y el
+código se genera igual. Mide:
+
+    generar           GeneradorIntermedio.generar (cuádruplos del AST analizado)
+    generar[sin plegar] lo mismo sin usar las constantes plegadas
+    grafo             GrafoFlujo (bloques básicos y aristas)
+    recorrido         recorrer todos los bloques, sus cuádruplos y sus sucesores
+    alcanzables       bloques alcanzables desde el primero
+    formatear         listado de intermediate.txt
+
+Para cada uno: mejor tiempo de --vueltas ejecuciones, tokens/s y
+cuádruplos/s (respecto del programa completo) y memoria pico (tracemalloc,
+en una ejecución aparte para no distorsionar los tiempos).
+
+El resultado es un documento JSON (en stdout o en --salida) para seguir
+regresiones entre versiones; la tabla legible va a stderr:
+
+    {"benchmark": "intermedio", "fecha": "...", "python": "3.11.7", "plataforma": "...",
+     "corpus": {"lineas": 20000, "semilla": 0, "tokens": 171200, "cuadruplos": 61234,
+                "cuadruplos_sin_plegar": 70211, "bloques": 9876, "aristas": 12345},
+     "vueltas": 3,
+     "resultados": {"generar": {"segundos": 0.31, "tokens_por_s": 552258.1,
+                                "cuadruplos_por_s": 197529.0, "memoria_pico_bytes": 8388608}, ...}}
+
+Uso:
+    python -m benchmarks.bench_intermedio [--lineas 20000] [--semilla 0] [--vueltas 3]
+                                          [--salida res.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import Callable
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_EC_DIR = os.path.join(_RAIZ, "external_compiler")
+if _EC_DIR not in sys.path:
+    sys.path.insert(0, _EC_DIR)
+
+from intermedio import GeneradorIntermedio, GrafoFlujo   # noqa: E402
+from lexer.dfa_lexer import DFALexer                     # noqa: E402
+from semantico import AnalizadorSemantico                # noqa: E402
+from sintactico import Parser                            # noqa: E402
+
+from benchmarks.corpus import Mezcla, generar            # noqa: E402
+from benchmarks.medicion import cronometrar, memoria_pico  # noqa: E402
+
+# Mezcla del corpus: sin errores léxicos (el parser rechazaría el programa)
+# y con todas las estructuras de control
+_MEZCLA = Mezcla(error=0.0, segun=0.3, para=0.4)
+
+
+def _recorrer(grafo: GrafoFlujo) -> int:
+    """Visita cada bloque, sus cuádruplos y sus sucesores (como una optimización)."""
+    ops = grafo.codigo.ops
+    visitados = 0
+    for b in range(len(grafo)):
+        for i in grafo.cuadruplos(b):
+            visitados += ops[i] > 0
+        for _ in grafo.sucesores(b):
+            visitados += 1
+    return visitados
+
+
+def _casos(analizador: AnalizadorSemantico) -> dict[str, Callable[[], object]]:
+    """Nombre → función a medir. Las entradas de cada caso se preparan aquí."""
+    codigo = GeneradorIntermedio(analizador).generar()
+    grafo = GrafoFlujo(codigo)
+    return {
+        "generar": lambda: GeneradorIntermedio(analizador).generar(),
+        "generar[sin plegar]": lambda: GeneradorIntermedio(analizador, plegar=False).generar(),
+        "grafo": lambda: GrafoFlujo(codigo),
+        "recorrido": lambda: _recorrer(grafo),
+        "alcanzables": grafo.alcanzables,
+        "formatear": grafo.formatear,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del código intermedio")
+    parser.add_argument("--lineas", type=int, default=20000,
+                        help="Líneas del corpus generado (por defecto: 20000)")
+    parser.add_argument("--semilla", type=int, default=0,
+                        help="Semilla del generador (por defecto: 0)")
+    parser.add_argument("--vueltas", type=int, default=3,
+                        help="Ejecuciones por medición; se toma la mejor (por defecto: 3)")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto: stdout)")
+    args = parser.parse_args()
+
+    source = generar(args.lineas, args.semilla, _MEZCLA)
+    buffer = DFALexer(engine="tabla").tokenize_buffer(source)
+    tokens = len(buffer) - 1  # sin EOF
+    sintactico = Parser(buffer)
+    arbol = sintactico.analizar()
+    if sintactico.errores:
+        raise SystemExit(f"El corpus tiene errores de sintaxis: {sintactico.errores[0]}")
+    analizador = AnalizadorSemantico(arbol)
+    analizador.analizar()
+
+    codigo = GeneradorIntermedio(analizador).generar()
+    grafo = GrafoFlujo(codigo)
+    sin_plegar = len(GeneradorIntermedio(analizador, plegar=False).generar())
+    cuadruplos = len(codigo)
+
+    resultados = {}
+    print(f"Corpus: {args.lineas} líneas, {tokens} tokens, {cuadruplos} cuádruplos "
+          f"({sin_plegar} sin plegar), {len(grafo)} bloques, {grafo.aristas} aristas\n",
+          file=sys.stderr)
+    print(f"{'caso':<20} {'tiempo (ms)':>12} {'tokens/s':>12} {'cuádr./s':>12} {'pico (MB)':>10}",
+          file=sys.stderr)
+    print("-" * 70, file=sys.stderr)
+    for nombre, funcion in _casos(analizador).items():
+        segundos = cronometrar(funcion, args.vueltas)
+        pico = memoria_pico(funcion)
+        resultados[nombre] = {
+            "segundos": round(segundos, 6),
+            "tokens_por_s": round(tokens / segundos, 1),
+            "cuadruplos_por_s": round(cuadruplos / segundos, 1),
+            "memoria_pico_bytes": pico,
+        }
+        print(f"{nombre:<20} {segundos * 1000:>12.1f} {tokens / segundos:>12.0f} "
+              f"{cuadruplos / segundos:>12.0f} {pico / 1e6:>10.1f}", file=sys.stderr)
+
+    documento = {
+        "benchmark": "intermedio",
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "corpus": {
+            "lineas": args.lineas,
+            "semilla": args.semilla,
+            "tokens": tokens,
+            "cuadruplos": cuadruplos,
+            "cuadruplos_sin_plegar": sin_plegar,
+            "bloques": len(grafo),
+            "aristas": grafo.aristas,
+        },
+        "vueltas": args.vueltas,
+        "resultados": resultados,
+    }
+    texto = json.dumps(documento, ensure_ascii=False, indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+bench_lexer.py
+--------------
+Suite de rendimiento del análisis léxico sobre un corpus sintético
+(benchmarks/corpus.py). Mide:
+
+    tokenize[motor]   DFALexer(engine=motor).tokenize (lista de Token)
+    tokenize_buffer   DFALexer.tokenize_buffer (TokenBuffer, motor de tablas)
+    _run_lexico       fase léxica de compiler_stub (tokenize_buffer + errores)
+    _format_tokens    tabla de tokens.txt a partir del buffer ya filtrado
+    resaltado[regex]  SyntaxHighlighter._analizar_tramo (respaldo con regex)
+    resaltado[tokens] SyntaxHighlighter._tramos_de_tokens sobre el buffer ya
+                      calculado (lo que hace el IDE con la TokenCache)
+
+Para cada uno: mejor tiempo de --vueltas ejecuciones, tokens/s y MB/s
+(respecto del corpus completo) y memoria pico (tracemalloc, en una
+ejecución aparte para no distorsionar los tiempos).
+
+El resultado es un documento JSON (en stdout o en --salida) para seguir
+regresiones entre versiones; la tabla legible va a stderr:
+
+    {"benchmark": "lexer", "fecha": "...", "python": "3.11.7", "plataforma": "...",
+     "corpus": {"lineas": 20000, "semilla": 0, "bytes": 583608, "tokens": 164045, "errores": 114},
+     "vueltas": 3,
+     "resultados": {"tokenize[tabla]": {"segundos": 0.41, "tokens_por_s": 400110.2,
+                                        "mb_por_s": 1.42, "memoria_pico_bytes": 31457280}, ...}}
+
+Uso:
+    python -m benchmarks.bench_lexer [--lineas 20000] [--semilla 0] [--vueltas 3]
+                                     [--motores clasico tabla regex] [--salida res.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import Callable
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _dir in (os.path.join(_RAIZ, "external_compiler"), os.path.join(_RAIZ, "ide")):
+    if _dir not in sys.path:
+        sys.path.insert(0, _dir)
+
+import compiler_stub                   # noqa: E402
+from lexer.dfa_lexer import DFALexer   # noqa: E402
+
+from benchmarks.corpus import generar  # noqa: E402
+from benchmarks.medicion import cronometrar, memoria_pico  # noqa: E402
+
+try:
+    from ui.highlighter import FUERA_DE_COMENTARIO, SyntaxHighlighter  # noqa: E402
+except ImportError:  # tkinter no disponible: se omiten las mediciones del resaltado
+    SyntaxHighlighter = None
+
+
+def _casos(source: str, motores: list[str]) -> dict[str, Callable[[], object]]:
+    """Nombre → función a medir. Las entradas de cada caso se preparan aquí."""
+    casos: dict[str, Callable[[], object]] = {}
+    for motor in motores:
+        lexer = DFALexer(engine=motor)
+        casos[f"tokenize[{motor}]"] = lambda lexer=lexer: lexer.tokenize(source)
+
+    lexer = DFALexer(engine="tabla")
+    buffer = lexer.tokenize_buffer(source)
+    validos = buffer.filtrar(excluir=("ERROR", "EOF"))
+    casos["tokenize_buffer"] = lambda: lexer.tokenize_buffer(source)
+    casos["_run_lexico"] = lambda: compiler_stub._run_lexico(source, [])
+    casos["_format_tokens"] = lambda: compiler_stub._format_tokens(validos)
+
+    if SyntaxHighlighter is not None:
+        lineas = source.count("\n") + 1
+        casos["resaltado[regex]"] = lambda: SyntaxHighlighter._analizar_tramo(
+            source, FUERA_DE_COMENTARIO
+        )
+        casos["resaltado[tokens]"] = lambda: SyntaxHighlighter._tramos_de_tokens(
+            source, buffer, 1, lineas
+        )
+    return casos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del análisis léxico")
+    parser.add_argument("--lineas", type=int, default=20000,
+                        help="Líneas del corpus generado (por defecto: 20000)")
+    parser.add_argument("--semilla", type=int, default=0,
+                        help="Semilla del generador (por defecto: 0)")
+    parser.add_argument("--vueltas", type=int, default=3,
+                        help="Ejecuciones por medición; se toma la mejor (por defecto: 3)")
+    parser.add_argument("--motores", nargs="+", default=list(DFALexer.ENGINES),
+                        choices=DFALexer.ENGINES, help="Motores de tokenize a medir")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto: stdout)")
+    args = parser.parse_args()
+
+    source = generar(args.lineas, args.semilla)
+    errores: list[str] = []
+    tokens = len(DFALexer(engine="tabla").tokenize_buffer(source, errores)) - 1  # sin EOF
+    megabytes = len(source.encode("utf-8")) / 1e6
+
+    resultados = {}
+    print(f"Corpus: {args.lineas} líneas, {megabytes:.2f} MB, {tokens} tokens, "
+          f"{len(errores)} errores\n", file=sys.stderr)
+    print(f"{'caso':<20} {'tiempo (ms)':>12} {'tokens/s':>12} {'MB/s':>8} {'pico (MB)':>10}",
+          file=sys.stderr)
+    print("-" * 66, file=sys.stderr)
+    for nombre, funcion in _casos(source, args.motores).items():
+        segundos = cronometrar(funcion, args.vueltas)
+        pico = memoria_pico(funcion)
+        resultados[nombre] = {
+            "segundos": round(segundos, 6),
+            "tokens_por_s": round(tokens / segundos, 1),
+            "mb_por_s": round(megabytes / segundos, 3),
+            "memoria_pico_bytes": pico,
+        }
+        print(f"{nombre:<20} {segundos * 1000:>12.1f} {tokens / segundos:>12.0f} "
+              f"{megabytes / segundos:>8.2f} {pico / 1e6:>10.1f}", file=sys.stderr)
+
+    documento = {
+        "benchmark": "lexer",
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "corpus": {
+            "lineas": args.lineas,
+            "semilla": args.semilla,
+            "bytes": len(source.encode("utf-8")),
+            "tokens": tokens,
+            "errores": len(errores),
+        },
+        "vueltas": args.vueltas,
+        "resultados": resultados,
+    }
+    texto = json.dumps(documento, ensure_ascii=False, indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
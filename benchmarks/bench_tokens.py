@@ -0,0 +1,109 @@
+"""
+bench_tokens.py
+---------------
+Compara representaciones de tokens del analizador léxico:
+
+    dataclass  → el Token anterior: @dataclass con tipo como cadena
+    Token      → Token con __slots__ y tipo TokenType (IntEnum)
+    buffer     → TokenBuffer (arreglos por columna, sin objetos por token)
+
+Mide la memoria por token (tracemalloc) y el costo de dos pasadas típicas
+de las fases siguientes: contar los tokens de un tipo (solo comparación de
+tipos) y recolectar los identificadores, como hace _run_semantico.
+
+Uso:
+    python -m benchmarks.bench_tokens [--repeticiones N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_EC_DIR = os.path.join(_RAIZ, "external_compiler")
+if _EC_DIR not in sys.path:
+    sys.path.insert(0, _EC_DIR)
+
+from lexer.dfa_lexer import DFALexer, Token   # noqa: E402
+from lexer.token_types import TokenType       # noqa: E402
+
+from benchmarks.medicion import MUESTRA, cronometrar   # noqa: E402
+
+
+@dataclass
+class _TokenDataclass:
+    """Réplica del Token anterior (dataclass con __dict__ y tipo str)."""
+    tipo:    str
+    valor:   str
+    linea:   int
+    columna: int
+
+
+def _medir_memoria(construir: Callable[[], object]) -> tuple[object, int]:
+    """Retorna (resultado, bytes retenidos) de construir()."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    resultado = construir()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultado, despues - antes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de representación de tokens")
+    parser.add_argument("--repeticiones", type=int, default=2000,
+                        help="Veces que se repite TestIDE.caos (por defecto: 2000)")
+    args = parser.parse_args()
+
+    with open(MUESTRA, encoding="utf-8") as f:
+        source = f.read() * args.repeticiones
+
+    lexer = DFALexer(engine="tabla")
+    buffer = lexer.tokenize_buffer(source)
+    filas = list(buffer.filas())
+    n = len(filas)
+
+    # Las listas de objetos se construyen a partir de las mismas filas (los
+    # lexemas se comparten), así que la diferencia es solo la del objeto
+    antiguos, mem_antiguos = _medir_memoria(
+        lambda: [_TokenDataclass(t, v, ln, col) for t, v, ln, col in filas]
+    )
+    categorias = {t.name: t for t in TokenType}
+    nuevos, mem_nuevos = _medir_memoria(
+        lambda: [Token(categorias[t], v, ln, col) for t, v, ln, col in filas]
+    )
+    copia, mem_buffer = _medir_memoria(lambda: buffer.filtrar(()))
+
+    ident = TokenType.IDENTIFIER
+    t_antiguos = (
+        cronometrar(lambda: sum(1 for t in antiguos if t.tipo == "IDENTIFIER"), vueltas=5),
+        cronometrar(lambda: {t.valor for t in antiguos if t.tipo == "IDENTIFIER"}, vueltas=5),
+    )
+    t_nuevos = (
+        cronometrar(lambda: sum(1 for t in nuevos if t.categoria is ident), vueltas=5),
+        cronometrar(lambda: {t.valor for t in nuevos if t.categoria is ident}, vueltas=5),
+    )
+    t_buffer = (
+        cronometrar(lambda: copia.tipos.count(ident.value), vueltas=5),
+        cronometrar(lambda: set(copia.lexemas("IDENTIFIER")), vueltas=5),
+    )
+
+    print(f"Tokens: {n}  ({len(source) / 1e6:.1f} MB de fuente)\n")
+    print(f"{'representación':<15} {'bytes/token':>12} {'contar (ms)':>12} {'conjunto (ms)':>14}")
+    print("-" * 56)
+    for nombre, memoria, (contar, conjunto) in (
+        ("dataclass", mem_antiguos, t_antiguos),
+        ("Token",     mem_nuevos,   t_nuevos),
+        ("buffer",    mem_buffer,   t_buffer),
+    ):
+        print(f"{nombre:<15} {memoria / n:>12.1f} {contar * 1000:>12.1f} {conjunto * 1000:>14.1f}")
+    print("\ncontar   = tokens IDENTIFIER (comparación de tipos)")
+    print("conjunto = conjunto de identificadores, como _run_semantico")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+corpus.py
+---------
+Generador de programas CAOS sintéticos para los benchmarks.
+
+Produce un programa "main { ... }" de tamaño configurable con sentencias
+como las de ide/samples/TestIDE.caos: declaraciones con los tipos de
+RESERVED, asignaciones con expresiones aritméticas, if/then/else/end,
+while { }, do ... until, switch / case / default y for (estos dos con peso
+0 por defecto: activarlos no cambia los programas ya generados con la
+mezcla por defecto), cin/cout con cadenas y caracteres, comentarios de
+línea y de bloque (de varias líneas) y, con poca frecuencia, los errores
+léxicos de TestIDE.caos ("sum@r", "32.", "34.34.34", "&&" sin operando,
+cadenas sin cerrar, "++" y "==" partidos por saltos de línea).
+
+La proporción de cada sentencia se controla con Mezcla; con la misma semilla
+el resultado es siempre el mismo.
+
+Uso:
+    from benchmarks.corpus import Mezcla, generar
+    source = generar(lineas=20000, semilla=1, mezcla=Mezcla(error=0.5))
+
+    python -m benchmarks.corpus --lineas 20000 [--semilla N] [--salida prog.caos]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+from dataclasses import dataclass, fields
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_EC_DIR = os.path.join(_RAIZ, "external_compiler")
+if _EC_DIR not in sys.path:
+    sys.path.insert(0, _EC_DIR)
+
+from lexer.reserved_words import RESERVED   # noqa: E402
+
+# Tipos de las declaraciones (los de RESERVED)
+_TIPOS = [tipo for tipo in ("int", "real", "float") if tipo in RESERVED]
+
+_IDENTIFICADORES = ["x", "y", "z", "a", "b", "c", "suma", "mas", "total_1", "contador", "promedio"]
+_ARITMETICOS = ["+", "-", "*", "/", "%", "^"]
+_RELACIONALES = ["<", "<=", ">", ">=", "==", "!="]
+_LOGICOS = ["&&", "||"]
+_PALABRAS = ["hola", "mundo", "total", "resultado", "valor", "fin", "x =", "/* no es comentario */"]
+_PALABRAS_BLOQUE = [palabra for palabra in _PALABRAS if "*/" not in palabra]
+
+# Errores léxicos tomados de TestIDE.caos (algunos ocupan varias líneas)
+_ERRORES = [
+    "sum@r = 3;",
+    "x = 32.;",
+    "34.34.34.34",
+    "if(4>2 && )then",
+    'cout "sin cerrar;',
+    "a+\n\n+;",
+    "until(y=\n\n=\n5);",
+    "main sum@r 3.14+main)if{32.algo",
+    "c = 'x",
+    "y = 2 # 3;",
+]
+
+
+@dataclass
+class Mezcla:
+    """Peso relativo de cada tipo de sentencia generada (0 = nunca)."""
+    declaracion:       float = 1.0
+    asignacion:        float = 5.0
+    si:                float = 1.0
+    mientras:          float = 0.6
+    hacer:             float = 0.4
+    segun:             float = 0.0
+    para:              float = 0.0
+    entrada_salida:    float = 1.2
+    comentario_linea:  float = 0.8
+    comentario_bloque: float = 0.2
+    error:             float = 0.1
+
+
+class _Generador:
+    """Estado de una generación: semilla, mezcla y líneas producidas."""
+
+    # Profundidad máxima de bloques anidados
+    MAX_PROFUNDIDAD = 3
+
+    def __init__(self, semilla: int, mezcla: Mezcla):
+        self.rnd = random.Random(semilla)
+        self.lineas: list[str] = []
+        self.tipos = [f.name for f in fields(mezcla)]
+        self.pesos = [getattr(mezcla, tipo) for tipo in self.tipos]
+        if not any(self.pesos):
+            raise ValueError("La mezcla no tiene ninguna sentencia con peso positivo")
+
+    def programa(self, lineas: int) -> str:
+        self.lineas.append("main {")
+        while len(self.lineas) < lineas - 1:
+            self.sentencia(1)
+        self.lineas.append("}")
+        return "\n".join(self.lineas)
+
+    # -- Sentencias ----------------------------------------------------------
+
+    def sentencia(self, profundidad: int):
+        tipo = self.rnd.choices(self.tipos, self.pesos)[0]
+        if tipo in ("si", "mientras", "hacer", "segun", "para") and profundidad >= self.MAX_PROFUNDIDAD:
+            tipo = "asignacion"
+        getattr(self, "_" + tipo)(profundidad)
+
+    def _emitir(self, profundidad: int, texto: str):
+        sangria = "    " * profundidad
+        self.lineas.extend(sangria + linea for linea in texto.split("\n"))
+
+    def _bloque(self, profundidad: int):
+        for _ in range(self.rnd.randint(1, 4)):
+            self.sentencia(profundidad + 1)
+
+    def _declaracion(self, profundidad: int):
+        nombres = self.rnd.sample(_IDENTIFICADORES, self.rnd.randint(1, 4))
+        self._emitir(profundidad, f"{self.rnd.choice(_TIPOS)} {','.join(nombres)};")
+
+    def _asignacion(self, profundidad: int):
+        self._emitir(profundidad, f"{self.identificador()}={self.expresion(3)};")
+
+    def _si(self, profundidad: int):
+        self._emitir(profundidad, f"if({self.condicion()})then")
+        self._bloque(profundidad)
+        if self.rnd.random() < 0.5:
+            self._emitir(profundidad, "else")
+            self._bloque(profundidad)
+        self._emitir(profundidad, "end;")
+
+    def _mientras(self, profundidad: int):
+        self._emitir(profundidad, f"while({self.condicion()}){{")
+        self._bloque(profundidad)
+        self._emitir(profundidad, "};")
+
+    def _hacer(self, profundidad: int):
+        self._emitir(profundidad, "do")
+        self._bloque(profundidad)
+        self._emitir(profundidad, f"until({self.condicion()});")
+
+    def _segun(self, profundidad: int):
+        self._emitir(profundidad, f"switch({self.identificador()}){{")
+        for valor in sorted(self.rnd.sample(range(10), self.rnd.randint(1, 3))):
+            self._emitir(profundidad + 1, f"case {valor} {{")
+            self._bloque(profundidad + 1)
+            if self.rnd.random() < 0.5:
+                self._emitir(profundidad + 2, "break;")
+            self._emitir(profundidad + 1, "}")
+        if self.rnd.random() < 0.5:
+            self._emitir(profundidad + 1, "default {")
+            self._bloque(profundidad + 1)
+            self._emitir(profundidad + 1, "}")
+        self._emitir(profundidad, "}")
+
+    def _para(self, profundidad: int):
+        variable = self.identificador()
+        self._emitir(
+            profundidad,
+            f"for({variable}=0; {variable}<{self.rnd.randint(1, 100)}; {variable}++){{",
+        )
+        self._bloque(profundidad)
+        self._emitir(profundidad, "}")
+
+    def _entrada_salida(self, profundidad: int):
+        r = self.rnd.random()
+        if r < 0.4:
+            self._emitir(profundidad, f"cin {self.identificador()};")
+        elif r < 0.7:
+            self._emitir(profundidad, f"cout {self.expresion(2)};")
+        elif r < 0.9:
+            palabras = " ".join(self.rnd.choices(_PALABRAS, k=self.rnd.randint(1, 4)))
+            self._emitir(profundidad, f'cout "{palabras}";')
+        else:
+            self._emitir(profundidad, f"cout '{self.rnd.choice('abcxyz')}';")
+
+    def _comentario_linea(self, profundidad: int):
+        palabras = " ".join(self.rnd.choices(_PALABRAS, k=self.rnd.randint(2, 6)))
+        if self.rnd.random() < 0.5:
+            self._emitir(profundidad, f"// {palabras}")
+        else:
+            self._emitir(profundidad, f"{self.identificador()}={self.expresion(1)}; // {palabras}")
+
+    def _comentario_bloque(self, profundidad: int):
+        lineas = [
+            " ".join(self.rnd.choices(_PALABRAS_BLOQUE, k=self.rnd.randint(2, 6)))
+            for _ in range(self.rnd.randint(1, 4))
+        ]
+        self._emitir(profundidad, "/* " + "\n   ".join(lineas) + " */")
+
+    def _error(self, profundidad: int):
+        self._emitir(profundidad, self.rnd.choice(_ERRORES))
+
+    # -- Expresiones ---------------------------------------------------------
+
+    def identificador(self) -> str:
+        return self.rnd.choice(_IDENTIFICADORES)
+
+    def operando(self) -> str:
+        r = self.rnd.random()
+        if r < 0.5:
+            return self.identificador()
+        if r < 0.8:
+            return str(self.rnd.randint(0, 999))
+        return f"{self.rnd.randint(0, 99)}.{self.rnd.randint(0, 99)}"
+
+    def expresion(self, profundidad: int) -> str:
+        if profundidad <= 0 or self.rnd.random() < 0.3:
+            return self.operando()
+        izquierda = self.expresion(profundidad - 1)
+        derecha = self.expresion(profundidad - 1)
+        expresion = f"{izquierda}{self.rnd.choice(_ARITMETICOS)}{derecha}"
+        return f"({expresion})" if self.rnd.random() < 0.25 else expresion
+
+    def condicion(self) -> str:
+        partes = [
+            f"{self.expresion(1)}{self.rnd.choice(_RELACIONALES)}{self.expresion(1)}"
+            for _ in range(self.rnd.randint(1, 2))
+        ]
+        condicion = f" {self.rnd.choice(_LOGICOS)} ".join(partes)
+        return f"!({condicion})" if self.rnd.random() < 0.1 else condicion
+
+
+def generar(lineas: int = 10000, semilla: int = 0, mezcla: Mezcla | None = None) -> str:
+    """Programa CAOS de aproximadamente `lineas` líneas (nunca menos de 2)."""
+    return _Generador(semilla, mezcla or Mezcla()).programa(max(lineas, 2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generador de programas CAOS sintéticos")
+    parser.add_argument("--lineas", type=int, default=10000,
+                        help="Líneas del programa (por defecto: 10000)")
+    parser.add_argument("--semilla", type=int, default=0,
+                        help="Semilla del generador (por defecto: 0)")
+    for campo in fields(Mezcla):
+        parser.add_argument(f"--{campo.name.replace('_', '-')}", type=float, default=campo.default,
+                            metavar="PESO", help=f"Peso de {campo.name} (por defecto: {campo.default})")
+    parser.add_argument("--salida", help="Archivo de salida (por defecto: stdout)")
+    args = parser.parse_args()
+
+    mezcla = Mezcla(**{campo.name: getattr(args, campo.name) for campo in fields(Mezcla)})
+    source = generar(args.lineas, args.semilla, mezcla)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(source)
+    else:
+        sys.stdout.reconfigure(encoding="utf-8")
+        sys.stdout.write(source + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+medicion.py
+-----------
+Utilidades comunes de los benchmarks: cronómetro (mejor de varias vueltas),
+memoria pico (tracemalloc) y el programa de muestra
+ide/samples/TestIDE.caos repetido hasta un número de líneas.
+
+Uso:
+    from benchmarks.medicion import cronometrar, generar_muestra, memoria_pico
+    source = generar_muestra(5000)
+    segundos = cronometrar(lambda: procesar(source), vueltas=5)
+    pico = memoria_pico(lambda: procesar(source))
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import tracemalloc
+from typing import Callable
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MUESTRA = os.path.join(_RAIZ, "ide", "samples", "TestIDE.caos")
+
+
+def cronometrar(funcion: Callable[[], object], vueltas: int = 3) -> float:
+    """Mejor tiempo (s) de `vueltas` ejecuciones."""
+    mejor = float("inf")
+    for _ in range(vueltas):
+        t0 = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def memoria_pico(funcion: Callable[[], object]) -> int:
+    """Bytes pico asignados durante una ejecución de `funcion`."""
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def generar_muestra(lineas: int) -> str:
+    """Fuente de `lineas` líneas repitiendo las de TestIDE.caos."""
+    with open(MUESTRA, encoding="utf-8") as f:
+        muestra = f.read().splitlines()
+    return "\n".join(muestra[i % len(muestra)] for i in range(lineas))
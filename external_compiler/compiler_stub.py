@@ -1,6 +1,16 @@
 import argparse
+import cProfile
+import json
+import pstats
+import re
 import sys
+import time
+import tracemalloc
+import traceback
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import Iterator, Optional, TextIO, Union
 
 
 # Fases
@@ -19,6 +29,188 @@ OUTPUT_FILES = {
 }
 
 
+# Formatos de salida de main() (opción --format)
+FORMATS = ["files", "json"]
+
+# Etiqueta de fase y posición dentro de un mensaje de error
+# ("[LEXICO] Carácter inválido '@' en línea 4, columna 7")
+_ERROR_FASE     = re.compile(r"^\[(\w+)\]")
+_ERROR_POSICION = re.compile(r"línea (\d+)(?:, columna (\d+))?")
+
+
+# Líneas del resumen de cProfile que main() imprime por fase con --profile
+_PERFIL_LINEAS = 15
+
+
+# Resultado en memoria
+
+# Código de salida por fase que falla
+EXIT_CODES = {
+    "lexico":     1,
+    "sintactico": 2,
+    "semantico":  3,
+    "intermedio": 4,
+    "ejecutar":   5,
+}
+
+
+@dataclass
+class MetricaFase:
+    """
+    Mediciones de una fase de compilar() (ver Compilacion.metricas).
+
+    segundos     : tiempo de reloj de la fase.
+    cpu_segundos : tiempo de CPU del hilo que compila (time.thread_time: en
+                   el IDE no cuenta el hilo de la interfaz).
+    memoria_pico : bytes asignados en el pico de la fase por encima de lo
+                   que ya había al empezarla (tracemalloc); None si no se
+                   pidió medir_memoria.
+    tokens       : tokens producidos (lexico, sin EOF) o consumidos
+                   (sintactico, semantico); None en las fases que no los usan.
+    bytes        : bytes UTF-8 del fuente analizado (solo lexico).
+    """
+    fase: str
+    segundos: float = 0.0
+    cpu_segundos: float = 0.0
+    memoria_pico: Optional[int] = None
+    tokens: Optional[int] = None
+    bytes: Optional[int] = None
+
+
+@dataclass
+class Compilacion:
+    """
+    Resultado de compilar() sin tocar el disco.
+
+    salidas      : contenido por clave de OUTPUT_FILES ("lexico", "simbolos",
+                   ...) de las fases que llegaron a ejecutarse.
+    errores      : mensajes de error de todas las fases, en orden.
+    codigo       : código de salida (0 = éxito, ver EXIT_CODES).
+    fase_fallida : fase que determinó `codigo` (None si no hubo errores).
+    tokens       : TokenBuffer completo del análisis léxico (con ERROR y EOF);
+                   no forma parte del documento JSON.
+    ast          : Arbol del análisis sintáctico (sintactico/arbol.py), o None
+                   si la fase no corrió o tuvo errores; tampoco va al JSON.
+    simbolos     : filas de la tabla de símbolos del análisis semántico
+                   (TablaSimbolos.filas(); vacía si la fase no corrió).
+    cuadruplos   : Codigo de tres direcciones de la fase intermedia
+                   (intermedio/cuadruplos.py), o None si no corrió; no va al
+                   JSON.
+    metricas     : MetricaFase de cada fase que corrió, en orden.
+    """
+    salidas: dict[str, str] = field(default_factory=dict)
+    errores: list[str] = field(default_factory=list)
+    codigo: int = 0
+    fase_fallida: Optional[str] = None
+    tokens: Optional["TokenBuffer"] = field(default=None, repr=False, compare=False)
+    ast: Optional["Arbol"] = field(default=None, repr=False, compare=False)
+    simbolos: list[dict] = field(default_factory=list)
+    cuadruplos: Optional["Codigo"] = field(default=None, repr=False, compare=False)
+    metricas: list[MetricaFase] = field(default_factory=list)
+
+    @property
+    def errores_texto(self) -> str:
+        """Contenido de errors.txt."""
+        return "\n".join(self.errores) + ("\n" if self.errores else "")
+
+    def artefactos(self) -> dict:
+        """
+        Resultados intermedios reutilizables, con el nombre del parámetro de
+        compilar() que los recibe: una compilación posterior del mismo fuente
+        (p. ej. hasta una fase más avanzada) puede retomar desde ellos.
+        """
+        artefactos = {}
+        if self.tokens is not None:
+            artefactos["tokens"] = self.tokens
+        if self.ast is not None:
+            artefactos["ast"] = self.ast
+        return artefactos
+
+    def archivos(self) -> dict[str, str]:
+        """
+        Contenido de cada archivo de OUTPUT_FILES, tal como main() los
+        escribe en disco (vacío para las fases que no corrieron).
+        """
+        return {
+            fname: self.errores_texto if key == "errors" else self.salidas.get(key, "")
+            for key, fname in OUTPUT_FILES.items()
+        }
+
+    def documento(self) -> dict:
+        """
+        Documento JSON de `--format json` y de las respuestas de --serve:
+
+            {"codigo": 1, "fase_fallida": "lexico",
+             "salidas": {"lexico": "...", ...},
+             "errores": [{"fase": "lexico", "linea": 4, "columna": 7,
+                          "mensaje": "[LEXICO] Carácter inválido '@' ..."}],
+             "simbolos": [{"nombre": "x", "tipo": "int", "ambito": 0, "nivel": 0,
+                           "linea": 4, "columna": 5, "usos": 3}],
+             "metricas": [{"fase": "lexico", "segundos": 0.012, "cpu_segundos": 0.011,
+                           "memoria_pico": null, "tokens": 415, "bytes": 1830}]}
+
+        "salidas" y "metricas" solo incluyen las fases que corrieron;
+        "simbolos" está vacío si no corrió el semántico. "linea" y "columna"
+        son null si el mensaje no indica posición.
+        """
+        return {
+            "codigo": self.codigo,
+            "fase_fallida": self.fase_fallida,
+            "salidas": dict(self.salidas),
+            "errores": [_detalle_error(mensaje) for mensaje in self.errores],
+            "simbolos": list(self.simbolos),
+            "metricas": [asdict(metrica) for metrica in self.metricas],
+        }
+
+
+class _Instrumentacion:
+    """
+    Mide cada fase de una llamada a compilar() y agrega su MetricaFase a
+    `metricas`. Con `perfil` (un directorio) cada fase corre además bajo
+    cProfile y sus estadísticas quedan en perfil/<fase>.prof.
+    """
+
+    def __init__(self, metricas: list[MetricaFase], memoria: bool, perfil: Optional[Path]):
+        self.metricas = metricas
+        self.memoria = memoria
+        self.perfil = perfil
+
+    @contextmanager
+    def fase(self, nombre: str) -> Iterator[MetricaFase]:
+        metrica = MetricaFase(nombre)
+        perfilador = cProfile.Profile() if self.perfil is not None else None
+        if self.memoria:
+            memoria_inicial = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        reloj, cpu = time.perf_counter(), time.thread_time()
+        if perfilador is not None:
+            perfilador.enable()
+        try:
+            yield metrica
+        finally:
+            if perfilador is not None:
+                perfilador.disable()
+            metrica.segundos = time.perf_counter() - reloj
+            metrica.cpu_segundos = time.thread_time() - cpu
+            if self.memoria:
+                metrica.memoria_pico = tracemalloc.get_traced_memory()[1] - memoria_inicial
+            if perfilador is not None:
+                perfilador.dump_stats(str(self.perfil / f"{nombre}.prof"))
+            self.metricas.append(metrica)
+
+
+def _detalle_error(mensaje: str) -> dict:
+    """Extrae fase, línea y columna de un mensaje "[FASE] ... línea N, columna M"."""
+    fase = _ERROR_FASE.match(mensaje)
+    posicion = _ERROR_POSICION.search(mensaje)
+    return {
+        "fase": fase.group(1).lower() if fase else None,
+        "linea": int(posicion.group(1)) if posicion else None,
+        "columna": int(posicion.group(2)) if posicion and posicion.group(2) else None,
+        "mensaje": mensaje,
+    }
+
+
 # Punto de entrada
 
 def main():
@@ -27,6 +219,7 @@ def main():
     )
     parser.add_argument(
         "source",
+        nargs="?",
         help="Ruta al archivo fuente .caos"
     )
     parser.add_argument(
@@ -35,92 +228,280 @@ def main():
         default=None,
         help="Ejecutar solo hasta esta fase (por defecto: todas)"
     )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="files",
+        help="files: escribir los archivos de salida (por defecto); "
+             "json: escribir un único documento JSON en stdout",
+    )
+    parser.add_argument(
+        "--write-files",
+        action="store_true",
+        help="Con --format json, escribir también los archivos de salida",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Medir la memoria pico de cada fase (tracemalloc; más lento)",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        nargs="?",
+        const=".",
+        default=None,
+        help="Perfilar cada fase con cProfile: escribe DIR/<fase>.prof "
+             "(por defecto en el directorio actual) y un resumen en stderr",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Quedar en espera de peticiones JSON por stdin (una por línea)"
+    )
     args = parser.parse_args()
 
+    if args.serve:
+        # El protocolo es UTF-8 en cualquier plataforma
+        sys.stdin.reconfigure(encoding="utf-8")
+        sys.stdout.reconfigure(encoding="utf-8")
+        _serve(sys.stdin, sys.stdout)
+        sys.exit(0)
+    if args.source is None:
+        parser.error("se requiere la ruta al archivo fuente (o --serve)")
+
     source_path = Path(args.source)
     if not source_path.exists():
-        _write("errors.txt", f"[LEXICO] Archivo fuente no encontrado: {source_path}\n")
-        sys.exit(1)
-
-    source_code = source_path.read_text(encoding="utf-8", errors="replace")
-    target_phase = args.phase or "ejecutar"
+        resultado = _no_encontrado(source_path)
+    else:
+        # El archivo se lee por bloques, pero el TokenBuffer guarda el texto
+        # completo (los lexemas son rangos de él) y todas las columnas de tokens
+        with source_path.open("r", encoding="utf-8", errors="replace") as source_file:
+            resultado = compilar(
+                source_file, args.phase, medir_memoria=args.memory, perfil=args.profile
+            )
+        if args.profile is not None:
+            _resumen_perfil(resultado, Path(args.profile))
+
+    if args.format == "json":
+        _write_json(resultado.documento())
+
+    # Reescribir todos los archivos (vacíos para las fases que no corrieron)
+    if args.format == "files" or args.write_files:
+        for fname, content in resultado.archivos().items():
+            _write(fname, content)
+
+    sys.exit(resultado.codigo)
+
+
+def compilar(
+    source: Union[str, TextIO],
+    phase: Optional[str] = None,
+    tokens: Optional["TokenBuffer"] = None,
+    ast: Optional["Arbol"] = None,
+    medir_memoria: bool = False,
+    perfil: Optional[Union[str, Path]] = None,
+) -> Compilacion:
+    """
+    Ejecuta el pipeline en memoria hasta `phase` (por defecto: todas) y
+    retorna las salidas de cada fase, los errores y el código de salida.
+
+    `source` es el código fuente o un archivo de texto abierto. No escribe
+    ningún archivo: main() lo hace a partir del resultado, y el IDE puede
+    llamar a esta función directamente sin lanzar un proceso.
+
+    `tokens` es opcional: el TokenBuffer de DFALexer.tokenize_buffer(source)
+    ya calculado (el IDE lo comparte con el resaltado de sintaxis). Si se da,
+    no se vuelve a tokenizar y los errores léxicos se derivan de sus tokens
+    ERROR. `ast` es el Arbol que ya produjo el análisis sintáctico de esos
+    mismos `tokens` (Compilacion.artefactos()); si se da, no se vuelve a
+    analizar.
+
+    Cada fase que corre deja su MetricaFase en `metricas` (tiempo de reloj
+    y de CPU, tokens y bytes). Con `medir_memoria` también la memoria pico
+    (activa tracemalloc durante la llamada si no estaba activo). Con
+    `perfil`, un directorio, cada fase se perfila con cProfile y sus
+    estadísticas se escriben en perfil/<fase>.prof.
+    """
+    target_phase = phase or "ejecutar"
     phases_to_run = PHASES[: PHASES.index(target_phase) + 1]
 
-    errors: list[str] = []
-
-    # Limpiar archivos anteriores
-    for fname in OUTPUT_FILES.values():
-        Path(fname).write_text("", encoding="utf-8")
-
-    # Fase 1: Léxico
-    if "lexico" in phases_to_run:
-        tokens = _run_lexico(source_code, errors)
-        _write(OUTPUT_FILES["lexico"], _format_tokens(tokens))
-        _write(OUTPUT_FILES["errors"], "\n".join(errors) + ("\n" if errors else ""))
+    resultado = Compilacion()
+    salidas = resultado.salidas
+    errors = resultado.errores
+
+    if perfil is not None:
+        perfil = Path(perfil)
+        perfil.mkdir(parents=True, exist_ok=True)
+    iniciar_tracemalloc = medir_memoria and not tracemalloc.is_tracing()
+    if iniciar_tracemalloc:
+        tracemalloc.start()
+    medir = _Instrumentacion(resultado.metricas, medir_memoria, perfil)
+
+    try:
+        # Fase 1: Léxico (siempre se ejecuta)
+        with medir.fase("lexico") as metrica:
+            if tokens is None:
+                tokens = _run_lexico(source, errors)
+            else:
+                errors.extend(_errores_lexicos(tokens))
+            resultado.tokens = tokens
+            validos = tokens.filtrar(excluir=("ERROR", "EOF"))
+            salidas["lexico"] = _format_tokens(validos)
+        metrica.tokens = len(tokens) - 1
+        metrica.bytes = len(tokens.texto.encode("utf-8"))
+        errores_lexicos = len(errors)
+
+        # Fase 2: Sintáctico (corre aunque haya errores léxicos, sobre los
+        # tokens válidos, para reportar también los de sintaxis)
+        if "sintactico" in phases_to_run:
+            with medir.fase("sintactico") as metrica:
+                entrada = validos if errores_lexicos else tokens
+                if ast is None or ast.tokens is not entrada:
+                    ast = _run_sintactico(entrada, errors)
+                # Solo un árbol completo se comparte (artefactos, fases siguientes)
+                if len(errors) == errores_lexicos:
+                    resultado.ast = ast
+                salidas["sintactico"] = _format_ast(ast, len(errors) - errores_lexicos)
+            metrica.tokens = len(validos)
+
+        # Fase 3: Semántico
+        if not errors and "semantico" in phases_to_run:
+            with medir.fase("semantico") as metrica:
+                analizador = _run_semantico(resultado.ast, errors)
+                salidas["semantico"] = _format_semantico(analizador)
+                salidas["simbolos"] = analizador.tabla.formatear()
+                resultado.simbolos = analizador.tabla.filas()
+            metrica.tokens = len(validos)
+
+        # Fase 4: Código Intermedio
+        if not errors and "intermedio" in phases_to_run:
+            with medir.fase("intermedio"):
+                resultado.cuadruplos, salidas["intermedio"] = _run_intermedio(analizador, errors)
+
+        # Fase 5: Ejecución
+        if not errors and "ejecutar" in phases_to_run:
+            with medir.fase("ejecutar"):
+                salidas["ejecutar"] = _run_ejecutar(errors)
+    finally:
+        if iniciar_tracemalloc:
+            tracemalloc.stop()
 
     if errors:
-        sys.exit(1)
+        # Los errores léxicos determinan el código aunque el sintáctico haya
+        # corrido; si no, la última fase con salida es la que reportó el error
+        if errores_lexicos:
+            fallida = "lexico"
+        else:
+            fallida = [fase for fase in PHASES if fase in salidas][-1]
+        resultado.codigo = EXIT_CODES[fallida]
+        resultado.fase_fallida = fallida
 
-    # Fase 2: Sintáctico
-    if "sintactico" in phases_to_run:
-        ast_text = _run_sintactico(source_code, tokens, errors)
-        _write(OUTPUT_FILES["sintactico"], ast_text)
+    return resultado
 
-    if errors:
-        _write(OUTPUT_FILES["errors"], "\n".join(errors))
-        sys.exit(2)
 
-    # Fase 3: Semántico
-    if "semantico" in phases_to_run:
-        symbol_table, semantic_info = _run_semantico(source_code, tokens, errors)
-        _write(OUTPUT_FILES["semantico"], semantic_info)
-        _write(OUTPUT_FILES["simbolos"], symbol_table)
+def _resumen_perfil(resultado: Compilacion, directorio: Path):
+    """Imprime en stderr las métricas y las funciones más costosas de cada fase."""
+    for metrica in resultado.metricas:
+        print(
+            f"== {metrica.fase}: {metrica.segundos * 1000:.1f} ms "
+            f"(CPU {metrica.cpu_segundos * 1000:.1f} ms) ==",
+            file=sys.stderr,
+        )
+        estadisticas = pstats.Stats(str(directorio / f"{metrica.fase}.prof"), stream=sys.stderr)
+        estadisticas.sort_stats("cumulative").print_stats(_PERFIL_LINEAS)
 
-    if errors:
-        _write(OUTPUT_FILES["errors"], "\n".join(errors))
-        sys.exit(3)
 
-    # Fase 4: Código Intermedio
-    if "intermedio" in phases_to_run:
-        intermediate = _run_intermedio(errors)
-        _write(OUTPUT_FILES["intermedio"], intermediate)
+# Modo servidor (--serve)
 
-    if errors:
-        _write(OUTPUT_FILES["errors"], "\n".join(errors))
-        sys.exit(4)
+def _serve(entrada: TextIO, salida: TextIO):
+    """
+    Atiende peticiones de compilación hasta el fin de `entrada`.
 
-    # Fase 5: Ejecución
-    if "ejecutar" in phases_to_run:
-        exec_output = _run_ejecutar(errors)
-        _write(OUTPUT_FILES["ejecutar"], exec_output)
+    Cada petición es una línea JSON:
+        {"id": 1, "path": "C:/prog.caos", "phase": "semantico"}
+        {"id": 2, "source": "main { ... }"}              (fuente en línea)
+        {"id": 3, "path": "C:/prog.caos", "memoria": true}   (ver medir_memoria)
 
-    if errors:
-        _write(OUTPUT_FILES["errors"], "\n".join(errors))
-        sys.exit(5)
+    y cada respuesta otra línea JSON con el mismo "id" y el documento de
+    Compilacion.documento() (el mismo de --format json):
+        {"id": 1, "codigo": 3, "fase_fallida": "semantico", "salidas": {...}, "errores": [...]}
+        {"id": 2, "error": "..."}          (petición inválida o fallo interno)
 
-    # Sin errores
-    _write(OUTPUT_FILES["errors"], "")
-    sys.exit(0)
+    No se toca el disco. Un fallo al atender una petición se reporta en su
+    respuesta y el servidor sigue en espera.
+    """
+    for linea in entrada:
+        if not linea.strip():
+            continue
+        try:
+            peticion = json.loads(linea)
+        except ValueError as exc:
+            respuesta = {"id": None, "error": f"Petición JSON inválida: {exc}"}
+        else:
+            respuesta = _atender(peticion)
+        salida.write(json.dumps(respuesta, ensure_ascii=False) + "\n")
+        salida.flush()
+
+
+def _atender(peticion: dict) -> dict:
+    """Compila una petición de _serve y arma su respuesta."""
+    id_peticion = peticion.get("id")
+    phase = peticion.get("phase")
+    memoria = bool(peticion.get("memoria", False))
+    if phase is not None and phase not in PHASES:
+        return {"id": id_peticion, "error": f"Fase desconocida: {phase!r}"}
+
+    try:
+        if "source" in peticion:
+            resultado = compilar(peticion["source"], phase, medir_memoria=memoria)
+        elif "path" in peticion:
+            source_path = Path(peticion["path"])
+            if not source_path.exists():
+                resultado = _no_encontrado(source_path)
+            else:
+                with source_path.open("r", encoding="utf-8", errors="replace") as source_file:
+                    resultado = compilar(source_file, phase, medir_memoria=memoria)
+        else:
+            return {"id": id_peticion, "error": "La petición requiere 'path' o 'source'"}
+    except Exception:  # noqa: BLE001
+        return {"id": id_peticion, "error": traceback.format_exc()}
+
+    return {"id": id_peticion, **resultado.documento()}
+
+
+def _no_encontrado(source_path: Path) -> Compilacion:
+    return Compilacion(
+        errores=[f"[LEXICO] Archivo fuente no encontrado: {source_path}"],
+        codigo=1,
+        fase_fallida="lexico",
+    )
 
 
 # Implementaciones stub de cada fase
 # (serán reemplazadas por el compilador real)
 
-def _run_lexico(source: str, errors: list) -> list[tuple]:
+def _run_lexico(source: Union[str, TextIO], errors: list) -> "TokenBuffer":
     """
     Analizador léxico real basado en DFA.
 
     Delega completamente al DFALexer definido en lexer/dfa_lexer.py,
     el cual implementa el autómata de automata.md estado por estado.
+    Se usa el recorrido por bloques del motor de tablas (lexer/dfa_tabla.py),
+    que produce exactamente los mismos tokens y errores que el motor clásico.
 
-    Retorna una lista de tuplas (tipo, valor, línea, columna) compatible
-    con el resto del pipeline del compilador.
+    `source` puede ser el código fuente completo o un archivo de texto
+    abierto; en ese caso se lee por bloques y los tokens se consumen a
+    medida que se producen.
 
-    Los tokens de tipo ERROR se excluyen de la lista de tokens válidos y
-    sus mensajes se propagan al listado de `errors`.
+    Retorna un TokenBuffer (lexer/token_buffer.py): los tokens quedan en
+    arreglos por columna y los lexemas como rangos del texto fuente, sin un
+    objeto por token. buffer.filas() da las tuplas (tipo, valor, línea,
+    columna) que usa el resto del pipeline del compilador.
 
-    TODO: cuando se implemente el reporte a errors.txt con línea/columna,
-          los mensajes de errors[] de aquí deben escribirse en ese archivo.
+    Retorna el buffer completo, con los tokens ERROR y el EOF; compilar()
+    los excluye de la lista de tokens válidos. Los mensajes de error se
+    propagan al listado de `errors`.
     """
     import sys
     import os
@@ -132,70 +513,129 @@ def _run_lexico(source: str, errors: list) -> list[tuple]:
 
     from lexer.dfa_lexer import DFALexer
 
-    lexer = DFALexer()
-    raw_tokens, lex_errors = lexer.tokenize(source)
+    lexer = DFALexer(engine="tabla")
 
-    # Propagar errores léxicos al listado general de errores
-    errors.extend(lex_errors)
+    # Los errores léxicos se propagan directamente al listado general
+    return lexer.tokenize_buffer(source, errors)
 
-    # Convertir Token dataclass → tupla, excluyendo ERROR y EOF
-    result = []
-    for tok in raw_tokens:
-        if tok.tipo in ("ERROR", "EOF"):
-            continue
-        result.append((tok.tipo, tok.valor, tok.linea, tok.columna))
 
-    return result
+def _errores_lexicos(tokens: "TokenBuffer") -> list[str]:
+    """Mensajes de error léxico de un TokenBuffer calculado fuera de compilar()."""
+    from lexer.dfa_tabla import errores_de_buffer
+
+    return errores_de_buffer(tokens)
 
 
-def _format_tokens(tokens: list[tuple]) -> str:
+def _format_tokens(tokens: "TokenBuffer") -> str:
     if not tokens:
         return "(sin tokens)\n"
     header = f"{'#':<5} {'TIPO':<15} {'VALOR':<20} {'LÍN':>5} {'COL':>5}\n"
     sep    = "-" * 50 + "\n"
     rows   = "".join(
         f"{i:<5} {t:<15} {v:<20} {ln:>5} {col:>5}\n"
-        for i, (t, v, ln, col) in enumerate(tokens, 1)
+        for i, (t, v, ln, col) in enumerate(tokens.filas(), 1)
     )
     return header + sep + rows
 
 
-def _run_sintactico(source: str, tokens: list, errors: list) -> str:
-    """Stub: retorna una representación textual plana del árbol."""
-    return (
-        "Árbol Sintáctico (stub)\n"
-        "=======================\n"
-        f"  Tokens procesados: {len(tokens)}\n"
-        "  [Implementación real pendiente]\n"
-    )
+def _run_sintactico(tokens: "TokenBuffer", errors: list) -> "Arbol":
+    """
+    Analizador sintáctico de descenso recursivo (sintactico/parser.py).
+
+    Recorre `tokens` (el buffer del léxico, sin tokens ERROR) directamente,
+    sin copiarlo, y construye el AST en una arena de arreglos
+    (sintactico/arbol.py). Los errores de sintaxis no lo detienen: se
+    recupera en modo pánico, todos sus mensajes se agregan a `errors` y el
+    árbol retornado queda parcial.
+    """
+    from sintactico import Parser
 
+    parser = Parser(tokens)
+    ast = parser.analizar()
+    errors.extend(parser.errores)
+    return ast
 
-def _run_semantico(source: str, tokens: list, errors: list) -> tuple[str, str]:
+
+def _format_ast(ast: "Arbol", errores: int = 0) -> str:
+    """Contenido de syntax.txt: el AST indentado, un nodo por línea."""
+    header = "Árbol Sintáctico\n================\n"
+    if errores:
+        header += (
+            f"(parcial: {errores} error(es) de sintaxis; las partes que no se "
+            "pudieron analizar aparecen como ERROR)\n"
+        )
+    return header + f"Nodos: {len(ast)}\n\n" + ast.formatear()
+
+
+def _run_semantico(ast: "Arbol", errors: list) -> "AnalizadorSemantico":
     """
-    Stub: retorna (tabla_de_simbolos, info_semantica).
+    Análisis semántico sobre el AST (semantico/analizador.py): un solo
+    recorrido que arma la tabla de símbolos con sus ámbitos, verifica que
+    cada variable usada esté declarada (y no declarada dos veces en un
+    ámbito), infiere y verifica los tipos de las expresiones y pliega las
+    subexpresiones constantes.
+
+    Retorna el analizador (tabla de símbolos, tipos y valores plegados, que
+    usa la fase intermedia); los errores se agregan a `errors`.
     """
-    idents = {v for t, v, *_ in tokens if t == "IDENT"}
-    symbol_table = (
-        "Tabla de Símbolos (stub)\n"
-        "========================\n"
-        + "\n".join(f"  {name}" for name in sorted(idents))
-        + "\n"
-    )
-    semantic_info = (
-        "Análisis Semántico (stub)\n"
-        "=========================\n"
-        f"  Identificadores encontrados: {len(idents)}\n"
-        "  [Implementación real pendiente]\n"
-    )
-    return symbol_table, semantic_info
+    from semantico import AnalizadorSemantico
 
+    analizador = AnalizadorSemantico(ast)
+    analizador.analizar()
+    errors.extend(analizador.errores)
+    return analizador
 
-def _run_intermedio(errors: list) -> str:
-    return (
-        "Código Intermedio (stub)\n"
-        "========================\n"
-        "  [Implementación real pendiente]\n"
+
+def _format_semantico(analizador: "AnalizadorSemantico") -> str:
+    """
+    Contenido de semantic.txt: resumen del análisis, expresiones plegadas
+    (con su tipo y valor) y advertencias.
+    """
+    from semantico.tipos import NOMBRES, formatear_valor
+
+    tabla = analizador.tabla
+    info = (
+        "Análisis Semántico\n"
+        "==================\n"
+        f"  Símbolos declarados   : {len(tabla)}\n"
+        f"  Ámbitos               : {tabla.ambitos}\n"
+        f"  Referencias           : {analizador.referencias}\n"
+        f"  Variables no declaradas: {len(analizador.no_declarados)}\n"
+        f"  Expresiones plegadas  : {len(analizador.plegadas)}\n"
+        f"  Errores               : {len(analizador.errores)}\n"
     )
+    if analizador.plegadas:
+        filas = []
+        for n in analizador.plegadas:
+            linea, columna = analizador.posicion(n)
+            filas.append(
+                f"  línea {linea:>5}, columna {columna:>3}: {analizador.texto(n)} "
+                f"= {formatear_valor(analizador.valores[n])} "
+                f"({NOMBRES[analizador.tipos[n]]})\n"
+            )
+        info += "\nConstantes plegadas\n-------------------\n" + "".join(filas)
+    if analizador.advertencias:
+        info += "\nAdvertencias\n------------\n" + "".join(
+            f"  {advertencia}\n" for advertencia in analizador.advertencias
+        )
+    return info
+
+
+def _run_intermedio(analizador: "AnalizadorSemantico", errors: list) -> tuple["Codigo", str]:
+    """
+    Genera el código de tres direcciones del programa analizado
+    (intermedio/generador.py) y lo divide en bloques básicos con su grafo de
+    flujo (intermedio/bloques.py).
+
+    Retorna (codigo, listado de intermediate.txt); los errores se agregan a
+    `errors`.
+    """
+    from intermedio import GeneradorIntermedio, GrafoFlujo
+
+    generador = GeneradorIntermedio(analizador)
+    codigo = generador.generar()
+    errors.extend(generador.errores)
+    return codigo, GrafoFlujo(codigo).formatear()
 
 
 def _run_ejecutar(errors: list) -> str:
@@ -212,5 +652,11 @@ def _write(filename: str, content: str):
     Path(filename).write_text(content, encoding="utf-8")
 
 
+def _write_json(documento: dict):
+    sys.stdout.reconfigure(encoding="utf-8")
+    json.dump(documento, sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+
+
 if __name__ == "__main__":
     main()
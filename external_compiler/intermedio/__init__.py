@@ -0,0 +1,8 @@
+# Módulo de código intermedio del compilador CAOS
+# Exporta el código de tres direcciones (cuádruplos), su generador y el grafo de flujo.
+
+from .bloques import GrafoFlujo
+from .cuadruplos import Clase, Codigo, Op
+from .generador import GeneradorIntermedio
+
+__all__ = ["Clase", "Codigo", "GeneradorIntermedio", "GrafoFlujo", "Op"]
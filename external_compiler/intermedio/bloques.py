@@ -0,0 +1,159 @@
+"""
+bloques.py
+----------
+Bloques básicos y grafo de flujo de control (CFG) de un Codigo
+(cuadruplos.py).
+
+Un bloque básico es una secuencia de cuádruplos que solo se entra por el
+primero y solo se sale por el último. Empieza un bloque (es "líder"):
+
+    - el primer cuádruplo;
+    - cada ETIQUETA (destino de un salto);
+    - el cuádruplo siguiente a un salto o a un return.
+
+Los bloques se guardan como arreglos, como los cuádruplos: `inicios[b]` es
+el primer cuádruplo del bloque b (el bloque termina donde empieza el
+siguiente), y las aristas del grafo en formato disperso por filas: los
+sucesores de b son sucesores[desde[b]:desde[b + 1]] (igual con
+predecesores). Todo se arma en dos pasadas lineales sobre los cuádruplos.
+
+Aristas: un goto lleva a su destino; un if / ifFalse a su destino y al
+bloque siguiente; un return a ninguno (sale del programa); cualquier otro
+final de bloque sigue al bloque siguiente.
+
+Uso:
+    grafo = GrafoFlujo(codigo)
+    len(grafo), grafo.cuadruplos(b)          → bloques, range de sus cuádruplos
+    grafo.sucesores(b), grafo.predecesores(b)
+    grafo.alcanzables()                      → bytearray: 1 si b se alcanza desde B0
+    grafo.formatear()                        → listado de intermediate.txt
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Sequence
+
+from .cuadruplos import SALTOS, TERMINALES, Codigo, Op
+
+
+class GrafoFlujo:
+    """Bloques básicos de `codigo` y sus aristas."""
+
+    __slots__ = (
+        "codigo", "inicios", "_sucesores", "_desde_sucesores",
+        "_predecesores", "_desde_predecesores",
+    )
+
+    def __init__(self, codigo: Codigo):
+        self.codigo = codigo
+        ops, res = codigo.ops, codigo.res
+        n = len(ops)
+
+        # Líderes
+        lider = bytearray(n + 1)
+        if n:
+            lider[0] = 1
+        for i, op in enumerate(ops):
+            if op == Op.ETIQUETA:
+                lider[i] = 1
+            elif op in TERMINALES:
+                lider[i + 1] = 1
+        self.inicios = array("i", (i for i in range(n) if lider[i]))
+        bloques = len(self.inicios)
+        bloque_de = {inicio: b for b, inicio in enumerate(self.inicios)}
+
+        # Sucesores (en orden: destino del salto, luego el bloque siguiente)
+        sucesores = array("i")
+        desde = array("i", [0])
+        for b in range(bloques):
+            ultimo = (self.inicios[b + 1] if b + 1 < bloques else n) - 1
+            op = ops[ultimo]
+            if op in SALTOS:
+                destino = bloque_de[codigo.destino(res[ultimo])]
+                sucesores.append(destino)
+                if op != Op.SALTO and b + 1 < bloques and destino != b + 1:
+                    sucesores.append(b + 1)
+            elif op != Op.RETORNO and b + 1 < bloques:
+                sucesores.append(b + 1)
+            desde.append(len(sucesores))
+        self._sucesores, self._desde_sucesores = sucesores, desde
+
+        # Predecesores: las mismas aristas invertidas (conteo y reparto)
+        cuenta = array("i", bytes(4 * (bloques + 1)))
+        for destino in sucesores:
+            cuenta[destino + 1] += 1
+        for b in range(bloques):
+            cuenta[b + 1] += cuenta[b]
+        predecesores = array("i", bytes(4 * len(sucesores)))
+        siguiente = array("i", cuenta)
+        for b in range(bloques):
+            for k in range(desde[b], desde[b + 1]):
+                destino = sucesores[k]
+                predecesores[siguiente[destino]] = b
+                siguiente[destino] += 1
+        self._predecesores, self._desde_predecesores = predecesores, cuenta
+
+    def __len__(self) -> int:
+        return len(self.inicios)
+
+    def cuadruplos(self, b: int) -> range:
+        """Índices de los cuádruplos del bloque b."""
+        fin = self.inicios[b + 1] if b + 1 < len(self.inicios) else len(self.codigo)
+        return range(self.inicios[b], fin)
+
+    def sucesores(self, b: int) -> Sequence[int]:
+        return self._sucesores[self._desde_sucesores[b]:self._desde_sucesores[b + 1]]
+
+    def predecesores(self, b: int) -> Sequence[int]:
+        return self._predecesores[self._desde_predecesores[b]:self._desde_predecesores[b + 1]]
+
+    @property
+    def aristas(self) -> int:
+        return len(self._sucesores)
+
+    def alcanzables(self) -> bytearray:
+        """1 en cada bloque al que se llega desde el primero (recorrido con pila)."""
+        visto = bytearray(len(self))
+        pila = [0] if len(self) else []
+        while pila:
+            b = pila.pop()
+            if visto[b]:
+                continue
+            visto[b] = 1
+            pila.extend(s for s in self.sucesores(b) if not visto[s])
+        return visto
+
+    def formatear(self) -> str:
+        """
+        Listado de intermediate.txt: cada bloque con sus aristas y sus
+        cuádruplos, en forma de tupla y de código de tres direcciones.
+
+            B1  ← B0  → B3, B2
+                 4  (<, x, 10, t2)             t2 = x < 10
+                 5  (ifFalse, t2, -, L2)       ifFalse t2 goto L2
+        """
+        codigo = self.codigo
+        alcanzable = self.alcanzables()
+        lineas = [
+            "Código Intermedio (cuádruplos)\n"
+            "==============================\n"
+            f"Cuádruplos: {len(codigo)}    Temporales: {codigo.temporales}    "
+            f"Etiquetas: {codigo.etiquetas}    Bloques: {len(self)}    Aristas: {self.aristas}\n"
+        ]
+        if not len(self):
+            lineas.append("(sin código)\n")
+        for b in range(len(self)):
+            encabezado = f"B{b}"
+            if len(self.predecesores(b)):
+                encabezado += "  ← " + ", ".join(f"B{p}" for p in self.predecesores(b))
+            if len(self.sucesores(b)):
+                encabezado += "  → " + ", ".join(f"B{s}" for s in self.sucesores(b))
+            else:
+                encabezado += "  → fin"
+            if not alcanzable[b]:
+                encabezado += "  (inalcanzable)"
+            lineas.append("\n" + encabezado + "\n")
+            for i in self.cuadruplos(b):
+                lineas.append(f"    {i:>5}  {codigo.cuadruplo(i):<30} {codigo.legible(i)}\n")
+        return "".join(lineas)
@@ -0,0 +1,216 @@
+"""
+cuadruplos.py
+-------------
+Código de tres direcciones del compilador CAOS, como cuádruplos
+(operación, arg1, arg2, resultado) almacenados en arreglos paralelos del
+módulo `array`, igual que el AST (sintactico/arbol.py):
+
+    ops   array('B')  operación (valor de Op)
+    arg1  array('i')  primer operando (-1 si no tiene)
+    arg2  array('i')  segundo operando (-1 si no tiene)
+    res   array('i')  resultado, variable leída o etiqueta destino (-1 si no tiene)
+
+Los operandos son enteros: índices en la tabla `operandos` (texto) y
+`clases` (variable, constante, temporal o etiqueta). Cada texto se guarda
+una sola vez, así que comparar operandos es comparar enteros.
+
+Operaciones (forma legible entre paréntesis):
+
+    ASIGNAR                 res = arg1
+    SUMA ... MAYOR_IGUAL    res = arg1 <op> arg2      (+ - * / % ^ == != < <= > >=)
+    Y, O                    res = arg1 && arg2, res = arg1 || arg2
+    NEGATIVO, NO            res = -arg1, res = !arg1
+    LEER, ESCRIBIR          cin res, cout arg1
+    ETIQUETA                res:
+    SALTO                   goto res
+    SALTO_SI, SALTO_SI_NO   if arg1 goto res, ifFalse arg1 goto res
+    RETORNO                 return [arg1]
+
+Uso:
+    codigo = Codigo()
+    x, uno = codigo.variable("x"), codigo.constante("1")
+    codigo.emitir(Op.SUMA, x, uno, x)
+    codigo.legible(0)          → "x = x + 1"
+"""
+
+from __future__ import annotations
+
+from array import array
+from enum import IntEnum, auto
+from typing import Iterator
+
+# Operando omitido
+NINGUNO = -1
+
+
+class Op(IntEnum):
+    """Operación de un cuádruplo."""
+    ASIGNAR        = auto()
+    SUMA           = auto()
+    RESTA          = auto()
+    MULTIPLICACION = auto()
+    DIVISION       = auto()
+    MODULO         = auto()
+    POTENCIA       = auto()
+    IGUAL          = auto()
+    DIFERENTE      = auto()
+    MENOR          = auto()
+    MENOR_IGUAL    = auto()
+    MAYOR          = auto()
+    MAYOR_IGUAL    = auto()
+    Y              = auto()
+    O              = auto()
+    NEGATIVO       = auto()
+    NO             = auto()
+    LEER           = auto()
+    ESCRIBIR       = auto()
+    ETIQUETA       = auto()
+    SALTO          = auto()
+    SALTO_SI       = auto()
+    SALTO_SI_NO    = auto()
+    RETORNO        = auto()
+
+
+class Clase(IntEnum):
+    """Clase de un operando."""
+    VARIABLE  = auto()
+    CONSTANTE = auto()
+    TEMPORAL  = auto()
+    ETIQUETA  = auto()
+
+
+# Operaciones que terminan un bloque básico
+SALTOS = frozenset({Op.SALTO, Op.SALTO_SI, Op.SALTO_SI_NO})
+TERMINALES = SALTOS | {Op.RETORNO}
+
+# Nombre de cada operación en la columna del cuádruplo
+NOMBRES: dict[int, str] = {
+    Op.ASIGNAR: "=", Op.SUMA: "+", Op.RESTA: "-", Op.MULTIPLICACION: "*",
+    Op.DIVISION: "/", Op.MODULO: "%", Op.POTENCIA: "^", Op.IGUAL: "==",
+    Op.DIFERENTE: "!=", Op.MENOR: "<", Op.MENOR_IGUAL: "<=", Op.MAYOR: ">",
+    Op.MAYOR_IGUAL: ">=", Op.Y: "&&", Op.O: "||", Op.NEGATIVO: "uminus",
+    Op.NO: "!", Op.LEER: "cin", Op.ESCRIBIR: "cout", Op.ETIQUETA: "label",
+    Op.SALTO: "goto", Op.SALTO_SI: "if", Op.SALTO_SI_NO: "ifFalse",
+    Op.RETORNO: "return",
+}
+# Operaciones binarias: res = arg1 <símbolo> arg2
+BINARIAS = frozenset(range(Op.SUMA, Op.O + 1))
+
+
+class Codigo:
+    """
+    Secuencia de cuádruplos y tabla de operandos.
+
+    Uso:
+        len(codigo), codigo.ops[i], codigo.arg1[i], ...   → cuádruplos
+        codigo.texto(operando), codigo.clases[operando]   → operandos
+        codigo.destino(etiqueta)                          → índice de su ETIQUETA
+        codigo.legible(i)                                 → "t1 = a + b"
+    """
+
+    __slots__ = (
+        "ops", "arg1", "arg2", "res", "operandos", "clases", "temporales",
+        "etiquetas", "_indices", "_destinos",
+    )
+
+    def __init__(self):
+        self.ops  = array("B")
+        self.arg1 = array("i")
+        self.arg2 = array("i")
+        self.res  = array("i")
+        self.operandos: list[str] = []
+        self.clases = array("B")
+        self.temporales = 0
+        self.etiquetas = 0
+        self._indices: dict[str, int] = {}
+        # Etiqueta → índice de su cuádruplo ETIQUETA
+        self._destinos: dict[int, int] = {}
+
+    # -- Operandos ----------------------------------------------------------------
+
+    def _operando(self, texto: str, clase: Clase) -> int:
+        indice = self._indices.get(texto)
+        if indice is None:
+            indice = self._indices[texto] = len(self.operandos)
+            self.operandos.append(texto)
+            self.clases.append(clase)
+        return indice
+
+    def variable(self, nombre: str) -> int:
+        return self._operando(nombre, Clase.VARIABLE)
+
+    def constante(self, texto: str) -> int:
+        return self._operando(texto, Clase.CONSTANTE)
+
+    def temporal(self) -> int:
+        """Temporal nuevo (t1, t2, ...): cada uno se asigna una sola vez."""
+        self.temporales += 1
+        return self._operando(f"t{self.temporales}", Clase.TEMPORAL)
+
+    def etiqueta(self) -> int:
+        """Etiqueta nueva (L1, L2, ...); se ubica al emitir su ETIQUETA."""
+        self.etiquetas += 1
+        return self._operando(f"L{self.etiquetas}", Clase.ETIQUETA)
+
+    def texto(self, operando: int) -> str:
+        return self.operandos[operando] if operando >= 0 else "-"
+
+    # -- Cuádruplos -----------------------------------------------------------------
+
+    def emitir(self, op: Op, arg1: int = NINGUNO, arg2: int = NINGUNO,
+               res: int = NINGUNO) -> int:
+        """Agrega un cuádruplo y retorna su índice."""
+        i = len(self.ops)
+        self.ops.append(op)
+        self.arg1.append(arg1)
+        self.arg2.append(arg2)
+        self.res.append(res)
+        if op == Op.ETIQUETA:
+            self._destinos[res] = i
+        return i
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def destino(self, etiqueta: int) -> int:
+        """Índice del cuádruplo ETIQUETA de `etiqueta`."""
+        return self._destinos[etiqueta]
+
+    def cuadruplo(self, i: int) -> str:
+        """El cuádruplo i como tupla: "(+, a, b, t1)"."""
+        texto = self.texto
+        return (
+            f"({NOMBRES[self.ops[i]]}, {texto(self.arg1[i])}, "
+            f"{texto(self.arg2[i])}, {texto(self.res[i])})"
+        )
+
+    def legible(self, i: int) -> str:
+        """El cuádruplo i como código de tres direcciones: "t1 = a + b"."""
+        op = self.ops[i]
+        a, b, r = self.texto(self.arg1[i]), self.texto(self.arg2[i]), self.texto(self.res[i])
+        if op in BINARIAS:
+            return f"{r} = {a} {NOMBRES[op]} {b}"
+        if op == Op.ASIGNAR:
+            return f"{r} = {a}"
+        if op == Op.NEGATIVO:
+            return f"{r} = -{a}"
+        if op == Op.NO:
+            return f"{r} = !{a}"
+        if op == Op.LEER:
+            return f"cin {r}"
+        if op == Op.ESCRIBIR:
+            return f"cout {a}"
+        if op == Op.ETIQUETA:
+            return f"{r}:"
+        if op == Op.SALTO:
+            return f"goto {r}"
+        if op in (Op.SALTO_SI, Op.SALTO_SI_NO):
+            return f"{NOMBRES[op]} {a} goto {r}"
+        return "return" if self.arg1[i] < 0 else f"return {a}"
+
+    def __iter__(self) -> Iterator[tuple[int, int, int, int]]:
+        """(op, arg1, arg2, res) de cada cuádruplo, en orden."""
+        return zip(self.ops, self.arg1, self.arg2, self.res)
+
+    def __repr__(self) -> str:
+        return f"Codigo({len(self)} cuádruplos)"
@@ -0,0 +1,356 @@
+"""
+generador.py
+------------
+Generación de código de tres direcciones (cuadruplos.py) a partir del AST
+ya analizado por el semántico (semantico/analizador.py).
+
+Las sentencias se recorren recursivamente (su anidamiento está acotado por
+MAX_ANIDAMIENTO del parser) y las expresiones con una pila explícita, en
+postorden, como en el resto del compilador. Cada operación va a un
+temporal nuevo (t1, t2, ...: cada temporal se asigna una sola vez); la
+operación más externa de una asignación escribe directamente en la
+variable, sin temporal ni copia.
+
+Aprovecha el plegado de constantes del semántico: una expresión con valor
+conocido se emite como una constante, y una condición constante elimina
+la rama o el ciclo que nunca se ejecuta ("if (2>3) then ..." solo emite el
+else). Con plegar=False solo los literales son constantes (para comparar
+el tamaño del código).
+
+Esquemas (Lx son etiquetas nuevas; "salir" es el destino de break):
+
+    if c then A else B end   c; ifFalse c goto L1; A; goto L2; L1: B; L2:
+    while c { A }            L1: c; ifFalse c goto L2; A; goto L1; L2:
+    do A until c;            L1: A; c; ifFalse c goto L1; L2:
+    for (i; c; p) { A }      i; L1: c; ifFalse c goto L2; A; p; goto L1; L2:
+    switch e { case v {A} default {B} }
+                             e; t = e == v; if t goto L1; goto L2;
+                             L1: A; goto L3; L2: B; L3:
+
+Las variables que se declaran en más de un ámbito (o que se llaman como un
+temporal o una etiqueta) se distinguen con el número de su ámbito: x@2.
+
+Errores (formato de errors.txt):
+
+    [INTERMEDIO] 'break' fuera de un ciclo o switch en línea 9, columna 5
+
+Uso:
+    generador = GeneradorIntermedio(analizador)
+    codigo = generador.generar()          # Codigo
+    generador.errores
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import Callable, Optional
+
+from lexer.token_types import TokenType
+from semantico.analizador import AnalizadorSemantico
+from semantico.tabla_simbolos import Simbolo
+from sintactico.arbol import Nodo
+
+from .cuadruplos import NINGUNO, Codigo, Op
+
+# Operador de un nodo BINARIO / UNARIO (código de su token) → operación
+_BINARIAS: dict[int, Op] = {
+    TokenType.SUMA: Op.SUMA, TokenType.RESTA: Op.RESTA,
+    TokenType.MULTIPLICACION: Op.MULTIPLICACION, TokenType.DIVISION: Op.DIVISION,
+    TokenType.MODULO: Op.MODULO, TokenType.POTENCIA: Op.POTENCIA,
+    TokenType.IGUAL: Op.IGUAL, TokenType.DIFERENTE: Op.DIFERENTE,
+    TokenType.MENOR: Op.MENOR, TokenType.MENOR_IGUAL: Op.MENOR_IGUAL,
+    TokenType.MAYOR: Op.MAYOR, TokenType.MAYOR_IGUAL: Op.MAYOR_IGUAL,
+    TokenType.AND: Op.Y, TokenType.OR: Op.O,
+}
+_UNARIAS: dict[int, Op] = {TokenType.RESTA: Op.NEGATIVO, TokenType.NEGACION: Op.NO}
+
+# Literales que son constantes aun sin plegar
+_LITERALES = frozenset({Nodo.ENTERO, Nodo.REAL})
+# Hojas cuyo lexema es el operando (cadenas y caracteres con sus comillas)
+_TEXTUALES = frozenset({Nodo.CADENA, Nodo.CARACTER})
+
+# Nombres reservados para temporales y etiquetas
+_NOMBRE_INTERNO = re.compile(r"[tL]\d+")
+
+
+def _constante(valor) -> str:
+    """Texto de un valor plegado como operando (lógicos como 1 / 0)."""
+    if isinstance(valor, bool):
+        return "1" if valor else "0"
+    return repr(valor)
+
+
+class GeneradorIntermedio:
+    """
+    Traduce a cuádruplos el AST de `analizador` (después de analizar()).
+
+    Parámetros:
+        analizador (AnalizadorSemantico): análisis del programa (tabla de
+                                          símbolos, valores plegados).
+        plegar (bool): usar los valores plegados (por defecto True).
+    """
+
+    def __init__(self, analizador: AnalizadorSemantico, plegar: bool = True):
+        self.analizador = analizador
+        self.arbol = analizador.arbol
+        self.plegar = plegar
+        self.codigo = Codigo()
+        self.errores: list[str] = []
+        # Etiqueta de salida de los ciclos / switch abiertos (destino de break)
+        self._salidas: list[int] = []
+        self._variables: dict[Simbolo, int] = {}
+
+        repetidos = Counter(simbolo.nombre for simbolo in analizador.tabla.simbolos)
+        self._con_ambito = {nombre for nombre, veces in repetidos.items() if veces > 1}
+
+        # Clase de sentencia → método que la traduce
+        self._sentencias: dict[int, Callable[[int], None]] = {
+            Nodo.BLOQUE: self._bloque,
+            Nodo.DECLARACION: lambda n: None,
+            Nodo.ASIGNACION: self._asignacion,
+            Nodo.INCREMENTO: self._incremento,
+            Nodo.SI: self._si,
+            Nodo.MIENTRAS: self._mientras,
+            Nodo.HACER: self._hacer,
+            Nodo.PARA: self._para,
+            Nodo.SEGUN: self._segun,
+            Nodo.LEER: self._leer,
+            Nodo.ESCRIBIR: self._escribir,
+            Nodo.ROMPER: self._romper,
+            Nodo.RETORNO: self._retorno,
+            Nodo.VACIO: lambda n: None,
+        }
+
+    def generar(self) -> Codigo:
+        """Traduce el programa completo y retorna su código."""
+        if len(self.arbol):
+            self._bloque(self.arbol.raiz)
+        return self.codigo
+
+    # -- Operandos ----------------------------------------------------------------
+
+    def _variable(self, n: int) -> int:
+        """Operando de la variable del nodo IDENTIFICADOR n."""
+        simbolo = self.analizador.resueltos.get(n)
+        if simbolo is None:
+            # No declarada (solo si se genera a pesar de errores semánticos)
+            return self.codigo.variable(self.arbol.lexema(n))
+        operando = self._variables.get(simbolo)
+        if operando is None:
+            nombre = simbolo.nombre
+            if nombre in self._con_ambito or _NOMBRE_INTERNO.fullmatch(nombre):
+                nombre = f"{nombre}@{simbolo.ambito}"
+            operando = self._variables[simbolo] = self.codigo.variable(nombre)
+        return operando
+
+    def _constante(self, n: int) -> Optional[int]:
+        """Operando constante de la expresión n, o None si no es constante."""
+        valor = self.analizador.valores.get(n)
+        if valor is None or not (self.plegar or self.arbol.tipos[n] in _LITERALES):
+            return None
+        return self.codigo.constante(_constante(valor))
+
+    def _hijos(self, n: int) -> list[int]:
+        return list(self.arbol.hijos(n))
+
+    # -- Expresiones --------------------------------------------------------------
+
+    def _expresion(self, n: int, destino: int = NINGUNO) -> int:
+        """
+        Emite el código de la expresión n y retorna el operando con su
+        valor. Con `destino`, la última operación escribe ahí (y se retorna
+        `destino`); si la expresión no tiene operaciones no emite nada.
+        """
+        arbol, codigo = self.arbol, self.codigo
+        tipos, primeros, siguientes = arbol.tipos, arbol.primeros, arbol.siguientes
+        token_tipos, token = arbol.tokens.tipos, arbol.token
+
+        # Un valor negativo (~m) en la pila marca la salida del operador m
+        resultados: list[int] = []
+        pila = [n]
+        while pila:
+            m = pila.pop()
+            if m < 0:
+                m = ~m
+                salida = destino if m == n and destino != NINGUNO else codigo.temporal()
+                if tipos[m] == Nodo.BINARIO:
+                    derecha = resultados.pop()
+                    izquierda = resultados.pop()
+                    codigo.emitir(_BINARIAS[token_tipos[token[m]]], izquierda, derecha, salida)
+                else:
+                    codigo.emitir(_UNARIAS[token_tipos[token[m]]], resultados.pop(), NINGUNO, salida)
+                resultados.append(salida)
+                continue
+            constante = self._constante(m)
+            if constante is not None:
+                resultados.append(constante)
+            elif tipos[m] == Nodo.IDENTIFICADOR:
+                resultados.append(self._variable(m))
+            elif tipos[m] in _TEXTUALES:
+                resultados.append(codigo.constante(arbol.lexema(m)))
+            else:
+                pila.append(~m)
+                hijo = primeros[m]
+                if tipos[m] == Nodo.BINARIO:
+                    pila.append(siguientes[hijo])
+                pila.append(hijo)
+        return resultados[0]
+
+    def _valor_constante(self, n: int):
+        """Valor plegado de la condición n (None si no es constante o no se pliega)."""
+        return self.analizador.valores.get(n) if self.plegar else None
+
+    # -- Sentencias ---------------------------------------------------------------
+
+    def _sentencia(self, n: int) -> None:
+        self._sentencias[self.arbol.tipos[n]](n)
+
+    def _bloque(self, n: int) -> None:
+        for hijo in self.arbol.hijos(n):
+            self._sentencia(hijo)
+
+    def _asignacion(self, n: int) -> None:
+        variable, expresion = self._hijos(n)
+        destino = self._variable(variable)
+        valor = self._expresion(expresion, destino)
+        if valor != destino:
+            self.codigo.emitir(Op.ASIGNAR, valor, NINGUNO, destino)
+
+    def _incremento(self, n: int) -> None:
+        variable = self._variable(self.arbol.primeros[n])
+        op = Op.SUMA if self.arbol.lexema(n) == "++" else Op.RESTA
+        self.codigo.emitir(op, variable, self.codigo.constante("1"), variable)
+
+    def _saltar(self, etiqueta: int) -> None:
+        """goto etiqueta, salvo justo después de otro goto o return (sería inalcanzable)."""
+        ops = self.codigo.ops
+        if not ops or ops[-1] not in (Op.SALTO, Op.RETORNO):
+            self.codigo.emitir(Op.SALTO, res=etiqueta)
+
+    def _saltar_si_falso(self, condicion: int, etiqueta: int) -> None:
+        self.codigo.emitir(Op.SALTO_SI_NO, self._expresion(condicion), NINGUNO, etiqueta)
+
+    def _si(self, n: int) -> None:
+        hijos = self._hijos(n)
+        condicion, entonces = hijos[0], hijos[1]
+        sino = hijos[2] if len(hijos) > 2 else None
+        valor = self._valor_constante(condicion)
+        if valor is not None:
+            # Condición constante: solo la rama que se ejecuta
+            if valor:
+                self._bloque(entonces)
+            elif sino is not None:
+                self._bloque(sino)
+            return
+        codigo = self.codigo
+        falso = codigo.etiqueta()
+        self._saltar_si_falso(condicion, falso)
+        self._bloque(entonces)
+        if sino is None:
+            codigo.emitir(Op.ETIQUETA, res=falso)
+            return
+        fin = codigo.etiqueta()
+        self._saltar(fin)
+        codigo.emitir(Op.ETIQUETA, res=falso)
+        self._bloque(sino)
+        codigo.emitir(Op.ETIQUETA, res=fin)
+
+    def _ciclo(self, cuerpo: int, salir: int) -> None:
+        """Cuerpo de un ciclo con `salir` como destino de break."""
+        self._salidas.append(salir)
+        self._bloque(cuerpo)
+        self._salidas.pop()
+
+    def _mientras(self, n: int) -> None:
+        condicion, cuerpo = self._hijos(n)
+        valor = self._valor_constante(condicion)
+        if valor is not None and not valor:
+            return  # while (falso): el cuerpo nunca se ejecuta
+        codigo = self.codigo
+        inicio, fin = codigo.etiqueta(), codigo.etiqueta()
+        codigo.emitir(Op.ETIQUETA, res=inicio)
+        if valor is None:
+            self._saltar_si_falso(condicion, fin)
+        self._ciclo(cuerpo, fin)
+        self._saltar(inicio)
+        codigo.emitir(Op.ETIQUETA, res=fin)
+
+    def _hacer(self, n: int) -> None:
+        cuerpo, condicion = self._hijos(n)
+        codigo = self.codigo
+        inicio, fin = codigo.etiqueta(), codigo.etiqueta()
+        codigo.emitir(Op.ETIQUETA, res=inicio)
+        self._ciclo(cuerpo, fin)
+        valor = self._valor_constante(condicion)
+        if valor is None:
+            # do ... until c: se repite mientras c sea falsa
+            self._saltar_si_falso(condicion, inicio)
+        elif not valor:
+            self._saltar(inicio)
+        codigo.emitir(Op.ETIQUETA, res=fin)
+
+    def _para(self, n: int) -> None:
+        inicializacion, condicion, paso, cuerpo = self._hijos(n)
+        self._sentencia(inicializacion)
+        valor = None if self.arbol.tipos[condicion] == Nodo.VACIO else self._valor_constante(condicion)
+        if valor is not None and not valor:
+            return  # la condición es falsa desde el principio
+        codigo = self.codigo
+        inicio, fin = codigo.etiqueta(), codigo.etiqueta()
+        codigo.emitir(Op.ETIQUETA, res=inicio)
+        if valor is None and self.arbol.tipos[condicion] != Nodo.VACIO:
+            self._saltar_si_falso(condicion, fin)
+        self._ciclo(cuerpo, fin)
+        self._sentencia(paso)
+        self._saltar(inicio)
+        codigo.emitir(Op.ETIQUETA, res=fin)
+
+    def _segun(self, n: int) -> None:
+        expresion, *casos = self._hijos(n)
+        codigo, tipos = self.codigo, self.arbol.tipos
+        valor = self._expresion(expresion)
+        fin = codigo.etiqueta()
+
+        # Comparaciones y saltos a cada caso; si ninguno coincide, default o fin
+        destinos = []
+        for caso in casos:
+            etiqueta = codigo.etiqueta()
+            destinos.append(etiqueta)
+            if tipos[caso] == Nodo.CASO:
+                igual = codigo.temporal()
+                comparado = self._expresion(self.arbol.primeros[caso])
+                codigo.emitir(Op.IGUAL, valor, comparado, igual)
+                codigo.emitir(Op.SALTO_SI, igual, NINGUNO, etiqueta)
+        defecto = [d for caso, d in zip(casos, destinos) if tipos[caso] == Nodo.DEFECTO]
+        self._saltar(defecto[0] if defecto else fin)
+
+        # Cuerpos: cada uno termina saltando al final (no hay caída al siguiente)
+        self._salidas.append(fin)
+        for caso, etiqueta in zip(casos, destinos):
+            codigo.emitir(Op.ETIQUETA, res=etiqueta)
+            hijos = self._hijos(caso)
+            self._bloque(hijos[-1])
+            self._saltar(fin)
+        self._salidas.pop()
+        codigo.emitir(Op.ETIQUETA, res=fin)
+
+    def _leer(self, n: int) -> None:
+        self.codigo.emitir(Op.LEER, res=self._variable(self.arbol.primeros[n]))
+
+    def _escribir(self, n: int) -> None:
+        self.codigo.emitir(Op.ESCRIBIR, self._expresion(self.arbol.primeros[n]))
+
+    def _romper(self, n: int) -> None:
+        if not self._salidas:
+            linea, columna = self.arbol.posicion(n)
+            self.errores.append(
+                f"[INTERMEDIO] 'break' fuera de un ciclo o switch en línea {linea}, "
+                f"columna {columna}"
+            )
+            return
+        self._saltar(self._salidas[-1])
+
+    def _retorno(self, n: int) -> None:
+        hijo = self.arbol.primeros[n]
+        self.codigo.emitir(Op.RETORNO, self._expresion(hijo) if hijo != -1 else NINGUNO)
@@ -0,0 +1,71 @@
+"""
+conformidad.py
+--------------
+Comparación entre motores del analizador léxico.
+
+El motor "clasico" (dfa_lexer.py) es la referencia: implementa el autómata
+de automata.md estado por estado. Los motores rápidos ("tabla", "regex")
+deben producir exactamente la misma salida. Este módulo compara dos salidas
+de `DFALexer.tokenize` y describe las diferencias encontradas.
+
+Uso:
+    diferencias = comparar(salida_referencia, salida_candidata)
+    if diferencias:
+        print("\\n".join(diferencias))
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from .dfa_lexer import Token
+
+# Máximo de diferencias descritas por comparación (el resto se resume)
+MAX_DIFERENCIAS = 10
+
+
+def comparar(
+    referencia: tuple[list[Token], list[str]],
+    candidata: tuple[list[Token], list[str]],
+    limite: int = MAX_DIFERENCIAS,
+) -> list[str]:
+    """
+    Compara dos salidas (tokens, errores) y retorna una lista de mensajes
+    legibles con las diferencias. Lista vacía → salidas idénticas.
+    """
+    tokens_ref, errores_ref = referencia
+    tokens_cand, errores_cand = candidata
+
+    diferencias: list[str] = []
+    _comparar_listas("tokens", tokens_ref, tokens_cand, diferencias, limite)
+    _comparar_listas("errores", errores_ref, errores_cand, diferencias, limite)
+    return diferencias
+
+
+def _comparar_listas(
+    nombre: str,
+    ref: list,
+    cand: list,
+    diferencias: list[str],
+    limite: int,
+) -> None:
+    if ref == cand:
+        return
+
+    if len(ref) != len(cand):
+        diferencias.append(
+            f"Cantidad de {nombre} distinta: referencia={len(ref)}, "
+            f"candidata={len(cand)}"
+        )
+
+    encontradas = 0
+    for i in range(max(len(ref), len(cand))):
+        a: Optional[object] = ref[i] if i < len(ref) else None
+        b: Optional[object] = cand[i] if i < len(cand) else None
+        if a == b:
+            continue
+        encontradas += 1
+        if encontradas > limite:
+            diferencias.append(f"... más diferencias de {nombre} omitidas")
+            return
+        diferencias.append(f"{nombre}[{i}]: referencia={a!r}, candidata={b!r}")
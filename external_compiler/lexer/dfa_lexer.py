@@ -21,6 +21,13 @@ Estados implementados en esta versión:
     - HECHO                  → estado de aceptación (token emitido)
     - ERROR_STATE            → carácter inválido; el DFA continúa
 
+Motores de recorrido (parámetro `engine` del constructor):
+    - "clasico" → este módulo: cadena de if/elif carácter a carácter
+    - "tabla"   → dfa_tabla.py: el mismo autómata compilado a tablas de
+                  clases de carácter y transiciones, construidas al importar
+    - "regex"   → dfa_regex.py: un único patrón maestro de `re`; el bucle por
+                  carácter corre en C (modo conformance: ver conformidad.py)
+
 Estados fuera de alcance en esta versión (pendientes de implementación):
     - COMENTARIOS / COMENTARIOS_LINEA / COMENTARIOS_BLOQUE / Q3
       TODO: aquí se agregarán los estados para comentarios //  y /* */
@@ -34,24 +41,56 @@ Estados fuera de alcance en esta versión (pendientes de implementación):
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import warnings
+import sys
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, TextIO, Union
 
 from .reserved_words import RESERVED
 from .token_types import TokenType
 
+if TYPE_CHECKING:
+    from .incremental import Reanalisis
+    from .token_buffer import TokenBuffer
+
 
 # ---------------------------------------------------------------------------
 # Estructura de Token
 # ---------------------------------------------------------------------------
 
-@dataclass
 class Token:
-    """Unidad mínima de información léxica producida por el DFA."""
-    tipo:    str   # Nombre del TokenType, ej. "INT_NUM", "KW_IF", "PLUS"
-    valor:   str   # Lexema tal como aparece en el código fuente
-    linea:   int   # Línea (1-indexed)
-    columna: int   # Columna del primer carácter del lexema (1-indexed)
+    """
+    Unidad mínima de información léxica producida por el DFA.
+
+    Usa __slots__ (sin __dict__ por instancia) y guarda el tipo como miembro
+    de TokenType, que es un IntEnum: comparar tipos es comparar enteros.
+    Los lexemas de palabras reservadas, operadores e identificadores están
+    internados, así que los tokens repetidos comparten la misma cadena.
+    """
+
+    __slots__ = ("categoria", "valor", "linea", "columna")
+
+    def __init__(self, categoria: TokenType, valor: str, linea: int, columna: int):
+        self.categoria = categoria  # Tipo de token, ej. TokenType.INT_NUM
+        self.valor     = valor      # Lexema tal como aparece en el código fuente
+        self.linea     = linea      # Línea (1-indexed)
+        self.columna   = columna    # Columna del primer carácter del lexema (1-indexed)
+
+    @property
+    def tipo(self) -> str:
+        """Nombre del tipo como cadena, ej. "INT_NUM" (compatibilidad)."""
+        return self.categoria.name
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not Token:
+            return NotImplemented
+        return (
+            self.categoria == other.categoria
+            and self.valor == other.valor
+            and self.linea == other.linea
+            and self.columna == other.columna
+        )
+
+    __hash__ = None  # mutable, igual que el dataclass anterior
 
     def __repr__(self) -> str:
         return f"Token({self.tipo!r}, {self.valor!r}, L{self.linea}:C{self.columna})"
@@ -74,33 +113,38 @@ _OP_RELACIONAL    = "OP_RELACIONAL"
 _HECHO            = "HECHO"
 _ERROR_STATE      = "ERROR_STATE"
 
-# Mapa de símbolos directos: carácter → nombre de tipo de token
-_DIRECT_SYMBOLS: dict[str, str] = {
-    "(": "PAR_IZQ",
-    ")": "PAR_DER",
-    "{": "LLAVE_IZQ",
-    "}": "LLAVE_DER",
-    ",": "COMA",
-    ";": "PUNTO_COMA",
-    "*": "MULTIPLICACION",
-    "%": "MODULO",
-    "^": "POTENCIA",
+# Mapa de símbolos directos: carácter → tipo de token
+_DIRECT_SYMBOLS: dict[str, TokenType] = {
+    "(": TokenType.PAR_IZQ,
+    ")": TokenType.PAR_DER,
+    "{": TokenType.LLAVE_IZQ,
+    "}": TokenType.LLAVE_DER,
+    ",": TokenType.COMA,
+    ";": TokenType.PUNTO_COMA,
+    "*": TokenType.MULTIPLICACION,
+    "%": TokenType.MODULO,
+    "^": TokenType.POTENCIA,
 }
 
-# Mapa de operadores relacionales simples: carácter → nombre de tipo de token
-_RELACIONAL_SIMPLE: dict[str, str] = {
-    ">": "MAYOR",
-    "<": "MENOR",
-    "!": "NEGACION",
-    "=": "ASIGNACION",
+# Mapa de operadores relacionales simples: carácter → tipo de token
+_RELACIONAL_SIMPLE: dict[str, TokenType] = {
+    ">": TokenType.MAYOR,
+    "<": TokenType.MENOR,
+    "!": TokenType.NEGACION,
+    "=": TokenType.ASIGNACION,
 }
 
-# Mapa de operadores relacionales dobles: dos caracteres → nombre de tipo de token
-_RELACIONAL_DOBLE: dict[str, str] = {
-    ">=": "MAYOR_IGUAL",
-    "<=": "MENOR_IGUAL",
-    "!=": "DIFERENTE",
-    "==": "IGUAL",
+# Mapa de operadores relacionales dobles: dos caracteres → tipo de token
+_RELACIONAL_DOBLE: dict[str, TokenType] = {
+    ">=": TokenType.MAYOR_IGUAL,
+    "<=": TokenType.MENOR_IGUAL,
+    "!=": TokenType.DIFERENTE,
+    "==": TokenType.IGUAL,
+}
+
+# Palabras reservadas: lexema → tipo de token (RESERVED guarda los nombres)
+_RESERVADAS: dict[str, TokenType] = {
+    lexema: TokenType[nombre] for lexema, nombre in RESERVED.items()
 }
 
 
@@ -116,6 +160,24 @@ class DFALexer:
         lexer = DFALexer()
         tokens, errors = lexer.tokenize(source_code)
 
+        # o, sin cargar el archivo completo en memoria:
+        with open(ruta, encoding="utf-8") as fh:
+            for tok in lexer.iter_tokens(fh, errors):
+                ...
+
+    Parámetros del constructor:
+        engine (str): Motor de recorrido del autómata.
+                      "clasico" → cadena de if/elif carácter a carácter (por defecto).
+                      "tabla"   → tablas de clases y transiciones precalculadas
+                                  (ver dfa_tabla.py). Misma salida, más rápido.
+                      "regex"   → un único patrón maestro de `re` (ver
+                                  dfa_regex.py). Misma salida, el más rápido.
+        conformance (bool): Si es True y el motor no es "clasico", cada
+                      tokenize ejecuta también el motor clásico y compara
+                      ambas salidas. Ante cualquier diferencia se emite un
+                      RuntimeWarning, las diferencias quedan en
+                      `self.divergencias` y se retorna la salida clásica.
+
     Parámetros de tokenize:
         source_code (str): El código fuente completo como cadena.
 
@@ -125,7 +187,143 @@ class DFALexer:
                                El DFA continúa aunque encuentre errores.
     """
 
+    ENGINES = ("clasico", "tabla", "regex")
+
+    # Tamaño de bloque (en caracteres) al leer archivos en iter_tokens
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, engine: str = "clasico", conformance: bool = False):
+        if engine not in self.ENGINES:
+            raise ValueError(
+                f"Motor léxico desconocido: {engine!r} "
+                f"(opciones: {', '.join(self.ENGINES)})"
+            )
+        self.engine      = engine
+        self.conformance = conformance
+        # Diferencias detectadas en modo conformance (vacía si todo coincide)
+        self.divergencias: list[str] = []
+
     def tokenize(self, source: str) -> tuple[list[Token], list[str]]:
+        """
+        Tokeniza `source` con el motor elegido en el constructor.
+        Retorna (lista_de_tokens, lista_de_errores).
+        """
+        # Imports diferidos: los motores importan Token y los mapas de este módulo
+        if self.engine == "tabla":
+            from .dfa_tabla import tokenize_tabla
+            resultado = tokenize_tabla(source)
+        elif self.engine == "regex":
+            from .dfa_regex import tokenize_regex
+            resultado = tokenize_regex(source)
+        else:
+            return self._tokenize_clasico(source)
+
+        if self.conformance:
+            return self._verificar_conformidad(source, resultado)
+        return resultado
+
+    def iter_tokens(
+        self,
+        stream: Union[str, TextIO, Iterable[str]],
+        errors: Optional[list[str]] = None,
+    ) -> Iterator[Token]:
+        """
+        Genera los tokens de `stream` de forma perezosa.
+
+        `stream` puede ser un archivo de texto abierto (se lee en bloques de
+        STREAM_CHUNK_SIZE caracteres), un iterable de bloques de texto o una
+        cadena. Los tokens se producen en cuanto quedan decididos, de modo que
+        las fases siguientes pueden empezar antes de terminar la lectura y la
+        memoria no depende del tamaño del archivo. El estado del DFA se
+        conserva entre bloques: un comentario de bloque abierto, un ">" a la
+        espera de "=" o los blancos entre "+" y "+" pueden quedar partidos.
+
+        Los mensajes de error se agregan a `errors` (si se proporciona). La
+        secuencia termina con el token EOF, igual que tokenize.
+
+        El recorrido por bloques usa siempre el motor de tablas, cuya salida
+        es idéntica a la de los demás motores.
+        """
+        from .dfa_tabla import iter_tokens_tabla
+
+        if errors is None:
+            errors = []
+        return iter_tokens_tabla(self._bloques(stream), errors)
+
+    def tokenize_buffer(
+        self,
+        stream: Union[str, TextIO, Iterable[str]],
+        errors: Optional[list[str]] = None,
+    ) -> TokenBuffer:
+        """
+        Tokeniza `stream` (cadena, archivo o iterable de bloques, igual que
+        iter_tokens) en un TokenBuffer: los tokens se guardan en arreglos por
+        columna y los lexemas como rangos del texto fuente, sin crear un
+        objeto Token por token. Incluye los tokens ERROR y el EOF final.
+
+        Usa siempre el motor de tablas.
+        """
+        from .dfa_tabla import tokenize_bloques_tabla, tokenize_buffer_tabla
+
+        if errors is None:
+            errors = []
+        if isinstance(stream, str):
+            tokens, errores = tokenize_buffer_tabla(stream)
+            errors.extend(errores)
+            return tokens
+        return tokenize_bloques_tabla(self._bloques(stream), errors)
+
+    def retokenize(
+        self,
+        anterior: TokenBuffer,
+        inicio: int,
+        eliminados: int,
+        insertado: str,
+        source: str,
+    ) -> Reanalisis:
+        """
+        Actualiza un TokenBuffer de tokenize_buffer tras una edición: en la
+        posición `inicio` se reemplazaron `eliminados` caracteres por
+        `insertado`, y `source` es el texto ya editado. Solo se vuelve a
+        recorrer la zona afectada (ver incremental.py); el resultado indica
+        qué rango de tokens cambió. Usa siempre el motor de tablas.
+        """
+        from .incremental import reanalizar
+
+        return reanalizar(anterior, inicio, eliminados, insertado, source)
+
+    def _bloques(self, stream: Union[str, TextIO, Iterable[str]]) -> Iterable[str]:
+        """Normaliza la entrada de iter_tokens/tokenize_buffer a bloques de texto."""
+        if isinstance(stream, str):
+            return (stream,)
+        if hasattr(stream, "read"):
+            return iter(lambda: stream.read(self.STREAM_CHUNK_SIZE), "")
+        return stream
+
+    def _verificar_conformidad(
+        self, source: str, resultado: tuple[list[Token], list[str]]
+    ) -> tuple[list[Token], list[str]]:
+        """
+        Compara `resultado` contra el motor clásico. Si difieren, registra
+        las diferencias, emite un RuntimeWarning y retorna la salida clásica.
+        """
+        from .conformidad import comparar
+
+        referencia = self._tokenize_clasico(source)
+        diferencias = comparar(referencia, resultado)
+        if not diferencias:
+            return resultado
+
+        self.divergencias.extend(diferencias)
+        warnings.warn(
+            f"[LEXICO] El motor {self.engine!r} difiere del motor clásico:\n  "
+            + "\n  ".join(diferencias),
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return referencia
+
+    def _tokenize_clasico(self, source: str) -> tuple[list[Token], list[str]]:
         """
         Recorre `source` carácter a carácter implementando el DFA.
         Retorna (lista_de_tokens, lista_de_errores).
@@ -169,7 +367,7 @@ class DFALexer:
                 tok, pos, columna, linea = self._read_number(
                     source, pos, linea, columna
                 )
-                if tok.tipo == _ERROR_STATE:
+                if tok.categoria is TokenType.ERROR:
                     # Número flotante malformado (ej. "32.algo"): registrar error
                     err_msg = (
                         f"[LEXICO] Número flotante malformado '{tok.valor}' en línea "
@@ -177,7 +375,6 @@ class DFALexer:
                         f"— se esperaba un dígito después del punto decimal"
                     )
                     errors.append(err_msg)
-                    tok = Token("ERROR", tok.valor, tok.linea, tok.columna)
                 tokens.append(tok)
                 continue
 
@@ -237,7 +434,7 @@ class DFALexer:
                         f"columna {columna} — se esperaba '&&'"
                     )
                     errors.append(err_msg)
-                    tok_err = Token("ERROR", "&", linea, columna)
+                    tok_err = Token(TokenType.ERROR, "&", linea, columna)
                     tokens.append(tok_err)
                     pos += 1
                     columna += 1
@@ -258,7 +455,7 @@ class DFALexer:
                         f"columna {columna} — se esperaba '||'"
                     )
                     errors.append(err_msg)
-                    tok_err = Token("ERROR", "|", linea, columna)
+                    tok_err = Token(TokenType.ERROR, "|", linea, columna)
                     tokens.append(tok_err)
                     pos += 1
                     columna += 1
@@ -293,7 +490,7 @@ class DFALexer:
                 tok, pos, columna, linea = self._read_string(
                     source, pos, linea, columna
                 )
-                if tok.tipo == "ERROR":
+                if tok.categoria is TokenType.ERROR:
                     errors.append(
                         f"[LEXICO] Cadena sin cerrar en línea {tok.linea}, "
                         f"columna {tok.columna}"
@@ -310,7 +507,7 @@ class DFALexer:
                 tok, pos, columna, linea = self._read_char(
                     source, pos, linea, columna
                 )
-                if tok.tipo == "ERROR":
+                if tok.categoria is TokenType.ERROR:
                     errors.append(
                         f"[LEXICO] Carácter literal inválido en línea {tok.linea}, "
                         f"columna {tok.columna}"
@@ -342,12 +539,12 @@ class DFALexer:
                 f"columna {columna}"
             )
             errors.append(err_msg)
-            tokens.append(Token("ERROR", ch, linea, columna))
+            tokens.append(Token(TokenType.ERROR, ch, linea, columna))
             pos += 1
             columna += 1
 
         # Token de fin de archivo
-        tokens.append(Token("EOF", "", linea, columna))
+        tokens.append(Token(TokenType.EOF, "", linea, columna))
         return tokens, errors
 
     # ==========================================================================
@@ -402,7 +599,7 @@ class DFALexer:
                     # Se descarta el lexema completo (incluyendo el punto consumido)
                     # y se deja el carácter actual para ser reprocesado desde INICIO.
                     lexema = source[start:pos]   # incluye el punto, ej. "32."
-                    return Token(_ERROR_STATE, lexema, linea, start_col), pos, columna, linea
+                    return Token(TokenType.ERROR, lexema, linea, start_col), pos, columna, linea
 
             elif state == _REAL:
                 if ch.isdigit():
@@ -413,7 +610,7 @@ class DFALexer:
                     break
 
         lexema = source[start:pos]
-        tipo   = "FLOAT_NUM" if state in (_REAL, _NUMERO_FLOTANTE) else "INT_NUM"
+        tipo   = TokenType.FLOAT_NUM if state in (_REAL, _NUMERO_FLOTANTE) else TokenType.INT_NUM
         return Token(tipo, lexema, linea, start_col), pos, columna, linea
 
     # --------------------------------------------------------------------------
@@ -442,8 +639,8 @@ class DFALexer:
             else:
                 break   # [Otro] → HECHO, retroceder
 
-        lexema = source[start:pos]
-        tipo   = RESERVED.get(lexema, "IDENTIFIER")
+        lexema = sys.intern(source[start:pos])
+        tipo   = _RESERVADAS.get(lexema, TokenType.IDENTIFIER)
         return Token(tipo, lexema, linea, start_col), pos, columna, linea
 
     # --------------------------------------------------------------------------
@@ -484,7 +681,7 @@ class DFALexer:
 
         if lookahead_pos < n and source[lookahead_pos] == "=":
             # Forma doble — consumir todos los blancos intermedios más el '='
-            doble = primer + "="
+            doble = sys.intern(primer + "=")
             tipo  = _RELACIONAL_DOBLE[doble]
             lookahead_pos += 1
             lookahead_col += 1
@@ -530,9 +727,9 @@ class DFALexer:
         if lookahead_pos < n and source[lookahead_pos] == "+":
             lookahead_pos += 1
             lookahead_col += 1
-            return Token("INCREMENTO", "++", linea, start_col), lookahead_pos, lookahead_col, lookahead_linea
+            return Token(TokenType.INCREMENTO, "++", linea, start_col), lookahead_pos, lookahead_col, lookahead_linea
         else:
-            return Token("SUMA", "+", linea, start_col), pos, columna, linea
+            return Token(TokenType.SUMA, "+", linea, start_col), pos, columna, linea
 
     # --------------------------------------------------------------------------
 
@@ -570,9 +767,9 @@ class DFALexer:
         if lookahead_pos < n and source[lookahead_pos] == "-":
             lookahead_pos += 1
             lookahead_col += 1
-            return Token("DECREMENTO", "--", linea, start_col), lookahead_pos, lookahead_col, lookahead_linea
+            return Token(TokenType.DECREMENTO, "--", linea, start_col), lookahead_pos, lookahead_col, lookahead_linea
         else:
-            return Token("RESTA", "-", linea, start_col), pos, columna, linea
+            return Token(TokenType.RESTA, "-", linea, start_col), pos, columna, linea
 
     # --------------------------------------------------------------------------
 
@@ -593,7 +790,7 @@ class DFALexer:
         if pos < n and source[pos] == "&":
             pos     += 1
             columna += 1
-            return Token("AND", "&&", linea, start_col), pos, columna
+            return Token(TokenType.AND, "&&", linea, start_col), pos, columna
         else:
             # Retroceder — caller emite ERROR
             pos     -= 1
@@ -619,7 +816,7 @@ class DFALexer:
         if pos < n and source[pos] == "|":
             pos     += 1
             columna += 1
-            return Token("OR", "||", linea, start_col), pos, columna
+            return Token(TokenType.OR, "||", linea, start_col), pos, columna
         else:
             # Retroceder — caller emite ERROR
             pos     -= 1
@@ -682,7 +879,7 @@ class DFALexer:
             return None, pos, columna, linea   # comentario ignorado
 
         # [Otro] → token DIVISION simple
-        return Token("DIVISION", "/", linea, start_col), pos, columna, linea
+        return Token(TokenType.DIVISION, "/", linea, start_col), pos, columna, linea
 # --------------------------------------------------------------------------
 
     def _read_string(
@@ -702,17 +899,17 @@ class DFALexer:
                 pos     += 1
                 columna += 1
                 lexema = source[start:pos]
-                return Token("STRING", lexema, linea, start_col), pos, columna, linea
+                return Token(TokenType.STRING, lexema, linea, start_col), pos, columna, linea
 
             if ch == '\n':
                 lexema = source[start:pos]
-                return Token("ERROR", lexema, linea, start_col), pos, columna, linea
+                return Token(TokenType.ERROR, lexema, linea, start_col), pos, columna, linea
 
             pos     += 1
             columna += 1
 
         lexema = source[start:pos]
-        return Token("ERROR", lexema, linea, start_col), pos, columna, linea
+        return Token(TokenType.ERROR, lexema, linea, start_col), pos, columna, linea
 
     # --------------------------------------------------------------------------
 
@@ -727,23 +924,23 @@ class DFALexer:
         columna += 1
 
         if pos >= n:
-            return Token("ERROR", source[start:pos], linea, start_col), pos, columna, linea
+            return Token(TokenType.ERROR, source[start:pos], linea, start_col), pos, columna, linea
 
         contenido = source[pos]
 
         if contenido == "'":
             pos     += 1
             columna += 1
-            return Token("ERROR", source[start:pos], linea, start_col), pos, columna, linea
+            return Token(TokenType.ERROR, source[start:pos], linea, start_col), pos, columna, linea
 
         if contenido == '\n':
-            return Token("ERROR", source[start:pos], linea, start_col), pos, columna, linea
+            return Token(TokenType.ERROR, source[start:pos], linea, start_col), pos, columna, linea
 
         pos     += 1
         columna += 1
 
         if pos >= n:
-            return Token("ERROR", source[start:pos], linea, start_col), pos, columna, linea
+            return Token(TokenType.ERROR, source[start:pos], linea, start_col), pos, columna, linea
 
         siguiente = source[pos]
 
@@ -751,7 +948,7 @@ class DFALexer:
             pos     += 1
             columna += 1
             lexema = source[start:pos]
-            return Token("CHAR", lexema, linea, start_col), pos, columna, linea
+            return Token(TokenType.CHAR, lexema, linea, start_col), pos, columna, linea
 
         while pos < n and source[pos] != "'" and source[pos] != '\n':
             pos     += 1
@@ -760,4 +957,4 @@ class DFALexer:
             pos     += 1
             columna += 1
         lexema = source[start:pos]
-        return Token("ERROR", lexema, linea, start_col), pos, columna, linea
\ No newline at end of file
+        return Token(TokenType.ERROR, lexema, linea, start_col), pos, columna, linea
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+dfa_regex.py
+------------
+Motor del analizador léxico CAOS basado en un único patrón maestro de `re`.
+
+Cada rama del DFA se expresa como una alternativa con grupo de captura y
+todas se combinan en un solo patrón compilado (el mismo enfoque que
+`_COMBINED_PATTERN` en ide/ui/highlighter.py). El recorrido carácter a
+carácter lo hace el motor de expresiones regulares en C; Python solo
+interviene una vez por token.
+
+Cada alternativa está escrita para reproducir la semántica del DFA, que
+difiere de una expresión regular ingenua:
+
+    - "+", "-" y los relacionales admiten blancos y saltos de línea entre
+      sus dos caracteres ("+\\n\\n+" → INCREMENTO, "=\\n=" → IGUAL).
+    - "32." seguido de algo que no es dígito es un flotante malformado
+      (ERROR), pero al final del archivo es FLOAT_NUM.
+    - Las cadenas y los caracteres literales terminan en error al llegar a
+      un salto de línea o al EOF.
+    - Un comentario de bloque sin cerrar consume el resto del archivo.
+
+Las alternativas usan clases ASCII ([0-9], [A-Za-z_]) mientras que el DFA
+usa str.isdigit()/isalpha(). Para no divergir, los fuentes con caracteres
+no ASCII se delegan al motor de tablas (dfa_tabla.py).
+
+Uso:
+    lexer = DFALexer(engine="regex")
+    tokens, errors = lexer.tokenize(source_code)
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from typing import Optional
+
+from .dfa_lexer import (
+    Token,
+    _DIRECT_SYMBOLS,
+    _RELACIONAL_DOBLE,
+    _RELACIONAL_SIMPLE,
+    _RESERVADAS,
+)
+from .dfa_tabla import (
+    A_AND, A_CHAR, A_DECREMENTO, A_DIRECTO, A_DIV, A_ERR_AMP, A_ERR_CADENA,
+    A_ERR_CHAR, A_ERR_PIPE, A_FLOAT, A_IDENT, A_INCREMENTO, A_INT, A_INVALIDO,
+    A_MALFORMADO, A_OR, A_REL, A_REL_DOBLE, A_RESTA, A_SALTAR, A_SALTAR_MULTI,
+    A_STRING, A_SUMA, _TIPO_SIMPLE, mensaje_error, tokenize_tabla,
+)
+from .token_buffer import LEXEMA_FIJO
+from .token_types import TokenType
+
+
+# ---------------------------------------------------------------------------
+# Patrón maestro
+# ---------------------------------------------------------------------------
+
+_BLANCOS = r"[ \t\r\n]"
+
+# (acción, patrón). El orden importa: `re` elige la primera alternativa que
+# coincide, así que las formas largas van antes que las cortas. Los
+# identificadores van al frente por ser los más frecuentes.
+_RAMAS: list[tuple[int, str]] = [
+    (A_IDENT,        r"[A-Za-z_][A-Za-z0-9_]*"),
+    (A_FLOAT,        r"[0-9]+\.[0-9]+"),
+    (A_MALFORMADO,   r"[0-9]+\."),
+    (A_INT,          r"[0-9]+"),
+    (A_DIRECTO,      r"[(){},;*%^]"),
+    (A_REL_DOBLE,    rf"[<>!=]{_BLANCOS}*="),
+    (A_REL,          r"[<>!=]"),
+    (A_INCREMENTO,   rf"\+{_BLANCOS}*\+"),
+    (A_SUMA,         r"\+"),
+    (A_DECREMENTO,   rf"-{_BLANCOS}*-"),
+    (A_RESTA,        r"-"),
+    (A_SALTAR,       r"//[^\n]*"),
+    (A_SALTAR_MULTI, r"/\*[\s\S]*?(?:\*/|\Z)"),
+    (A_DIV,          r"/"),
+    (A_AND,          r"&&"),
+    (A_ERR_AMP,      r"&"),
+    (A_OR,           r"\|\|"),
+    (A_ERR_PIPE,     r"\|"),
+    (A_STRING,       r'"[^"\n]*"'),
+    (A_ERR_CADENA,   r'"[^"\n]*'),
+    (A_CHAR,         r"'[^'\n]'"),
+    (A_ERR_CHAR,     r"'(?:'|[^'\n][^'\n]+'?|[^'\n]?)"),
+    (A_INVALIDO,     r"[^ \t\r\n]"),
+]
+
+
+def _expandir(ramas: list[tuple[int, str]]) -> list[tuple[int, str, Optional[TokenType]]]:
+    """
+    Separa los símbolos directos y los relacionales simples en una
+    alternativa por carácter, para que su tipo de token quede fijo por grupo.
+    Retorna (acción, patrón, tipo_fijo) por alternativa.
+    """
+    expandidas: list[tuple[int, str, Optional[TokenType]]] = []
+    for accion, patron in ramas:
+        if accion == A_DIRECTO:
+            for ch, tipo in _DIRECT_SYMBOLS.items():
+                expandidas.append((accion, re.escape(ch), tipo))
+        elif accion == A_REL:
+            for ch, tipo in _RELACIONAL_SIMPLE.items():
+                expandidas.append((accion, re.escape(ch), tipo))
+        else:
+            expandidas.append((accion, patron, _TIPO_SIMPLE.get(accion)))
+    return expandidas
+
+
+_ALTERNATIVAS = _expandir(_RAMAS)
+
+# Forma del patrón:  ([blancos]*)(?:alt1()|alt2()|...|\Z)
+#
+#   - Los blancos que preceden a cada token se absorben en el mismo match
+#     (grupo 1), así que no generan una iteración propia; la alternativa
+#     vacía final (\Z) consume los blancos al final del archivo.
+#   - Cada alternativa termina en un grupo vacío que solo sirve de marca:
+#     match.lastindex dice qué alternativa coincidió. Ponerlo al final (y no
+#     envolviendo la alternativa) permite a `re` descartar rápidamente las
+#     alternativas cuyo primer carácter no coincide.
+#   - Cualquier carácter que no sea blanco cae, como último recurso, en
+#     A_INVALIDO, así que los matches de finditer son contiguos.
+MASTER_PATTERN = re.compile(
+    rf"({_BLANCOS}*)(?:"
+    + "|".join(f"{patron}()" for _, patron, _ in _ALTERNATIVAS)
+    + r"|\Z)"
+)
+
+# Número de grupo (match.lastindex) → acción / tipo de token fijo (o None) /
+# lexema fijo del tipo (o None si el lexema es el texto reconocido)
+_ACCION_POR_GRUPO: tuple[int, ...] = (0, 0) + tuple(a for a, _, _ in _ALTERNATIVAS)
+_TIPO_POR_GRUPO: tuple[Optional[TokenType], ...] = (None, None) + tuple(t for _, _, t in _ALTERNATIVAS)
+_LEXEMA_POR_GRUPO: tuple[Optional[str], ...] = tuple(
+    None if t is None else LEXEMA_FIJO[t] for t in _TIPO_POR_GRUPO
+)
+
+
+# ---------------------------------------------------------------------------
+# Recorrido
+# ---------------------------------------------------------------------------
+
+def tokenize_regex(source: str) -> tuple[list[Token], list[str]]:
+    """
+    Tokeniza `source` con el patrón maestro.
+    Retorna (lista_de_tokens, lista_de_errores), igual que DFALexer.tokenize.
+    """
+    if not source.isascii():
+        return tokenize_tabla(source)
+
+    tokens: list[Token] = []
+    errors: list[str]   = []
+
+    acciones     = _ACCION_POR_GRUPO
+    tipos        = _TIPO_POR_GRUPO
+    lexemas      = _LEXEMA_POR_GRUPO
+    n            = len(source)
+    linea        = 1
+    inicio_linea = 0
+    fin_previo   = 0    # los matches son contiguos: aquí empiezan los blancos
+
+    for m in MASTER_PATTERN.finditer(source):
+        start = m.end(1)    # fin de los blancos = inicio del token
+
+        # Saltos de línea en los blancos que preceden al token
+        if start != fin_previo:
+            saltos = source.count("\n", fin_previo, start)
+            if saltos:
+                linea       += saltos
+                inicio_linea = source.rfind("\n", fin_previo, start) + 1
+
+        grupo = m.lastindex
+        if grupo == 1:
+            break           # solo quedaban blancos hasta el EOF
+        fin_previo = fin = m.end()
+
+        # Camino rápido: tipo fijo (lexema fijo o igual al texto reconocido)
+        tipo = tipos[grupo]
+        if tipo is not None:
+            lexema = lexemas[grupo]
+            tokens.append(Token(
+                tipo, source[start:fin] if lexema is None else lexema,
+                linea, start - inicio_linea + 1,
+            ))
+            continue
+
+        accion = acciones[grupo]
+
+        if accion == A_IDENT:
+            lexema = sys.intern(source[start:fin])
+            tokens.append(Token(
+                _RESERVADAS.get(lexema, TokenType.IDENTIFIER), lexema,
+                linea, start - inicio_linea + 1,
+            ))
+            continue
+        if accion == A_SALTAR_MULTI:
+            saltos = source.count("\n", start, fin)
+            if saltos:
+                linea       += saltos
+                inicio_linea = source.rfind("\n", start, fin) + 1
+            continue
+        if accion == A_SALTAR:
+            continue
+
+        columna = start - inicio_linea + 1
+
+        if accion in (A_REL_DOBLE, A_INCREMENTO, A_DECREMENTO):
+            if accion == A_REL_DOBLE:
+                tipo = _RELACIONAL_DOBLE[source[start] + "="]
+            elif accion == A_INCREMENTO:
+                tipo = TokenType.INCREMENTO
+            else:
+                tipo = TokenType.DECREMENTO
+            tokens.append(Token(tipo, LEXEMA_FIJO[tipo], linea, columna))
+            saltos = source.count("\n", start, fin)
+            if saltos:
+                linea       += saltos
+                inicio_linea = source.rfind("\n", start, fin) + 1
+
+        elif accion == A_MALFORMADO and fin == n:
+            # "NNN." al final del archivo: el DFA lo acepta como flotante
+            tokens.append(Token(TokenType.FLOAT_NUM, source[start:fin], linea, columna))
+
+        else:
+            lexema = source[start:fin]
+            errors.append(mensaje_error(accion, lexema, linea, columna))
+            tokens.append(Token(TokenType.ERROR, lexema, linea, columna))
+
+    tokens.append(Token(TokenType.EOF, "", linea, n - inicio_linea + 1))
+    return tokens, errors
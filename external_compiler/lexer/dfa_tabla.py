@@ -0,0 +1,726 @@
+"""
+dfa_tabla.py
+------------
+Motor del analizador léxico CAOS dirigido por tablas.
+
+Compila el mismo autómata que implementa `DFALexer` (ver dfa_lexer.py) en:
+
+    - una tabla de CLASES de carácter: cada carácter del fuente se reduce a
+      una clase pequeña (dígito, letra, blanco, '+', ...). La conversión del
+      fuente completo se hace de una sola vez con `str.translate`, en C.
+    - una MATRIZ de transiciones estado × clase → estado siguiente (-1 = sin
+      transición).
+    - una tabla de ACEPTACIÓN estado → acción a ejecutar al reconocer el
+      lexema (emitir token, ignorar blancos/comentarios, reportar error).
+
+Ambas tablas se construyen una sola vez al importar el módulo. El recorrido
+aplica la regla del lexema más largo: se avanza mientras exista transición
+y, al detenerse, se retrocede a la última posición de aceptación. Ese
+retroceso reproduce el lookahead con blancos de `_read_plus`, `_read_minus`
+y `_read_relacional` ("+\\n\\n+" → INCREMENTO, "+ x" → SUMA).
+
+La salida (tokens y mensajes de error) es idéntica a la del motor clásico.
+
+Uso:
+    lexer = DFALexer(engine="tabla")
+    tokens, errors = lexer.tokenize(source_code)
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Optional
+
+from .dfa_lexer import (
+    Token,
+    _DIRECT_SYMBOLS,
+    _RELACIONAL_DOBLE,
+    _RELACIONAL_SIMPLE,
+    _RESERVADAS,
+)
+from .token_buffer import TokenBuffer
+from .token_types import TokenType
+
+
+# ---------------------------------------------------------------------------
+# Clases de carácter
+# ---------------------------------------------------------------------------
+
+C_BLANCO    = 0    # ' ', '\t', '\r'
+C_NL        = 1    # '\n'
+C_DIGITO    = 2    # str.isdigit()
+C_LETRA     = 3    # str.isalpha() o '_'
+C_ALNUM     = 4    # str.isalnum() sin ser dígito ni letra (solo continúa identificadores)
+C_PUNTO     = 5    # '.'
+C_MAS       = 6    # '+'
+C_MENOS     = 7    # '-'
+C_AMP       = 8    # '&'
+C_PIPE      = 9    # '|'
+C_REL       = 10   # '>', '<', '!'
+C_IGUAL     = 11   # '='
+C_SLASH     = 12   # '/'
+C_ASTERISCO = 13   # '*'
+C_COMILLA   = 14   # '"'
+C_APOSTROFE = 15   # "'"
+C_DIRECTO   = 16   # ( ) { } , ; % ^
+C_OTRO      = 17   # cualquier otro carácter
+
+N_CLASES = 18
+
+_CLASES_FIJAS: dict[str, int] = {
+    " ": C_BLANCO, "\t": C_BLANCO, "\r": C_BLANCO,
+    "\n": C_NL,
+    ".": C_PUNTO,
+    "+": C_MAS,
+    "-": C_MENOS,
+    "&": C_AMP,
+    "|": C_PIPE,
+    ">": C_REL, "<": C_REL, "!": C_REL,
+    "=": C_IGUAL,
+    "/": C_SLASH,
+    "*": C_ASTERISCO,
+    '"': C_COMILLA,
+    "'": C_APOSTROFE,
+}
+for _ch in _DIRECT_SYMBOLS:
+    _CLASES_FIJAS.setdefault(_ch, C_DIRECTO)
+
+
+def _clase_de(ch: str) -> int:
+    """Clasifica un carácter con los mismos predicados que usa el motor clásico."""
+    fija = _CLASES_FIJAS.get(ch)
+    if fija is not None:
+        return fija
+    if ch.isdigit():
+        return C_DIGITO
+    if ch.isalpha() or ch == "_":
+        return C_LETRA
+    if ch.isalnum():
+        return C_ALNUM
+    return C_OTRO
+
+
+class _TablaClases(dict):
+    """
+    Tabla ordinal → clase para `str.translate`.
+
+    Los 128 caracteres ASCII se precargan al importar; el resto se clasifica
+    la primera vez que aparece y queda memorizado.
+    """
+
+    def __missing__(self, ordinal: int) -> int:
+        clase = _clase_de(chr(ordinal))
+        self[ordinal] = clase
+        return clase
+
+
+_TRADUCCION = _TablaClases({i: _clase_de(chr(i)) for i in range(128)})
+
+
+def clasificar(source: str) -> bytes:
+    """Convierte `source` en una secuencia de clases (un byte por carácter)."""
+    return source.translate(_TRADUCCION).encode("latin-1")
+
+
+# ---------------------------------------------------------------------------
+# Estados
+# ---------------------------------------------------------------------------
+
+S_INICIO         = 0
+S_BLANCOS        = 1
+S_ENTERO         = 2
+S_FLOTANTE       = 3    # "NNN." — falta el primer dígito decimal
+S_REAL           = 4
+S_IDENT          = 5
+S_MAS            = 6
+S_MAS_BLANCOS    = 7
+S_INCREMENTO     = 8
+S_MENOS          = 9
+S_MENOS_BLANCOS  = 10
+S_DECREMENTO     = 11
+S_AMP            = 12
+S_AND            = 13
+S_PIPE           = 14
+S_OR             = 15
+S_REL            = 16
+S_REL_BLANCOS    = 17
+S_REL_DOBLE      = 18
+S_DIV            = 19
+S_COM_LINEA      = 20
+S_COM_BLOQUE     = 21
+S_COM_ESTRELLA   = 22   # Q3: se leyó '*' dentro del bloque
+S_COM_FIN        = 23
+S_CADENA         = 24
+S_CADENA_FIN     = 25
+S_CHAR1          = 26   # Q1
+S_CHAR_VACIO     = 27
+S_CHAR2          = 28   # Q2
+S_CHAR_OK        = 29
+S_CHAR3          = 30
+S_CHAR_CIERRE    = 31
+S_DIRECTO        = 32
+S_INVALIDO       = 33
+
+N_ESTADOS = 34
+
+
+# ---------------------------------------------------------------------------
+# Acciones de aceptación
+# ---------------------------------------------------------------------------
+
+A_NINGUNA       = 0    # estado no final
+A_SALTAR        = 1    # comentario de línea (no contiene saltos de línea)
+A_SALTAR_MULTI  = 2    # blancos / comentario de bloque (puede contener '\n')
+A_INT           = 3
+A_FLOAT         = 4
+A_MALFORMADO    = 5    # "32." seguido de algo que no es dígito
+A_IDENT         = 6
+A_SUMA          = 7
+A_INCREMENTO    = 8
+A_RESTA         = 9
+A_DECREMENTO    = 10
+A_AND           = 11
+A_ERR_AMP       = 12
+A_OR            = 13
+A_ERR_PIPE      = 14
+A_REL           = 15
+A_REL_DOBLE     = 16
+A_DIV           = 17
+A_STRING        = 18
+A_ERR_CADENA    = 19
+A_CHAR          = 20
+A_ERR_CHAR      = 21
+A_DIRECTO       = 22
+A_INVALIDO      = 23
+
+# Acciones cuyo token tiene tipo fijo y lexema igual al texto reconocido
+_TIPO_SIMPLE: dict[int, TokenType] = {
+    A_INT:    TokenType.INT_NUM,
+    A_FLOAT:  TokenType.FLOAT_NUM,
+    A_SUMA:   TokenType.SUMA,
+    A_RESTA:  TokenType.RESTA,
+    A_AND:    TokenType.AND,
+    A_OR:     TokenType.OR,
+    A_DIV:    TokenType.DIVISION,
+    A_STRING: TokenType.STRING,
+    A_CHAR:   TokenType.CHAR,
+}
+
+
+SIN_TRANSICION = -1
+
+
+def _construir_tablas() -> tuple[tuple, tuple, tuple]:
+    """
+    Construye (transiciones, aceptación, aceptación_en_EOF).
+
+    transiciones[estado][clase] → estado siguiente, SIN_TRANSICION (-1), o
+                                  -(estado + 2) si el destino no es final.
+    aceptacion[estado]          → acción A_* (A_NINGUNA si no es final).
+    aceptacion_eof[estado]      → acción a usar si el fuente termina en ese estado.
+    """
+    trans = [[-1] * N_CLASES for _ in range(N_ESTADOS)]
+    acepta = [A_NINGUNA] * N_ESTADOS
+
+    def todas(estado: int, destino: int, excepto: tuple[int, ...] = ()) -> None:
+        for clase in range(N_CLASES):
+            if clase not in excepto:
+                trans[estado][clase] = destino
+
+    # INICIO
+    ini = trans[S_INICIO]
+    ini[C_BLANCO]    = S_BLANCOS
+    ini[C_NL]        = S_BLANCOS
+    ini[C_DIGITO]    = S_ENTERO
+    ini[C_LETRA]     = S_IDENT
+    ini[C_ALNUM]     = S_INVALIDO
+    ini[C_PUNTO]     = S_INVALIDO
+    ini[C_MAS]       = S_MAS
+    ini[C_MENOS]     = S_MENOS
+    ini[C_AMP]       = S_AMP
+    ini[C_PIPE]      = S_PIPE
+    ini[C_REL]       = S_REL
+    ini[C_IGUAL]     = S_REL
+    ini[C_SLASH]     = S_DIV
+    ini[C_ASTERISCO] = S_DIRECTO
+    ini[C_COMILLA]   = S_CADENA
+    ini[C_APOSTROFE] = S_CHAR1
+    ini[C_DIRECTO]   = S_DIRECTO
+    ini[C_OTRO]      = S_INVALIDO
+
+    # Blancos y saltos de línea (self-loop de INICIO)
+    trans[S_BLANCOS][C_BLANCO] = S_BLANCOS
+    trans[S_BLANCOS][C_NL]     = S_BLANCOS
+    acepta[S_BLANCOS] = A_SALTAR_MULTI
+
+    # NUMEROS_ENTEROS → NUMERO_FLOTANTE → REAL
+    trans[S_ENTERO][C_DIGITO]   = S_ENTERO
+    trans[S_ENTERO][C_PUNTO]    = S_FLOTANTE
+    trans[S_FLOTANTE][C_DIGITO] = S_REAL
+    trans[S_REAL][C_DIGITO]     = S_REAL
+    acepta[S_ENTERO]   = A_INT
+    acepta[S_FLOTANTE] = A_MALFORMADO
+    acepta[S_REAL]     = A_FLOAT
+
+    # IDENTIFICADORES
+    for clase in (C_DIGITO, C_LETRA, C_ALNUM):
+        trans[S_IDENT][clase] = S_IDENT
+    acepta[S_IDENT] = A_IDENT
+
+    # PLUS_STATE / MIN_STATE / OP_RELACIONAL con blancos intermedios
+    for estado, blancos, doble, c_segundo, a_simple, a_doble in (
+        (S_MAS,   S_MAS_BLANCOS,   S_INCREMENTO, C_MAS,   A_SUMA,  A_INCREMENTO),
+        (S_MENOS, S_MENOS_BLANCOS, S_DECREMENTO, C_MENOS, A_RESTA, A_DECREMENTO),
+        (S_REL,   S_REL_BLANCOS,   S_REL_DOBLE,  C_IGUAL, A_REL,   A_REL_DOBLE),
+    ):
+        for origen in (estado, blancos):
+            trans[origen][C_BLANCO]  = blancos
+            trans[origen][C_NL]      = blancos
+            trans[origen][c_segundo] = doble
+        acepta[estado] = a_simple
+        acepta[doble]  = a_doble
+
+    # AND_STATE / OR_STATE
+    trans[S_AMP][C_AMP]   = S_AND
+    trans[S_PIPE][C_PIPE] = S_OR
+    acepta[S_AMP]  = A_ERR_AMP
+    acepta[S_AND]  = A_AND
+    acepta[S_PIPE] = A_ERR_PIPE
+    acepta[S_OR]   = A_OR
+
+    # COMENTARIOS → COMENTARIOS_LINEA / COMENTARIOS_BLOQUE / Q3
+    trans[S_DIV][C_SLASH]     = S_COM_LINEA
+    trans[S_DIV][C_ASTERISCO] = S_COM_BLOQUE
+    acepta[S_DIV] = A_DIV
+    todas(S_COM_LINEA, S_COM_LINEA, excepto=(C_NL,))
+    acepta[S_COM_LINEA] = A_SALTAR
+    todas(S_COM_BLOQUE, S_COM_BLOQUE)
+    trans[S_COM_BLOQUE][C_ASTERISCO] = S_COM_ESTRELLA
+    todas(S_COM_ESTRELLA, S_COM_BLOQUE)
+    trans[S_COM_ESTRELLA][C_ASTERISCO] = S_COM_ESTRELLA
+    trans[S_COM_ESTRELLA][C_SLASH]     = S_COM_FIN
+    acepta[S_COM_FIN] = A_SALTAR_MULTI
+
+    # CADENA "..."
+    todas(S_CADENA, S_CADENA, excepto=(C_NL,))
+    trans[S_CADENA][C_COMILLA] = S_CADENA_FIN
+    acepta[S_CADENA]     = A_ERR_CADENA
+    acepta[S_CADENA_FIN] = A_STRING
+
+    # Q1 / Q2 para '...'
+    todas(S_CHAR1, S_CHAR2, excepto=(C_NL,))
+    trans[S_CHAR1][C_APOSTROFE] = S_CHAR_VACIO
+    todas(S_CHAR2, S_CHAR3, excepto=(C_NL,))
+    trans[S_CHAR2][C_APOSTROFE] = S_CHAR_OK
+    todas(S_CHAR3, S_CHAR3, excepto=(C_NL,))
+    trans[S_CHAR3][C_APOSTROFE] = S_CHAR_CIERRE
+    for estado in (S_CHAR1, S_CHAR_VACIO, S_CHAR2, S_CHAR3, S_CHAR_CIERRE):
+        acepta[estado] = A_ERR_CHAR
+    acepta[S_CHAR_OK] = A_CHAR
+
+    # Símbolos directos y carácter inválido
+    acepta[S_DIRECTO]  = A_DIRECTO
+    acepta[S_INVALIDO] = A_INVALIDO
+
+    # Al llegar al EOF: "NNN." es FLOAT_NUM y un bloque sin cerrar se ignora
+    acepta_eof = list(acepta)
+    acepta_eof[S_FLOTANTE]     = A_FLOAT
+    acepta_eof[S_COM_BLOQUE]   = A_SALTAR_MULTI
+    acepta_eof[S_COM_ESTRELLA] = A_SALTAR_MULTI
+
+    # Codificar las entradas hacia estados no finales como -(estado + 2)
+    for fila in trans:
+        for clase, destino in enumerate(fila):
+            if destino >= 0 and not acepta[destino]:
+                fila[clase] = -destino - 2
+
+    return (
+        tuple(tuple(fila) for fila in trans),
+        tuple(acepta),
+        tuple(acepta_eof),
+    )
+
+
+TRANSICIONES, ACEPTACION, ACEPTACION_EOF = _construir_tablas()
+
+# Estados sin ninguna transición de salida: el lexema queda decidido al
+# llegar a ellos, sin necesidad de mirar el carácter siguiente.
+TERMINALES = frozenset(
+    estado for estado, fila in enumerate(TRANSICIONES)
+    if all(destino == SIN_TRANSICION for destino in fila)
+)
+
+
+# ---------------------------------------------------------------------------
+# Mensajes de error
+# ---------------------------------------------------------------------------
+
+def mensaje_error(accion: int, lexema: str, linea: int, columna: int) -> str:
+    """Mensaje de error léxico para una acción de error A_*, igual al del motor clásico."""
+    if accion == A_MALFORMADO:
+        return (
+            f"[LEXICO] Número flotante malformado '{lexema}' en línea "
+            f"{linea}, columna {columna} "
+            f"— se esperaba un dígito después del punto decimal"
+        )
+    if accion == A_ERR_AMP:
+        return (
+            f"[LEXICO] Carácter inválido '&' en línea {linea}, "
+            f"columna {columna} — se esperaba '&&'"
+        )
+    if accion == A_ERR_PIPE:
+        return (
+            f"[LEXICO] Carácter inválido '|' en línea {linea}, "
+            f"columna {columna} — se esperaba '||'"
+        )
+    if accion == A_ERR_CADENA:
+        return (
+            f"[LEXICO] Cadena sin cerrar en línea {linea}, "
+            f"columna {columna}"
+        )
+    if accion == A_ERR_CHAR:
+        return (
+            f"[LEXICO] Carácter literal inválido en línea {linea}, "
+            f"columna {columna}"
+        )
+    return (
+        f"[LEXICO] Carácter inválido {lexema!r} en línea {linea}, "
+        f"columna {columna}"
+    )
+
+
+# Primer carácter de un lexema ERROR → acción de error que lo produjo
+_ACCION_POR_INICIAL: dict[str, int] = {
+    "&": A_ERR_AMP, "|": A_ERR_PIPE, '"': A_ERR_CADENA, "'": A_ERR_CHAR,
+}
+
+
+def errores_de_buffer(tokens: TokenBuffer) -> list[str]:
+    """
+    Reconstruye los mensajes de error léxico a partir de los tokens ERROR de
+    `tokens`. El primer carácter del lexema basta para saber qué rama del DFA
+    falló: un dígito solo llega a ERROR como flotante malformado.
+    """
+    errors: list[str] = []
+    codigo_error = _COD_ERROR
+    for i, codigo in enumerate(tokens.tipos):
+        if codigo != codigo_error:
+            continue
+        lexema = tokens.valor(i)
+        if lexema[0].isdigit():
+            accion = A_MALFORMADO
+        else:
+            accion = _ACCION_POR_INICIAL.get(lexema[0], A_INVALIDO)
+        errors.append(mensaje_error(accion, lexema, tokens.lineas[i], tokens.columnas[i]))
+    return errors
+
+
+# ---------------------------------------------------------------------------
+# Recorrido
+# ---------------------------------------------------------------------------
+
+def tokenize_tabla(source: str) -> tuple[list[Token], list[str]]:
+    """
+    Tokeniza `source` recorriendo las tablas precalculadas.
+    Retorna (lista_de_tokens, lista_de_errores), igual que DFALexer.tokenize.
+    """
+    tokens, errors = tokenize_buffer_tabla(source)
+    return list(tokens), errors
+
+
+def tokenize_buffer_tabla(source: str) -> tuple[TokenBuffer, list[str]]:
+    """
+    Igual que tokenize_tabla, pero deja los tokens en un TokenBuffer sin
+    crear un objeto Token por cada uno.
+    """
+    tokens = TokenBuffer(source)
+    errors: list[str] = []
+    _, linea, inicio_linea, _ = recorrer(source, 0, 1, 0, S_INICIO, True, tokens, errors)
+    n = len(source)
+    tokens.agregar(_COD_EOF, linea, n - inicio_linea + 1, n, n)
+    return tokens, errors
+
+
+# Códigos de tipo (valores enteros de TokenType) usados al emitir tokens
+_COD_IDENT     = TokenType.IDENTIFIER.value
+_COD_ERROR     = TokenType.ERROR.value
+_COD_EOF       = TokenType.EOF.value
+_COD_RESERVADA: dict[str, int] = {lex: tipo.value for lex, tipo in _RESERVADAS.items()}
+_COD_SIMPLE: dict[int, int] = {accion: tipo.value for accion, tipo in _TIPO_SIMPLE.items()}
+# Símbolos directos y relacionales simples: el primer carácter decide el tipo
+_COD_CARACTER: dict[str, int] = {
+    ch: tipo.value
+    for tabla in (_DIRECT_SYMBOLS, _RELACIONAL_SIMPLE)
+    for ch, tipo in tabla.items()
+}
+# Relacionales dobles por su primer carácter ('>' → MAYOR_IGUAL, ...)
+_COD_REL_DOBLE: dict[str, int] = {lex[0]: tipo.value for lex, tipo in _RELACIONAL_DOBLE.items()}
+_COD_INCREMENTO = TokenType.INCREMENTO.value
+_COD_DECREMENTO = TokenType.DECREMENTO.value
+
+
+def recorrer(
+    source: str,
+    desplazamiento: int,
+    linea: int,
+    inicio_linea: int,
+    estado_inicial: int,
+    hasta_eof: bool,
+    tokens: TokenBuffer,
+    errors: list[str],
+) -> tuple[int, int, int, int]:
+    """
+    Recorre `source` desde su inicio agregando tokens a `tokens` y mensajes
+    a `errors`.
+
+    Parámetros:
+        desplazamiento : se suma a las posiciones de `source` al guardar el
+                         rango inicio/fin de cada token (posición de
+                         source[0] dentro del texto de `tokens`).
+        linea          : línea del primer carácter de `source`.
+        inicio_linea   : posición (relativa a `source`, puede ser negativa)
+                         del primer carácter de esa línea; la columna de la
+                         posición p es p - inicio_linea + 1.
+        estado_inicial : estado con el que empieza el primer lexema
+                         (S_INICIO, o un estado de comentario/blancos al
+                         reanudar un recorrido por bloques).
+        hasta_eof      : True si `source` llega hasta el final del programa.
+                         Si es False y un lexema alcanza el final de `source`
+                         sin decidirse, el recorrido se detiene en su inicio.
+
+    Retorna (pos, linea, inicio_linea, estado): posición donde se detuvo el
+    recorrido, línea/inicio de línea en esa posición y estado del DFA al
+    agotar `source` (S_INICIO si todo quedó decidido).
+    """
+    clases     = clasificar(source)
+    trans      = TRANSICIONES
+    acepta     = ACEPTACION
+    acepta_eof = ACEPTACION_EOF
+    terminales = TERMINALES
+
+    agregar_tipo    = tokens.tipos.append
+    agregar_linea   = tokens.lineas.append
+    agregar_columna = tokens.columnas.append
+    agregar_inicio  = tokens.inicios.append
+    agregar_fin     = tokens.fines.append
+
+    n            = len(source)
+    pos          = 0
+    estado_token = estado_inicial
+
+    while pos < n:
+        start        = pos
+        estado       = estado_token
+        estado_token = S_INICIO
+        accion       = A_NINGUNA
+        fin          = pos
+
+        # Avanzar mientras haya transición. Las entradas negativas de la
+        # matriz son la excepción: -1 = sin transición, <= -2 = entrada a un
+        # estado no final (se guarda la última aceptación por si hay que
+        # retroceder).
+        while pos < n:
+            siguiente = trans[estado][clases[pos]]
+            if siguiente < 0:
+                if siguiente == SIN_TRANSICION:
+                    final = acepta[estado]
+                    break
+                if acepta[estado]:
+                    accion = acepta[estado]
+                    fin    = pos
+                siguiente = -siguiente - 2
+            estado = siguiente
+            pos   += 1
+        else:
+            if not hasta_eof and estado not in terminales:
+                # El lexema podría continuar en el siguiente bloque
+                return start, linea, inicio_linea, estado
+            final = acepta_eof[estado]
+        if final:
+            accion = final
+            fin    = pos
+
+        # Retroceder a la última aceptación (lexema más largo)
+        pos = fin
+
+        if accion == A_SALTAR_MULTI:
+            saltos = source.count("\n", start, fin)
+            if saltos:
+                linea       += saltos
+                inicio_linea = source.rfind("\n", start, fin) + 1
+            continue
+        if accion == A_SALTAR:
+            continue
+
+        if accion == A_IDENT:
+            codigo = _COD_RESERVADA.get(source[start:fin], _COD_IDENT)
+        elif accion == A_DIRECTO or accion == A_REL:
+            codigo = _COD_CARACTER[source[start]]
+        elif accion in _COD_SIMPLE:
+            codigo = _COD_SIMPLE[accion]
+        elif accion in (A_REL_DOBLE, A_INCREMENTO, A_DECREMENTO):
+            if accion == A_REL_DOBLE:
+                codigo = _COD_REL_DOBLE[source[start]]
+            elif accion == A_INCREMENTO:
+                codigo = _COD_INCREMENTO
+            else:
+                codigo = _COD_DECREMENTO
+            # Los blancos intermedios pueden contener saltos de línea; el
+            # token conserva la línea/columna de su primer carácter
+            saltos = source.count("\n", start, fin)
+            if saltos:
+                agregar_tipo(codigo)
+                agregar_linea(linea)
+                agregar_columna(start - inicio_linea + 1)
+                agregar_inicio(desplazamiento + start)
+                agregar_fin(desplazamiento + fin)
+                linea       += saltos
+                inicio_linea = source.rfind("\n", start, fin) + 1
+                continue
+        else:
+            codigo = _COD_ERROR
+            errors.append(mensaje_error(
+                accion, source[start:fin], linea, start - inicio_linea + 1
+            ))
+
+        agregar_tipo(codigo)
+        agregar_linea(linea)
+        agregar_columna(start - inicio_linea + 1)
+        agregar_inicio(desplazamiento + start)
+        agregar_fin(desplazamiento + fin)
+
+    return n, linea, inicio_linea, S_INICIO
+
+
+# ---------------------------------------------------------------------------
+# Recorrido por bloques (streaming)
+# ---------------------------------------------------------------------------
+
+# Estados cuyo texto no hace falta conservar entre bloques: basta con recordar
+# el estado y las líneas consumidas (un comentario de bloque puede ser tan
+# largo como el archivo; no se acumula en memoria).
+_ESTADOS_SIN_TEXTO = frozenset({S_BLANCOS, S_COM_LINEA, S_COM_BLOQUE, S_COM_ESTRELLA})
+
+
+class EscanerTabla:
+    """
+    Recorrido del DFA por tablas que se alimenta por bloques de texto.
+
+    Entre bloques conserva únicamente el lexema que quedó sin decidir al
+    final del bloque (p. ej. "+  \n" esperando un posible segundo '+', o
+    "32." esperando un dígito) junto con la línea y columna en que empieza.
+    Dentro de comentarios y blancos solo conserva el estado del DFA.
+
+    Parámetros:
+        destino (TokenBuffer | None): si se indica, todos los bloques se
+            acumulan en ese buffer (texto incluido) y los rangos de los
+            tokens son posiciones en el fuente completo. Si no, cada llamada
+            a alimentar() retorna un buffer nuevo con solo los tokens
+            decididos en esa llamada.
+        linea, inicio_linea, base: punto de partida cuando el primer bloque
+            no es el inicio del fuente (ver incremental.py): línea, posición
+            de inicio de esa línea y posición del primer bloque en el fuente.
+            El DFA debe estar en INICIO en `base`.
+
+    Uso:
+        escaner = EscanerTabla()
+        for bloque in bloques:
+            procesar(escaner.alimentar(bloque, errors))
+        procesar(escaner.alimentar("", errors, final=True))   # incluye EOF
+    """
+
+    def __init__(
+        self,
+        destino: Optional[TokenBuffer] = None,
+        linea: int = 1,
+        inicio_linea: int = 0,
+        base: int = 0,
+    ):
+        self.linea         = linea
+        self.destino       = destino
+        self._pendiente    = ""                     # texto del lexema sin decidir
+        self._inicio_linea = inicio_linea - base    # relativo al inicio de _pendiente
+        self._estado       = S_INICIO               # estado con el que empieza _pendiente
+        self._base         = base                   # posición de _pendiente en el fuente completo
+
+    def alimentar(
+        self,
+        texto: str,
+        errors: list[str],
+        final: bool = False,
+    ) -> TokenBuffer:
+        """
+        Procesa `texto` agregando al buffer de salida todo lo que ya quedó
+        decidido, y retorna ese buffer. Con final=True se cierra el recorrido
+        y se agrega el EOF.
+        """
+        buf = self._pendiente + texto
+        if self.destino is not None:
+            tokens = self.destino
+            tokens.agregar_texto(texto)
+            desplazamiento = self._base
+        else:
+            tokens = TokenBuffer(buf)
+            desplazamiento = 0
+
+        pos, linea, inicio_linea, estado = recorrer(
+            buf, desplazamiento, self.linea, self._inicio_linea, self._estado,
+            final, tokens, errors,
+        )
+        n = len(buf)
+
+        if final:
+            tokens.agregar(
+                _COD_EOF, linea, n - inicio_linea + 1,
+                desplazamiento + n, desplazamiento + n,
+            )
+            self._pendiente = ""
+            return tokens
+
+        if estado in _ESTADOS_SIN_TEXTO:
+            # Descartar el texto: solo importan los saltos de línea
+            saltos = buf.count("\n", pos, n)
+            if saltos:
+                linea       += saltos
+                inicio_linea = buf.rfind("\n", pos, n) + 1
+            pos = n
+        else:
+            # Lexema a medias: se vuelve a recorrer desde INICIO con más texto
+            estado = S_INICIO
+
+        self._pendiente    = buf[pos:]
+        self._inicio_linea = inicio_linea - pos
+        self._base        += pos
+        self.linea         = linea
+        self._estado       = estado
+        return tokens
+
+
+def iter_tokens_tabla(
+    bloques: Iterable[str], errors: list[str]
+) -> Iterator[Token]:
+    """
+    Genera los tokens de una secuencia de bloques de texto a medida que
+    quedan decididos. Los mensajes de error se agregan a `errors` en el
+    mismo orden en que aparecen los tokens ERROR. El último token es EOF.
+    """
+    escaner = EscanerTabla()
+    for bloque in bloques:
+        if not bloque:
+            continue
+        yield from escaner.alimentar(bloque, errors)
+    yield from escaner.alimentar("", errors, final=True)
+
+
+def tokenize_bloques_tabla(
+    bloques: Iterable[str], errors: list[str]
+) -> TokenBuffer:
+    """
+    Tokeniza una secuencia de bloques de texto en un único TokenBuffer. El
+    buffer conserva el texto leído (los lexemas son rangos sobre él), pero
+    no crea un objeto por token.
+    """
+    escaner = EscanerTabla(TokenBuffer())
+    for bloque in bloques:
+        if bloque:
+            escaner.alimentar(bloque, errors)
+    return escaner.alimentar("", errors, final=True)
@@ -0,0 +1,198 @@
+"""
+incremental.py
+--------------
+Reanálisis léxico incremental para el IDE.
+
+Tras una edición (posición, caracteres eliminados, texto insertado) no hace
+falta tokenizar de nuevo el archivo completo. Se aprovechan dos propiedades
+del DFA (ver dfa_tabla.py):
+
+    - Cada lexema empieza en el estado INICIO, justo donde terminó el
+      anterior. Si un token quedó decidido sin mirar ningún carácter de la
+      zona editada, el recorrido puede reanudarse exactamente en su fin.
+    - Para decidir un token el DFA mira, como mucho, los blancos que lo
+      siguen y un carácter más ("+ \\n +" → INCREMENTO, "32." + dígito).
+      Por eso el punto de reanudación es el fin del último token cuyo
+      siguiente carácter no blanco está antes de la edición.
+
+Desde ahí se vuelve a recorrer el texto nuevo por ventanas crecientes hasta
+que un token nuevo, ya pasada la edición, empieza en la misma posición
+(desplazada) y columna que un token anterior, con el mismo tipo: a partir de
+ese punto ambos recorridos ven el mismo texto desde INICIO y producen los
+mismos tokens, así que el resto del buffer anterior se reutiliza solo
+desplazando posiciones y líneas.
+
+Los constructos de varias líneas quedan cubiertos: un comentario /* ... */
+abierto o cerrado por la edición se vuelve a recorrer hasta que el texto
+vuelve a coincidir, y los "==", "++", "--" con saltos de línea intermedios
+se deciden con el mismo autómata que el recorrido completo.
+
+Uso:
+    tokens = DFALexer().tokenize_buffer(source)
+    ...
+    r = reanalizar(tokens, inicio, eliminados, insertado, nuevo_source)
+    tokens = r.tokens          # equivalente a tokenize_buffer(nuevo_source)
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from .dfa_tabla import EscanerTabla
+from .token_buffer import TokenBuffer
+
+# Tamaño (caracteres) de la primera ventana de reanálisis; se duplica en
+# cada vuelta hasta encontrar el punto de resincronización
+VENTANA_INICIAL = 1024
+
+_BLANCOS = frozenset(" \t\r\n")
+
+
+@dataclass
+class Reanalisis:
+    """
+    Resultado de un reanálisis incremental.
+
+    Los tokens [primero:fin_anterior) del buffer anterior fueron reemplazados
+    por los tokens [primero:fin_nuevo) de `tokens`; los anteriores a
+    `primero` no cambiaron y los siguientes solo se desplazaron.
+    [inicio, fin) es la zona del texto nuevo que se volvió a recorrer.
+    """
+    tokens:       TokenBuffer
+    primero:      int
+    fin_anterior: int
+    fin_nuevo:    int
+    inicio:       int
+    fin:          int
+
+
+def reanalizar(
+    anterior: TokenBuffer,
+    inicio: int,
+    eliminados: int,
+    insertado: str,
+    source: str,
+) -> Reanalisis:
+    """
+    Actualiza `anterior` (resultado de DFALexer.tokenize_buffer, con EOF) tras
+    reemplazar `eliminados` caracteres en la posición `inicio` por
+    `insertado`. `source` es el texto completo ya editado.
+
+    El buffer retornado es idéntico al que produciría tokenize_buffer(source).
+    """
+    delta       = len(insertado) - eliminados
+    fin_edicion = inicio + len(insertado)      # en el texto nuevo
+    n           = len(source)
+
+    # -- Punto de reanudación ---------------------------------------------------
+    t = bisect_left(anterior.fines, inicio) - 1
+    while t >= 0 and not _decidido_antes(source, anterior.fines[t], inicio):
+        t -= 1
+
+    primero = t + 1
+    if t >= 0:
+        reanudar = anterior.fines[t]
+        linea    = anterior.lineas[t] + source.count("\n", anterior.inicios[t], reanudar)
+    else:
+        reanudar = 0
+        linea    = 1
+    inicio_linea = source.rfind("\n", 0, reanudar) + 1
+
+    # -- Recorrido por ventanas hasta resincronizar -----------------------------
+    nuevos  = TokenBuffer()
+    escaner = EscanerTabla(nuevos, linea=linea, inicio_linea=inicio_linea, base=reanudar)
+    descartados: list[str] = []    # los mensajes se derivan de los tokens ERROR
+
+    pos       = reanudar
+    ventana   = VENTANA_INICIAL
+    revisados = 0
+    j         = primero            # cursor en el buffer anterior
+    total_ant = len(anterior)
+    sincronia = None
+
+    while sincronia is None:
+        trozo = source[pos:pos + ventana]
+        pos  += len(trozo)
+        ventana *= 2
+        final = pos >= n
+        escaner.alimentar(trozo, descartados, final=final)
+
+        for k in range(revisados, len(nuevos)):
+            s = nuevos.inicios[k]
+            if s < fin_edicion:
+                continue
+            j = bisect_left(anterior.inicios, s - delta, j, total_ant)
+            if (
+                j < total_ant
+                and anterior.inicios[j]  == s - delta
+                and anterior.columnas[j] == nuevos.columnas[k]
+                and anterior.tipos[j]    == nuevos.tipos[k]
+            ):
+                sincronia = (k, j)
+                break
+        revisados = len(nuevos)
+
+        if final:
+            break
+
+    if sincronia is None:
+        k, j = len(nuevos), total_ant
+    else:
+        k, j = sincronia
+
+    # -- Empalme: prefijo anterior + tokens nuevos + cola desplazada ------------
+    resultado = TokenBuffer(source)
+    dlineas   = nuevos.lineas[k] - anterior.lineas[j] if j < total_ant else 0
+    for campo, desplazamiento in (
+        ("tipos", 0), ("lineas", dlineas), ("columnas", 0),
+        ("inicios", delta), ("fines", delta),
+    ):
+        columna: array = getattr(anterior, campo)[:primero]
+        columna.extend(getattr(nuevos, campo)[:k])
+        cola = getattr(anterior, campo)[j:]
+        if desplazamiento:
+            cola = _sumar(cola, desplazamiento)
+        columna.extend(cola)
+        setattr(resultado, campo, columna)
+
+    return Reanalisis(
+        tokens=resultado,
+        primero=primero,
+        fin_anterior=j,
+        fin_nuevo=primero + k,
+        inicio=reanudar,
+        fin=nuevos.inicios[k] if k < len(nuevos) else n,
+    )
+
+
+def _decidido_antes(source: str, fin: int, limite: int) -> bool:
+    """
+    True si el token que termina en `fin` quedó decidido sin mirar ningún
+    carácter desde `limite`: después de él, antes de `limite`, aparece un
+    carácter no blanco.
+    """
+    pos = fin
+    while pos < limite:
+        if source[pos] not in _BLANCOS:
+            return True
+        pos += 1
+    return False
+
+
+def _sumar(valores: array, cantidad: int) -> array:
+    """
+    Suma `cantidad` a todos los elementos de `valores` sin recorrerlos en
+    Python: el arreglo se lee como un único entero (un "carril" de
+    itemsize bytes por elemento) y se le suma la cantidad replicada en cada
+    carril. Ningún carril desborda ni pide prestado al vecino porque los
+    resultados son posiciones/líneas válidas (0 <= v < 2**32).
+    """
+    orden   = sys.byteorder
+    replica = array(valores.typecode, [abs(cantidad)]) * len(valores)
+    total   = int.from_bytes(valores.tobytes(), orden)
+    paso    = int.from_bytes(replica.tobytes(), orden)
+    total   = total + paso if cantidad > 0 else total - paso
+    return array(valores.typecode, total.to_bytes(len(valores) * valores.itemsize, orden))
@@ -0,0 +1,213 @@
+"""
+token_buffer.py
+---------------
+Almacenamiento columnar de tokens para el analizador léxico CAOS.
+
+En lugar de un objeto `Token` por token, `TokenBuffer` guarda cada campo en
+un arreglo compacto del módulo `array`:
+
+    tipos    array('B')  código del tipo de token (valor de TokenType)
+    lineas   array('I')  línea (1-indexed)
+    columnas array('I')  columna del primer carácter (1-indexed)
+    inicios  array('I')  posición del primer carácter en el texto fuente
+    fines    array('I')  posición siguiente al último carácter reconocido
+
+El lexema no se copia: se obtiene del texto fuente con texto[inicio:fin].
+Para los tipos cuyo lexema es siempre el mismo (palabras reservadas,
+operadores, símbolos) se usa una tabla de lexemas fijos; así "+\\n+" se
+lee como "++" aunque su rango en el fuente incluya el salto de línea.
+
+Indexar o iterar el buffer produce `Token` bajo demanda, para el código que
+aún trabaja con objetos; las fases del compilador pueden leer las columnas
+directamente sin materializar ninguno.
+"""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from itertools import compress
+from typing import Iterable, Iterator, Optional
+
+from .dfa_lexer import (
+    Token,
+    _DIRECT_SYMBOLS,
+    _RELACIONAL_DOBLE,
+    _RELACIONAL_SIMPLE,
+    _RESERVADAS,
+)
+from .token_types import TokenType
+
+
+# ---------------------------------------------------------------------------
+# Códigos de tipo de token
+# ---------------------------------------------------------------------------
+
+# Nombre del tipo ("INT_NUM", "KW_IF", ...) → código (valor de TokenType)
+CODIGO_TIPO: dict[str, int] = {t.name: t.value for t in TokenType}
+
+# Código → miembro de TokenType (índice 0 sin uso: TokenType empieza en 1)
+CATEGORIA: tuple[Optional[TokenType], ...] = (None,) + tuple(sorted(TokenType))
+
+# Código → nombre del tipo
+NOMBRE_TIPO: tuple[str, ...] = ("",) + tuple(t.name for t in sorted(TokenType))
+
+
+def _lexemas_fijos() -> tuple[Optional[str], ...]:
+    """Código → lexema, para los tipos cuyo lexema no depende del fuente."""
+    fijos: list[Optional[str]] = [None] * len(NOMBRE_TIPO)
+    tablas: list[dict[str, TokenType]] = [
+        _RESERVADAS, _DIRECT_SYMBOLS, _RELACIONAL_SIMPLE, _RELACIONAL_DOBLE,
+        {"+": TokenType.SUMA, "++": TokenType.INCREMENTO, "-": TokenType.RESTA,
+         "--": TokenType.DECREMENTO, "/": TokenType.DIVISION,
+         "&&": TokenType.AND, "||": TokenType.OR},
+    ]
+    for tabla in tablas:
+        for lexema, tipo in tabla.items():
+            fijos[tipo] = sys.intern(lexema)
+    fijos[TokenType.EOF] = ""
+    return tuple(fijos)
+
+
+LEXEMA_FIJO: tuple[Optional[str], ...] = _lexemas_fijos()
+
+
+# ---------------------------------------------------------------------------
+# TokenBuffer
+# ---------------------------------------------------------------------------
+
+class TokenBuffer:
+    """
+    Secuencia de tokens almacenada por columnas.
+
+    Uso:
+        buf = TokenBuffer(source)
+        buf.agregar(CODIGO_TIPO["IDENTIFIER"], linea, columna, inicio, fin)
+
+        len(buf), buf[i], for tok in buf      → vistas Token bajo demanda
+        buf.tipo(i), buf.valor(i)             → campos sin crear objetos
+        buf.filas()                           → tuplas (tipo, valor, línea, columna)
+
+    Parámetros:
+        texto (str): texto fuente al que apuntan los rangos inicio/fin. Puede
+                     completarse por bloques con agregar_texto() cuando el
+                     fuente se lee en streaming.
+    """
+
+    __slots__ = ("tipos", "lineas", "columnas", "inicios", "fines", "_partes")
+
+    def __init__(self, texto: str = ""):
+        self.tipos    = array("B")
+        self.lineas   = array("I")
+        self.columnas = array("I")
+        self.inicios  = array("I")
+        self.fines    = array("I")
+        self._partes: list[str] = [texto] if texto else []
+
+    # -- Construcción ---------------------------------------------------------
+
+    def agregar(self, codigo: int, linea: int, columna: int, inicio: int, fin: int) -> None:
+        """Agrega un token al final del buffer."""
+        self.tipos.append(codigo)
+        self.lineas.append(linea)
+        self.columnas.append(columna)
+        self.inicios.append(inicio)
+        self.fines.append(fin)
+
+    def agregar_texto(self, texto: str) -> None:
+        """Extiende el texto fuente (lectura por bloques)."""
+        if texto:
+            self._partes.append(texto)
+
+    @property
+    def texto(self) -> str:
+        """Texto fuente completo al que apuntan los rangos de los tokens."""
+        if len(self._partes) > 1:
+            self._partes = ["".join(self._partes)]
+        return self._partes[0] if self._partes else ""
+
+    # -- Acceso por campo -------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    def categoria(self, i: int) -> TokenType:
+        """Tipo del token i (ej. TokenType.KW_IF)."""
+        return CATEGORIA[self.tipos[i]]
+
+    def tipo(self, i: int) -> str:
+        """Nombre del tipo del token i (ej. "KW_IF")."""
+        return NOMBRE_TIPO[self.tipos[i]]
+
+    def valor(self, i: int) -> str:
+        """Lexema del token i."""
+        codigo = self.tipos[i]
+        fijo = LEXEMA_FIJO[codigo]
+        if fijo is not None:
+            return fijo
+        lexema = self.texto[self.inicios[i]:self.fines[i]]
+        return sys.intern(lexema) if codigo == TokenType.IDENTIFIER else lexema
+
+    # -- Vistas ---------------------------------------------------------------
+
+    def __getitem__(self, i: int) -> Token:
+        if i < 0:
+            i += len(self.tipos)
+        return Token(CATEGORIA[self.tipos[i]], self.valor(i), self.lineas[i], self.columnas[i])
+
+    def __iter__(self) -> Iterator[Token]:
+        return map(
+            Token, map(CATEGORIA.__getitem__, self.tipos), self._valores(),
+            self.lineas, self.columnas,
+        )
+
+    def filas(self) -> Iterator[tuple[str, str, int, int]]:
+        """Recorre los tokens como tuplas (tipo, valor, línea, columna)."""
+        return zip(self._nombres(), self._valores(), self.lineas, self.columnas)
+
+    def lexemas(self, tipo: str) -> Iterator[str]:
+        """Lexemas de los tokens de un tipo (ej. "IDENTIFIER"), en orden."""
+        codigo = CODIGO_TIPO[tipo]
+        texto = self.texto
+        fijo = LEXEMA_FIJO[codigo]
+        for c, inicio, fin in zip(self.tipos, self.inicios, self.fines):
+            if c == codigo:
+                yield fijo if fijo is not None else texto[inicio:fin]
+
+    def _nombres(self) -> Iterator[str]:
+        return map(NOMBRE_TIPO.__getitem__, self.tipos)
+
+    def _valores(self) -> Iterator[str]:
+        """Lexemas de todos los tokens; los identificadores se internan."""
+        texto = self.texto
+        fijos = LEXEMA_FIJO
+        ident = TokenType.IDENTIFIER
+        intern = sys.intern
+        for codigo, inicio, fin in zip(self.tipos, self.inicios, self.fines):
+            fijo = fijos[codigo]
+            if fijo is not None:
+                yield fijo
+            elif codigo == ident:
+                yield intern(texto[inicio:fin])
+            else:
+                yield texto[inicio:fin]
+
+    def filtrar(self, excluir: Iterable[str]) -> "TokenBuffer":
+        """
+        Retorna un nuevo buffer sin los tokens cuyos tipos están en `excluir`
+        (ej. {"ERROR", "EOF"}). El texto fuente se comparte, no se copia.
+        """
+        codigos = {CODIGO_TIPO[nombre] for nombre in excluir}
+        mascara = [codigo not in codigos for codigo in self.tipos]
+
+        nuevo = TokenBuffer()
+        nuevo._partes   = [self.texto]
+        nuevo.tipos     = array("B", compress(self.tipos, mascara))
+        nuevo.lineas    = array("I", compress(self.lineas, mascara))
+        nuevo.columnas  = array("I", compress(self.columnas, mascara))
+        nuevo.inicios   = array("I", compress(self.inicios, mascara))
+        nuevo.fines     = array("I", compress(self.fines, mascara))
+        return nuevo
+
+    def __repr__(self) -> str:
+        return f"TokenBuffer({len(self)} tokens)"
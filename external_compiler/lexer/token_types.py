@@ -3,12 +3,16 @@ token_types.py
 --------------
 Define la enumeración de todos los tipos de tokens que el DFA puede producir.
 Cada miembro representa una categoría semántica del lenguaje CAOS.
+
+Es un IntEnum: los miembros son enteros pequeños (1, 2, ...), de modo que
+comparar tipos de token es comparar enteros y el valor puede guardarse
+directamente en un array('B') (ver token_buffer.py).
 """
 
-from enum import Enum, auto
+from enum import IntEnum, auto
 
 
-class TokenType(Enum):
+class TokenType(IntEnum):
     # ------------------------------------------------------------------
     # Literales numéricos
     # ------------------------------------------------------------------
@@ -0,0 +1,7 @@
+# Módulo semántico del compilador CAOS
+# Exporta el análisis semántico sobre el AST y la tabla de símbolos.
+
+from .analizador import AnalizadorSemantico
+from .tabla_simbolos import TIPOS, Simbolo, TablaSimbolos
+
+__all__ = ["AnalizadorSemantico", "Simbolo", "TablaSimbolos", "TIPOS"]
@@ -0,0 +1,375 @@
+"""
+analizador.py
+-------------
+Análisis semántico del compilador CAOS sobre el AST en arena
+(sintactico/arbol.py).
+
+Recorre el árbol una sola vez, con una pila explícita (sin recursión, como
+Arbol.formatear): cada nodo se visita al entrar, en preorden, y los que
+tienen hijos otra vez al salir, cuando ya se visitaron todos ellos. Son dos
+visitas por nodo, así que el costo es lineal.
+
+Al entrar se construye la tabla de símbolos (tabla_simbolos.py):
+
+    - cada BLOQUE abre un ámbito que se cierra al salir de él; el programa
+      es el ámbito 0;
+    - una DECLARACION declara sus identificadores en el ámbito actual;
+    - cualquier otro IDENTIFICADOR es un uso de la declaración visible.
+
+Al salir, de abajo hacia arriba, se infiere el tipo de cada expresión, se
+pliegan las constantes y se verifican los tipos (reglas en tipos.py):
+
+    - un operador cuyos operandos son constantes se evalúa al compilar; su
+      valor queda en `valores` (la generación de código intermedio emite la
+      constante en lugar de la operación);
+    - una asignación debe poder guardar el tipo de su expresión en la
+      variable (a un int no se le asigna un real);
+    - las condiciones deben ser numéricas o lógicas, y switch / case enteros.
+
+Errores (formato de errors.txt):
+
+    [SEMANTICO] Variable 'suma' no declarada en línea 6, columna 2
+    [SEMANTICO] Variable 'x' ya declarada en este ámbito en línea 9, columna 5 — declaración anterior en línea 4, columna 5
+    [SEMANTICO] Tipos incompatibles: se asigna un valor real a 'x' (int) en línea 7, columna 1
+    [SEMANTICO] Operandos inválidos para '+': cadena y int en línea 3, columna 8
+
+Una variable no declarada se reporta solo en su primer uso, y su tipo es
+ERROR (no provoca más errores). Las variables declaradas y nunca usadas y
+las divisiones entre cero constantes no son errores: quedan en
+`advertencias`.
+
+Uso:
+    analizador = AnalizadorSemantico(arbol)
+    tabla = analizador.analizar()         # TablaSimbolos
+    analizador.errores, analizador.advertencias
+    analizador.tipos[n], analizador.valores.get(n)   # tipo y valor plegado
+    analizador.plegadas                   # expresiones plegadas (ver texto())
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Optional
+
+from lexer.token_types import TokenType
+from sintactico.arbol import Arbol, Nodo
+
+from .tabla_simbolos import Simbolo, TablaSimbolos
+from .tipos import (
+    DECLARADOS, NOMBRES, NUMERICOS, Tipo, Valor, asignable, convertir,
+    evaluar_binario, evaluar_unario, tipo_binario, tipo_unario,
+)
+
+# Tipo de cada literal
+_LITERALES: dict[int, Tipo] = {
+    Nodo.ENTERO: Tipo.INT,
+    Nodo.REAL: Tipo.REAL,
+    Nodo.CADENA: Tipo.CADENA,
+    Nodo.CARACTER: Tipo.CARACTER,
+}
+
+# Posición de la condición entre los hijos de cada construcción
+_CONDICION: dict[int, int] = {
+    Nodo.SI: 0, Nodo.MIENTRAS: 0, Nodo.HACER: 1, Nodo.PARA: 1,
+}
+
+
+class AnalizadorSemantico:
+    """
+    Análisis semántico de un AST sin errores de sintaxis.
+
+    Parámetros:
+        arbol (Arbol): AST completo del programa (raíz PROGRAMA).
+    """
+
+    def __init__(self, arbol: Arbol):
+        self.arbol = arbol
+        self.tabla = TablaSimbolos()
+        self.errores: list[str] = []
+        self.advertencias: list[str] = []
+        self.referencias = 0
+        # Nombre no declarado → usos (solo el primero se reporta)
+        self.no_declarados: dict[str, int] = {}
+        # Nodo IDENTIFICADOR (uso) → declaración a la que se refiere
+        self.resueltos: dict[int, Simbolo] = {}
+        # Tipo de cada nodo (Tipo.NINGUNO si no es expresión)
+        self.tipos = array("B", bytes(len(arbol)))
+        # Nodo de expresión constante → su valor (literales incluidos)
+        self.valores: dict[int, Valor] = {}
+        # Operaciones plegadas más externas (cada una es una expresión entera
+        # o parte de una que no es constante), en orden del fuente
+        self.plegadas: list[int] = []
+
+    def analizar(self) -> TablaSimbolos:
+        """Recorre el árbol y retorna la tabla de símbolos completa."""
+        arbol, tabla = self.arbol, self.tabla
+        tipos, primeros, siguientes = arbol.tipos, arbol.primeros, arbol.siguientes
+        tipos_expr, valores = self.tipos, self.valores
+
+        # Un valor negativo (~n) en la pila marca la salida del nodo n
+        pila = [arbol.raiz] if len(arbol) else []
+        while pila:
+            n = pila.pop()
+            if n < 0:
+                self._salir(~n)
+                continue
+            tipo = tipos[n]
+            if tipo == Nodo.DECLARACION:
+                self._declaracion(n)
+                continue
+            if tipo == Nodo.IDENTIFICADOR:
+                tipos_expr[n] = self._uso(n)
+                continue
+            literal = _LITERALES.get(tipo)
+            if literal is not None:
+                tipos_expr[n] = literal
+                if literal == Tipo.INT:
+                    valores[n] = int(arbol.lexema(n))
+                elif literal == Tipo.REAL:
+                    valores[n] = float(arbol.lexema(n))
+                continue
+            if tipo == Nodo.BLOQUE:
+                tabla.abrir()
+
+            # Hijos en orden inverso: se visitan en el orden del fuente
+            hijos = []
+            hijo = primeros[n]
+            while hijo != -1:
+                hijos.append(hijo)
+                hijo = siguientes[hijo]
+            if hijos:
+                pila.append(~n)
+                pila.extend(reversed(hijos))
+            elif tipo == Nodo.BLOQUE:
+                tabla.cerrar()
+
+        # Las de una construcción se marcan al salir de ella, después de las
+        # de su cuerpo: se ordenan por posición en el fuente
+        token = arbol.token
+        self.plegadas.sort(key=lambda n: token[self._izquierdo(n)])
+
+        for simbolo in tabla.simbolos:
+            if simbolo.usos == 0:
+                self.advertencias.append(
+                    f"Variable '{simbolo.nombre}' declarada en línea {simbolo.linea}, "
+                    f"columna {simbolo.columna} y nunca usada"
+                )
+        return tabla
+
+    # -- Símbolos -----------------------------------------------------------------
+
+    def _declaracion(self, n: int) -> None:
+        """int/real/float x, y, ...: declara cada identificador."""
+        arbol, tabla = self.arbol, self.tabla
+        tipo = arbol.lexema(n)
+        for hijo in arbol.hijos(n):
+            nombre = arbol.lexema(hijo)
+            linea, columna = arbol.posicion(hijo)
+            previo = tabla.declarar(nombre, tipo, linea, columna)
+            if previo is not None:
+                self.errores.append(
+                    f"[SEMANTICO] Variable '{nombre}' ya declarada en este ámbito "
+                    f"en línea {linea}, columna {columna} — declaración anterior "
+                    f"en línea {previo.linea}, columna {previo.columna}"
+                )
+
+    def _uso(self, n: int) -> Tipo:
+        """Referencia a una variable: debe haber una declaración visible."""
+        nombre = self.arbol.lexema(n)
+        self.referencias += 1
+        simbolo = self.tabla.usar(nombre)
+        if simbolo is not None:
+            self.resueltos[n] = simbolo
+            return DECLARADOS[simbolo.tipo]
+        usos = self.no_declarados.get(nombre, 0)
+        self.no_declarados[nombre] = usos + 1
+        if not usos:
+            self._error(f"Variable '{nombre}' no declarada", n)
+        return Tipo.ERROR
+
+    # -- Tipos y constantes -------------------------------------------------------
+
+    def _salir(self, n: int) -> None:
+        """Visita de salida: todos los hijos de `n` ya tienen tipo y valor."""
+        tipo = self.arbol.tipos[n]
+        if tipo == Nodo.BINARIO:
+            self._binario(n)
+        elif tipo == Nodo.UNARIO:
+            self._unario(n)
+        else:
+            if tipo == Nodo.BLOQUE:
+                self.tabla.cerrar()
+            elif tipo == Nodo.ASIGNACION:
+                self._asignacion(n)
+            elif tipo in _CONDICION:
+                self._condicion(n, _CONDICION[tipo])
+            elif tipo in (Nodo.SEGUN, Nodo.CASO):
+                self._entero(n)
+            self._marcar_plegadas(n)
+
+    def _binario(self, n: int) -> None:
+        arbol, valores = self.arbol, self.valores
+        izquierda = arbol.primeros[n]
+        derecha = arbol.siguientes[izquierda]
+        operador = arbol.tokens.tipos[arbol.token[n]]
+        # (los códigos del arreglo se usan directamente: Tipo es un IntEnum)
+        resultado = tipo_binario(operador, self.tipos[izquierda], self.tipos[derecha])
+        if resultado is None:
+            self._error(
+                f"Operandos inválidos para '{arbol.lexema(n)}': "
+                f"{NOMBRES[self.tipos[izquierda]]} y {NOMBRES[self.tipos[derecha]]}",
+                n,
+            )
+            resultado = Tipo.ERROR
+        self.tipos[n] = resultado
+
+        if resultado != Tipo.ERROR and izquierda in valores and derecha in valores:
+            valor = evaluar_binario(operador, valores[izquierda], valores[derecha])
+            if valor is not None:
+                valores[n] = convertir(valor, resultado)
+            elif operador in (TokenType.DIVISION, TokenType.MODULO) and not valores[derecha]:
+                linea, columna = arbol.posicion(n)
+                self.advertencias.append(
+                    f"División entre cero en línea {linea}, columna {columna}: "
+                    "no se pliega (fallará al ejecutar)"
+                )
+        if n not in valores:
+            self._marcar_plegadas(n)
+
+    def _unario(self, n: int) -> None:
+        arbol, valores = self.arbol, self.valores
+        operando = arbol.primeros[n]
+        operador = arbol.tokens.tipos[arbol.token[n]]
+        resultado = tipo_unario(operador, self.tipos[operando])
+        if resultado is None:
+            self._error(
+                f"Operando inválido para '{arbol.lexema(n)}': "
+                f"{NOMBRES[self.tipos[operando]]}",
+                n,
+            )
+            resultado = Tipo.ERROR
+        self.tipos[n] = resultado
+        if resultado != Tipo.ERROR and operando in valores:
+            valores[n] = convertir(evaluar_unario(operador, valores[operando]), resultado)
+        else:
+            self._marcar_plegadas(n)
+
+    def _asignacion(self, n: int) -> None:
+        """variable = expresión: el tipo de la expresión debe caber en la variable."""
+        arbol = self.arbol
+        variable = arbol.primeros[n]
+        expresion = arbol.siguientes[variable]
+        destino, valor = self.tipos[variable], self.tipos[expresion]
+        if destino != Tipo.ERROR and not asignable(destino, valor):
+            simbolo = self.tabla.buscar(arbol.lexema(variable))
+            self._error(
+                f"Tipos incompatibles: se asigna un valor {NOMBRES[valor]} a "
+                f"'{arbol.lexema(variable)}' ({simbolo.tipo})",
+                variable,
+            )
+
+    def _condicion(self, n: int, indice: int) -> None:
+        """La condición de if / while / do / for debe ser numérica o lógica."""
+        condicion = self._hijo(n, indice)
+        tipo = Tipo(self.tipos[condicion])
+        if tipo not in NUMERICOS and tipo not in (Tipo.NINGUNO, Tipo.ERROR):
+            self._error(
+                f"La condición de '{self.arbol.lexema(n)}' debe ser numérica o lógica, "
+                f"no {NOMBRES[tipo]}",
+                condicion,
+            )
+
+    def _entero(self, n: int) -> None:
+        """El valor de switch / case debe ser entero."""
+        valor = self.arbol.primeros[n]
+        tipo = Tipo(self.tipos[valor])
+        if tipo not in (Tipo.INT, Tipo.LOGICO, Tipo.ERROR):
+            self._error(
+                f"'{self.arbol.lexema(n)}' requiere un valor entero, no {NOMBRES[tipo]}",
+                valor,
+            )
+
+    def _marcar_plegadas(self, n: int) -> None:
+        """
+        `n` no es constante: sus hijos que sí son operaciones plegadas son
+        expresiones plegadas completas. Un literal negativo (-3) no cuenta.
+        """
+        tipos, primeros, siguientes = self.arbol.tipos, self.arbol.primeros, self.arbol.siguientes
+        valores = self.valores
+        hijo = primeros[n]
+        while hijo != -1:
+            if hijo in valores and (
+                tipos[hijo] == Nodo.BINARIO
+                or (tipos[hijo] == Nodo.UNARIO and tipos[primeros[hijo]] not in _LITERALES)
+            ):
+                self.plegadas.append(hijo)
+            hijo = siguientes[hijo]
+
+    # -- Utilidades ---------------------------------------------------------------
+
+    def _hijo(self, n: int, indice: int) -> int:
+        hijo = self.arbol.primeros[n]
+        for _ in range(indice):
+            hijo = self.arbol.siguientes[hijo]
+        return hijo
+
+    def _error(self, mensaje: str, n: int) -> None:
+        linea, columna = self.posicion(n)
+        self.errores.append(f"[SEMANTICO] {mensaje} en línea {linea}, columna {columna}")
+
+    def posicion(self, n: int) -> tuple[int, int]:
+        """(línea, columna) del primer token de la expresión `n` (ver _extremos)."""
+        tokens = self.arbol.tokens
+        i = self._extremos(n)[0]
+        return tokens.lineas[i], tokens.columnas[i]
+
+    def _izquierdo(self, n: int) -> int:
+        """
+        Nodo del primer token de la expresión `n`: el operando más a la
+        izquierda de un binario es su primer hijo, y un unario (prefijo)
+        empieza en su operador.
+        """
+        tipos, primeros = self.arbol.tipos, self.arbol.primeros
+        while tipos[n] == Nodo.BINARIO:
+            n = primeros[n]
+        return n
+
+    def _extremos(self, n: int) -> tuple[int, int]:
+        """
+        Índices del primer y último token de la expresión `n` en el
+        TokenBuffer, incluidos los paréntesis que la encierran.
+        """
+        arbol = self.arbol
+        tipos, primeros, siguientes, token = (
+            arbol.tipos, arbol.primeros, arbol.siguientes, arbol.token
+        )
+        derecho = n
+        while tipos[derecho] in (Nodo.BINARIO, Nodo.UNARIO):
+            hijo = primeros[derecho]
+            if tipos[derecho] == Nodo.BINARIO:
+                hijo = siguientes[hijo]
+            derecho = hijo
+        primero, ultimo = token[self._izquierdo(n)], token[derecho]
+
+        # Paréntesis sin pareja dentro del tramo: los que lo encierran
+        codigos = arbol.tokens.tipos
+        abiertos = cerrados = 0
+        for i in range(primero, ultimo + 1):
+            if codigos[i] == TokenType.PAR_IZQ:
+                abiertos += 1
+            elif codigos[i] == TokenType.PAR_DER:
+                if abiertos:
+                    abiertos -= 1
+                else:
+                    cerrados += 1
+        return primero - cerrados, ultimo + abiertos
+
+    def texto(self, n: int) -> str:
+        """Texto fuente de la expresión `n` (espacios y saltos de línea como un espacio)."""
+        tokens = self.arbol.tokens
+        primero, ultimo = self._extremos(n)
+        return " ".join(tokens.texto[tokens.inicios[primero]:tokens.fines[ultimo]].split())
+
+    def valor(self, n: int) -> Optional[Valor]:
+        """Valor plegado de la expresión `n`, o None si no es constante."""
+        return self.valores.get(n)
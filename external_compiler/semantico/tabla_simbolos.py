@@ -0,0 +1,163 @@
+"""
+tabla_simbolos.py
+-----------------
+Tabla de símbolos con ámbitos anidados del compilador CAOS.
+
+Cada ámbito es un dict nombre → Simbolo, y los ámbitos abiertos forman una
+pila (el programa es el ámbito 0; cada bloque abre uno nuevo). Además se
+mantiene un solo dict `_visibles` con la declaración visible de cada nombre:
+buscar un nombre es una consulta O(1), sin recorrer la pila, aunque haya
+muchos ámbitos abiertos. Cada Simbolo recuerda la declaración que oculta en
+un ámbito exterior, que vuelve a ser visible al cerrar su ámbito (el costo
+de cerrar es proporcional a lo declarado en él).
+
+Todos los símbolos declarados quedan en `simbolos`, en orden de declaración,
+también los de ámbitos ya cerrados: son los que se listan en symbols.txt.
+
+Uso:
+    tabla = TablaSimbolos()                 # abre el ámbito del programa
+    tabla.declarar("x", "int", 4, 5)        → None (o la declaración previa
+                                              del mismo ámbito)
+    tabla.abrir(); ...; tabla.cerrar()      # bloque
+    tabla.usar("x")                         → Simbolo (cuenta el uso) o None
+    tabla.formatear(), tabla.filas()        → symbols.txt, filas para JSON
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+# Tipos que se pueden declarar
+TIPOS = ("int", "real", "float")
+
+
+class Simbolo:
+    """Una variable declarada: tipo, ámbito, posición de la declaración y usos."""
+
+    __slots__ = ("nombre", "tipo", "ambito", "nivel", "linea", "columna", "usos", "oculto")
+
+    def __init__(self, nombre: str, tipo: str, ambito: int, nivel: int,
+                 linea: int, columna: int, oculto: Optional["Simbolo"] = None):
+        self.nombre  = nombre
+        self.tipo    = tipo
+        self.ambito  = ambito    # número del ámbito (0 = programa, en orden de apertura)
+        self.nivel   = nivel     # profundidad del ámbito (0 = programa)
+        self.linea   = linea
+        self.columna = columna
+        self.usos    = 0
+        self.oculto  = oculto    # declaración de un ámbito exterior que esta oculta
+
+    def fila(self) -> dict:
+        """Forma estructurada (JSON / pestaña Simbolos)."""
+        return {
+            "nombre": self.nombre,
+            "tipo": self.tipo,
+            "ambito": self.ambito,
+            "nivel": self.nivel,
+            "linea": self.linea,
+            "columna": self.columna,
+            "usos": self.usos,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"Simbolo({self.nombre!r}, {self.tipo!r}, ambito={self.ambito}, "
+            f"{self.linea}:{self.columna}, usos={self.usos})"
+        )
+
+
+class TablaSimbolos:
+    """
+    Pila de ámbitos con búsqueda O(1) del símbolo visible de cada nombre.
+
+    Uso:
+        tabla.nivel, tabla.ambitos        → profundidad actual, ámbitos abiertos en total
+        tabla.buscar(n), tabla.usar(n)    → símbolo visible (usar() cuenta el uso)
+        len(tabla), tabla.simbolos        → símbolos declarados, en orden
+    """
+
+    def __init__(self):
+        self.simbolos: list[Simbolo] = []
+        self.ambitos = 0
+        self._pila: list[tuple[int, dict[str, Simbolo]]] = []
+        self._visibles: dict[str, Simbolo] = {}
+        self.abrir()
+
+    def __len__(self) -> int:
+        return len(self.simbolos)
+
+    @property
+    def nivel(self) -> int:
+        """Profundidad del ámbito actual (0 = programa)."""
+        return len(self._pila) - 1
+
+    # -- Ámbitos ------------------------------------------------------------------
+
+    def abrir(self) -> None:
+        """Abre un ámbito anidado en el actual."""
+        self._pila.append((self.ambitos, {}))
+        self.ambitos += 1
+
+    def cerrar(self) -> None:
+        """Cierra el ámbito actual: sus nombres dejan de ser visibles."""
+        _, ambito = self._pila.pop()
+        visibles = self._visibles
+        for nombre, simbolo in ambito.items():
+            if simbolo.oculto is None:
+                del visibles[nombre]
+            else:
+                visibles[nombre] = simbolo.oculto
+
+    # -- Símbolos -----------------------------------------------------------------
+
+    def declarar(self, nombre: str, tipo: str, linea: int, columna: int) -> Optional[Simbolo]:
+        """
+        Declara `nombre` en el ámbito actual. Si ya estaba declarado en este
+        mismo ámbito no cambia nada y retorna esa declaración (el llamador
+        reporta el error); si no, retorna None. Declarar un nombre de un
+        ámbito exterior lo oculta hasta cerrar este.
+        """
+        numero, ambito = self._pila[-1]
+        previo = ambito.get(nombre)
+        if previo is not None:
+            return previo
+        simbolo = Simbolo(nombre, tipo, numero, self.nivel, linea, columna,
+                          self._visibles.get(nombre))
+        ambito[nombre] = simbolo
+        self._visibles[nombre] = simbolo
+        self.simbolos.append(simbolo)
+        return None
+
+    def buscar(self, nombre: str) -> Optional[Simbolo]:
+        """Declaración visible de `nombre` desde el ámbito actual, o None."""
+        return self._visibles.get(nombre)
+
+    def usar(self, nombre: str) -> Optional[Simbolo]:
+        """Como buscar(), y cuenta un uso del símbolo encontrado."""
+        simbolo = self._visibles.get(nombre)
+        if simbolo is not None:
+            simbolo.usos += 1
+        return simbolo
+
+    # -- Salida ---------------------------------------------------------------------
+
+    def filas(self) -> list[dict]:
+        """Todos los símbolos en forma estructurada, en orden de declaración."""
+        return [simbolo.fila() for simbolo in self.simbolos]
+
+    def formatear(self) -> str:
+        """Contenido de symbols.txt: una fila por símbolo, en orden de declaración."""
+        header = (
+            "Tabla de Símbolos\n"
+            "=================\n"
+            f"Símbolos: {len(self.simbolos)}    Ámbitos: {self.ambitos}\n\n"
+            f"{'Nombre':<20} {'Tipo':<6} {'Ámbito':>7} {'Nivel':>6} "
+            f"{'Línea':>6} {'Columna':>8} {'Usos':>6}\n"
+        )
+        sep = "-" * 63 + "\n"
+        rows = "".join(
+            f"{s.nombre:<20} {s.tipo:<6} {s.ambito:>7} {s.nivel:>6} "
+            f"{s.linea:>6} {s.columna:>8} {s.usos:>6}\n"
+            for s in self.simbolos
+        )
+        return header + sep + rows
@@ -0,0 +1,182 @@
+"""
+tipos.py
+--------
+Tipos de las expresiones CAOS y evaluación de operadores sobre constantes
+(plegado de constantes del análisis semántico).
+
+Reglas (al estilo de C):
+
+    - int y real/float son numéricos; float es sinónimo de real. Operar un
+      int con un real da real; / entre enteros trunca hacia cero y % solo
+      acepta enteros.
+    - Las comparaciones, &&, || y ! dan un valor lógico, que en aritmética y
+      asignaciones cuenta como int (0 / 1).
+    - Cadenas y caracteres solo se comparan con == y != con otro del mismo
+      tipo; no admiten aritmética ni pueden asignarse a variables.
+    - ERROR es el tipo de lo que ya tuvo un error (p. ej. una variable no
+      declarada): se acepta en todas partes para no encadenar errores.
+
+evaluar_binario / evaluar_unario retornan None si el resultado no puede
+calcularse al compilar (división entre cero, desbordamiento, potencias
+demasiado grandes): esa expresión simplemente no se pliega.
+"""
+
+from __future__ import annotations
+
+from enum import IntEnum, auto
+from typing import Optional, Union
+
+from lexer.token_types import TokenType
+
+Valor = Union[int, float, bool]
+
+# Bits máximos de un entero resultado de una potencia plegada
+_MAX_BITS_POTENCIA = 4096
+
+
+class Tipo(IntEnum):
+    """Tipo de una expresión."""
+    NINGUNO   = 0       # nodo que no es expresión
+    INT       = auto()
+    REAL      = auto()
+    LOGICO    = auto()
+    CADENA    = auto()
+    CARACTER  = auto()
+    ERROR     = auto()
+
+
+# Tipo declarado (palabra reservada) → Tipo
+DECLARADOS: dict[str, Tipo] = {"int": Tipo.INT, "real": Tipo.REAL, "float": Tipo.REAL}
+
+# Nombre de cada tipo en los mensajes
+NOMBRES: dict[Tipo, str] = {
+    Tipo.INT: "int", Tipo.REAL: "real", Tipo.LOGICO: "lógico",
+    Tipo.CADENA: "cadena", Tipo.CARACTER: "caracter", Tipo.ERROR: "error",
+}
+
+NUMERICOS = frozenset({Tipo.INT, Tipo.REAL, Tipo.LOGICO})
+
+ARITMETICOS = frozenset({
+    TokenType.SUMA, TokenType.RESTA, TokenType.MULTIPLICACION,
+    TokenType.DIVISION, TokenType.MODULO, TokenType.POTENCIA,
+})
+RELACIONALES = frozenset({
+    TokenType.MENOR, TokenType.MENOR_IGUAL, TokenType.MAYOR, TokenType.MAYOR_IGUAL,
+})
+IGUALDAD = frozenset({TokenType.IGUAL, TokenType.DIFERENTE})
+LOGICOS = frozenset({TokenType.AND, TokenType.OR})
+
+
+def tipo_binario(operador: int, izquierda: Tipo, derecha: Tipo) -> Optional[Tipo]:
+    """Tipo del resultado de `izquierda operador derecha`; None si no es válido."""
+    if izquierda == Tipo.ERROR or derecha == Tipo.ERROR:
+        return Tipo.ERROR
+    numericos = izquierda in NUMERICOS and derecha in NUMERICOS
+    if operador in ARITMETICOS:
+        if not numericos:
+            return None
+        if operador == TokenType.MODULO:
+            return Tipo.INT if Tipo.REAL not in (izquierda, derecha) else None
+        return Tipo.REAL if Tipo.REAL in (izquierda, derecha) else Tipo.INT
+    if operador in IGUALDAD:
+        return Tipo.LOGICO if numericos or izquierda == derecha else None
+    if operador in RELACIONALES:
+        return Tipo.LOGICO if numericos else None
+    # && ||
+    return Tipo.LOGICO if numericos else None
+
+
+def tipo_unario(operador: int, operando: Tipo) -> Optional[Tipo]:
+    """Tipo del resultado de `operador operando` (- o !); None si no es válido."""
+    if operando == Tipo.ERROR:
+        return Tipo.ERROR
+    if operando not in NUMERICOS:
+        return None
+    if operador == TokenType.NEGACION:
+        return Tipo.LOGICO
+    return Tipo.REAL if operando == Tipo.REAL else Tipo.INT
+
+
+def asignable(destino: Tipo, valor: Tipo) -> bool:
+    """¿Puede guardarse un valor de tipo `valor` en una variable `destino`?"""
+    if valor == Tipo.ERROR:
+        return True
+    if destino == Tipo.REAL:
+        return valor in NUMERICOS
+    return valor in (Tipo.INT, Tipo.LOGICO)
+
+
+def _dividir(a: Valor, b: Valor) -> Valor:
+    if isinstance(a, float) or isinstance(b, float):
+        return a / b
+    cociente = abs(a) // abs(b)
+    return cociente if (a >= 0) == (b >= 0) else -cociente
+
+
+def _potencia(a: Valor, b: Valor) -> Optional[Valor]:
+    if isinstance(a, float) or isinstance(b, float) or b < 0:
+        resultado = float(a) ** b
+        # Base negativa con exponente fraccionario: no es un número real
+        return None if isinstance(resultado, complex) else resultado
+    if abs(a) > 1 and int(a).bit_length() * b > _MAX_BITS_POTENCIA:
+        return None
+    return int(a) ** int(b)
+
+
+def evaluar_binario(operador: int, a: Valor, b: Valor) -> Optional[Valor]:
+    """Valor de `a operador b` con constantes; None si no se puede plegar."""
+    try:
+        if operador == TokenType.SUMA:
+            return a + b
+        if operador == TokenType.RESTA:
+            return a - b
+        if operador == TokenType.MULTIPLICACION:
+            return a * b
+        if operador == TokenType.DIVISION:
+            return _dividir(a, b)
+        if operador == TokenType.MODULO:
+            return a - b * _dividir(a, b)
+        if operador == TokenType.POTENCIA:
+            return _potencia(a, b)
+        if operador == TokenType.IGUAL:
+            return a == b
+        if operador == TokenType.DIFERENTE:
+            return a != b
+        if operador == TokenType.MENOR:
+            return a < b
+        if operador == TokenType.MENOR_IGUAL:
+            return a <= b
+        if operador == TokenType.MAYOR:
+            return a > b
+        if operador == TokenType.MAYOR_IGUAL:
+            return a >= b
+        if operador == TokenType.AND:
+            return bool(a) and bool(b)
+        if operador == TokenType.OR:
+            return bool(a) or bool(b)
+    except (ZeroDivisionError, OverflowError):
+        return None
+    return None
+
+
+def evaluar_unario(operador: int, a: Valor) -> Optional[Valor]:
+    """Valor de `operador a` con una constante."""
+    if operador == TokenType.NEGACION:
+        return not a
+    return -a if isinstance(a, float) else -int(a)
+
+
+def convertir(valor: Valor, tipo: Tipo) -> Valor:
+    """`valor` con la representación de `tipo` (real → float, lógico → bool, int → int)."""
+    if tipo == Tipo.REAL:
+        return float(valor)
+    if tipo == Tipo.LOGICO:
+        return bool(valor)
+    return int(valor)
+
+
+def formatear_valor(valor: Valor) -> str:
+    """Valor plegado como se muestra en semantic.txt."""
+    if isinstance(valor, bool):
+        return "verdadero" if valor else "falso"
+    return repr(valor)
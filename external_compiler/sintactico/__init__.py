@@ -0,0 +1,7 @@
+# Módulo sintáctico del compilador CAOS
+# Exporta el analizador (Parser) y el AST en arena (Arbol, Nodo).
+
+from .arbol import Arbol, Nodo
+from .parser import ErrorSintactico, Parser
+
+__all__ = ["Arbol", "ErrorSintactico", "Nodo", "Parser"]
@@ -0,0 +1,205 @@
+"""
+arbol.py
+--------
+Árbol sintáctico (AST) del compilador CAOS almacenado en una arena.
+
+Los nodos no son objetos: cada nodo es un entero (su índice) y sus campos
+viven en arreglos paralelos del módulo `array`:
+
+    tipos      array('B')  clase de nodo (valor de Nodo)
+    token      array('i')  índice en el TokenBuffer del token que lo origina
+                           (operador, literal, palabra reservada; -1 si no hay)
+    primeros   array('i')  primer hijo (-1 si no tiene)
+    siguientes array('i')  siguiente hermano (-1 si es el último)
+
+El lexema, la línea y la columna de un nodo se leen del TokenBuffer a
+través de su token: el AST no copia texto.
+
+Los hijos se crean antes que el padre, así que los índices siguen un
+recorrido en postorden: recorrer 0..len(arbol)-1 visita cada nodo después
+de todos sus hijos (un pase lineal sin recursión para análisis de abajo
+hacia arriba) y la raíz es el último nodo.
+
+Uso:
+    arbol = Arbol(tokens)
+    x = arbol.agregar(Nodo.IDENTIFICADOR, 4)
+    uno = arbol.agregar(Nodo.ENTERO, 6)
+    asig = arbol.agregar(Nodo.ASIGNACION, 5, (x, uno))
+    list(arbol.hijos(asig))   → [x, uno]
+"""
+
+from __future__ import annotations
+
+from array import array
+from enum import IntEnum, auto
+from typing import TYPE_CHECKING, Iterator, Sequence
+
+if TYPE_CHECKING:
+    from lexer.token_buffer import TokenBuffer
+
+
+class Nodo(IntEnum):
+    """Clases de nodo del AST (hijos de cada una entre corchetes)."""
+    # ------------------------------------------------------------------
+    # Estructura
+    # ------------------------------------------------------------------
+    PROGRAMA    = auto()  # main          [sentencias...]
+    BLOQUE      = auto()  # 1er token     [sentencias...]
+    ERROR       = auto()  # token del error [] (parte que no se pudo analizar)
+
+    # ------------------------------------------------------------------
+    # Sentencias
+    # ------------------------------------------------------------------
+    DECLARACION = auto()  # int/real/float [identificadores...]
+    ASIGNACION  = auto()  # =             [identificador, expresión]
+    INCREMENTO  = auto()  # ++ / --       [identificador]
+    SI          = auto()  # if            [condición, bloque, bloque else?]
+    MIENTRAS    = auto()  # while         [condición, bloque]
+    HACER       = auto()  # do            [bloque, condición]
+    PARA        = auto()  # for           [inicio, condición, paso, bloque]
+    SEGUN       = auto()  # switch        [expresión, caso..., defecto?]
+    CASO        = auto()  # case          [valor, bloque]
+    DEFECTO     = auto()  # default       [bloque]
+    LEER        = auto()  # cin           [identificador]
+    ESCRIBIR    = auto()  # cout          [expresión]
+    ROMPER      = auto()  # break         []
+    RETORNO     = auto()  # return        [expresión?]
+    VACIO       = auto()  # parte omitida de un for (sin token)
+
+    # ------------------------------------------------------------------
+    # Expresiones
+    # ------------------------------------------------------------------
+    BINARIO       = auto()  # operador    [izquierda, derecha]
+    UNARIO        = auto()  # - / !       [operando]
+    ENTERO        = auto()  # literal entero
+    REAL          = auto()  # literal flotante
+    CADENA        = auto()  # literal "..."
+    CARACTER      = auto()  # literal '.'
+    IDENTIFICADOR = auto()  # nombre de variable
+
+
+# Clases de nodo que son sentencias (para recorrer bloques)
+SENTENCIAS = frozenset({
+    Nodo.DECLARACION, Nodo.ASIGNACION, Nodo.INCREMENTO, Nodo.SI, Nodo.MIENTRAS,
+    Nodo.HACER, Nodo.PARA, Nodo.SEGUN, Nodo.LEER, Nodo.ESCRIBIR, Nodo.ROMPER,
+    Nodo.RETORNO,
+})
+
+
+class Arbol:
+    """
+    Arena de nodos de un AST construido sobre el TokenBuffer `tokens`.
+
+    Uso:
+        len(arbol), arbol.raiz                 → cantidad de nodos, raíz
+        arbol.tipo(n), arbol.hijos(n)          → clase de nodo, índices de hijos
+        arbol.lexema(n), arbol.posicion(n)     → lexema y (línea, columna) del token
+        arbol.formatear()                      → listado indentado para syntax.txt
+    """
+
+    __slots__ = ("tokens", "tipos", "token", "primeros", "siguientes")
+
+    def __init__(self, tokens: "TokenBuffer"):
+        self.tokens     = tokens
+        self.tipos      = array("B")
+        self.token      = array("i")
+        self.primeros   = array("i")
+        self.siguientes = array("i")
+
+    # -- Construcción ---------------------------------------------------------
+
+    def agregar(self, tipo: Nodo, token: int = -1, hijos: Sequence[int] = ()) -> int:
+        """
+        Crea un nodo con los `hijos` (ya creados, en orden) y retorna su
+        índice. Cada nodo puede ser hijo de un solo padre.
+        """
+        n = len(self.tipos)
+        self.tipos.append(tipo)
+        self.token.append(token)
+        self.siguientes.append(-1)
+        if hijos:
+            self.primeros.append(hijos[0])
+            siguientes = self.siguientes
+            for anterior, hijo in zip(hijos, hijos[1:]):
+                siguientes[anterior] = hijo
+        else:
+            self.primeros.append(-1)
+        return n
+
+    # -- Acceso -----------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.tipos)
+
+    @property
+    def raiz(self) -> int:
+        """Índice de la raíz (el último nodo creado; -1 si el árbol está vacío)."""
+        return len(self.tipos) - 1
+
+    def tipo(self, n: int) -> Nodo:
+        return Nodo(self.tipos[n])
+
+    def hijos(self, n: int) -> Iterator[int]:
+        """Índices de los hijos de `n`, en orden."""
+        hijo = self.primeros[n]
+        siguientes = self.siguientes
+        while hijo != -1:
+            yield hijo
+            hijo = siguientes[hijo]
+
+    def lexema(self, n: int) -> str:
+        """Lexema del token del nodo ("" si no tiene)."""
+        i = self.token[n]
+        return self.tokens.valor(i) if i >= 0 else ""
+
+    def posicion(self, n: int) -> tuple[int, int]:
+        """(línea, columna) del token del nodo ((0, 0) si no tiene)."""
+        i = self.token[n]
+        if i < 0:
+            return 0, 0
+        return self.tokens.lineas[i], self.tokens.columnas[i]
+
+    # -- Listado ----------------------------------------------------------------
+
+    def formatear(self) -> str:
+        """
+        Listado en preorden, un nodo por línea, indentado por profundidad:
+
+            PROGRAMA main  (1:1)
+              DECLARACION int  (2:1)
+                IDENTIFICADOR x  (2:5)
+
+        Se recorre con una pila explícita: no depende de la profundidad del
+        árbol.
+        """
+        if not self.tipos:
+            return "(árbol vacío)\n"
+        nombres = {nodo.value: nodo.name for nodo in Nodo}
+        tipos, token = self.tipos, self.token
+        primeros, siguientes = self.primeros, self.siguientes
+        valor, lineas, columnas = self.tokens.valor, self.tokens.lineas, self.tokens.columnas
+
+        lineas_salida: list[str] = []
+        pila = [(self.raiz, 0)]
+        while pila:
+            n, nivel = pila.pop()
+            i = token[n]
+            if i < 0:
+                etiqueta = nombres[tipos[n]]
+            elif tipos[n] == Nodo.BLOQUE:
+                # El token de un bloque es solo su primera sentencia
+                etiqueta = f"{nombres[tipos[n]]}  ({lineas[i]}:{columnas[i]})"
+            else:
+                etiqueta = f"{nombres[tipos[n]]} {valor(i)}  ({lineas[i]}:{columnas[i]})"
+            lineas_salida.append("  " * nivel + etiqueta)
+
+            hijos = []
+            hijo = primeros[n]
+            while hijo != -1:
+                hijos.append(hijo)
+                hijo = siguientes[hijo]
+            pila.extend((hijo, nivel + 1) for hijo in reversed(hijos))
+        return "\n".join(lineas_salida) + "\n"
+
+    def __repr__(self) -> str:
+        return f"Arbol({len(self)} nodos)"
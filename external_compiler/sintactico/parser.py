@@ -0,0 +1,593 @@
+"""
+parser.py
+---------
+Analizador sintáctico del lenguaje CAOS.
+
+Descenso recursivo para las sentencias y precedencia de operadores para las
+expresiones. Lee los códigos de tipo directamente de las columnas del
+TokenBuffer (sin copiarlo ni crear objetos Token) y construye el AST en una
+arena (ver arbol.py).
+
+Gramática (EBNF; `;` sueltos son sentencias vacías, así que "end;" y "};"
+también son válidos):
+
+    programa     → main { sentencia* }
+    sentencia    → declaracion | asignacion ; | if | while | do | for
+                 | switch | cin IDENT ; | cout expresion ;
+                 | break ; | return [expresion] ; | ;
+    declaracion  → (int | real | float) IDENT (, IDENT)* ;
+    asignacion   → IDENT = expresion | IDENT ++ | IDENT --
+    if           → if expresion then sentencia* [else sentencia*] end
+    while        → while expresion { sentencia* }
+    do           → do sentencia* until expresion ;
+    for          → for ( [asignacion] ; [expresion] ; [asignacion] ) { sentencia* }
+    switch       → switch expresion { (case expresion { sentencia* })*
+                                      [default { sentencia* }] }
+
+    expresion    → operandos y operadores, de menor a mayor precedencia:
+                       ||   &&   == != < <= > >=   + -   * / %   - ! (prefijos)   ^
+                   ^ asocia a la derecha y el resto a la izquierda
+                   (-2^2 = -(2^2)); operandos: números, identificadores,
+                   cadenas, caracteres y ( expresion ).
+
+Las expresiones se analizan sin recursión, con una pila de operadores y
+otra de operandos: cada token entra y sale de una pila una sola vez, así que
+el costo es lineal y no hay límite de anidamiento de paréntesis. Las
+sentencias sí son recursivas; los bloques pueden anidarse hasta
+MAX_ANIDAMIENTO niveles (más allá se reporta un error, no un RecursionError).
+
+Recuperación de errores (modo pánico): un error no detiene el análisis.
+Se registra en `errores`, con el formato de errors.txt:
+
+    [SINTACTICO] Se esperaba ';' en línea 7, columna 9 — se encontró 'y'
+
+y se retoma en el punto de sincronización más cercano:
+
+    - dentro de una construcción: una condición mal formada se salta hasta
+      el 'then' / '{' / ';' que la sigue, y un 'then', 'end', '{', '}' o
+      'until' faltante se da por insertado; el resto de la construcción se
+      analiza normalmente (queda un nodo ERROR en su lugar).
+    - entre sentencias: se descartan tokens hasta pasar un ';' o hasta
+      el inicio de otra sentencia (palabra reservada, o identificador en una
+      línea posterior), o hasta un cierre de bloque ('end', 'else', 'until',
+      '}'), que se devuelve al bloque que lo contiene.
+
+Cada error consume al menos un token o cierra un bloque, así que el costo
+sigue siendo lineal aun con la entrada muy dañada. No se repiten errores en
+la misma posición y se deja de analizar tras MAX_ERRORES.
+
+Uso:
+    parser = Parser(tokens)               # tokens: TokenBuffer (con o sin EOF)
+    arbol = parser.analizar()             # AST (parcial si hubo errores)
+    parser.errores                        # mensajes [SINTACTICO] en orden
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from lexer.token_buffer import LEXEMA_FIJO, TokenBuffer
+from lexer.token_types import TokenType
+
+from .arbol import Arbol, Nodo
+
+# Niveles máximos de bloques anidados (if, while, do, for, switch, case)
+MAX_ANIDAMIENTO = 100
+
+# Errores a partir de los cuales se abandona el análisis
+MAX_ERRORES = 100
+
+_EOF = TokenType.EOF
+
+# Precedencia de los operadores binarios (mayor = liga más fuerte)
+_PRECEDENCIA: dict[int, int] = {
+    TokenType.OR: 1,
+    TokenType.AND: 2,
+    TokenType.IGUAL: 3, TokenType.DIFERENTE: 3,
+    TokenType.MENOR: 3, TokenType.MENOR_IGUAL: 3,
+    TokenType.MAYOR: 3, TokenType.MAYOR_IGUAL: 3,
+    TokenType.SUMA: 4, TokenType.RESTA: 4,
+    TokenType.MULTIPLICACION: 5, TokenType.DIVISION: 5, TokenType.MODULO: 5,
+    TokenType.POTENCIA: 7,
+}
+# Operadores prefijos: entre los multiplicativos y la potencia
+_PRECEDENCIA_PREFIJO = 6
+_PREFIJOS = frozenset({TokenType.RESTA, TokenType.NEGACION})
+_DERECHA = frozenset({TokenType.POTENCIA})
+# Marca de "(" en la pila de operadores (nunca se reduce)
+_PARENTESIS = 0
+
+# Token de un operando → clase de nodo
+_OPERANDOS: dict[int, Nodo] = {
+    TokenType.INT_NUM: Nodo.ENTERO,
+    TokenType.FLOAT_NUM: Nodo.REAL,
+    TokenType.STRING: Nodo.CADENA,
+    TokenType.CHAR: Nodo.CARACTER,
+    TokenType.IDENTIFIER: Nodo.IDENTIFICADOR,
+}
+
+# Descripción en los mensajes de los tokens sin lexema fijo
+_DESCRIPCION: dict[int, str] = {
+    TokenType.IDENTIFIER: "un identificador",
+    TokenType.INT_NUM: "un número entero",
+    TokenType.FLOAT_NUM: "un número flotante",
+    _EOF: "fin de archivo",
+}
+
+# Terminadores de cada lista de sentencias
+_FIN_PROGRAMA = frozenset({TokenType.LLAVE_DER})
+_FIN_ENTONCES = frozenset({TokenType.KW_ELSE, TokenType.KW_END})
+_FIN_SINO     = frozenset({TokenType.KW_END})
+_FIN_LLAVES   = frozenset({TokenType.LLAVE_DER})
+_FIN_HACER    = frozenset({TokenType.KW_UNTIL})
+
+# Cierres de bloque: una lista de sentencias termina en cualquiera de ellos
+# (si no es el suyo, el bloque que lo contiene reporta lo que faltó)
+_CIERRES = frozenset({
+    TokenType.KW_END, TokenType.KW_ELSE, TokenType.KW_UNTIL, TokenType.LLAVE_DER,
+})
+# Palabras reservadas que inician una sentencia (puntos de sincronización)
+_INICIO_SENTENCIA = frozenset({
+    TokenType.KW_INT, TokenType.KW_REAL, TokenType.KW_FLOAT, TokenType.KW_IF,
+    TokenType.KW_WHILE, TokenType.KW_DO, TokenType.KW_FOR, TokenType.KW_SWITCH,
+    TokenType.KW_CIN, TokenType.KW_COUT, TokenType.KW_BREAK, TokenType.KW_RETURN,
+})
+_PUNTO_COMA    = frozenset({TokenType.PUNTO_COMA})
+_HASTA_THEN    = frozenset({TokenType.KW_THEN, TokenType.PUNTO_COMA})
+_HASTA_LLAVE   = frozenset({TokenType.LLAVE_IZQ, TokenType.PUNTO_COMA})
+_HASTA_CASO    = frozenset({TokenType.KW_CASE, TokenType.KW_DEFAULT})
+
+
+class ErrorSintactico(Exception):
+    """Error de sintaxis; str(error) es el mensaje de errors.txt."""
+
+    def __init__(self, mensaje: str, linea: int, columna: int):
+        super().__init__(mensaje)
+        self.linea = linea
+        self.columna = columna
+
+
+class _DemasiadosErrores(Exception):
+    """Se alcanzó MAX_ERRORES: termina el análisis."""
+
+
+def _describir(codigo: int) -> str:
+    """Descripción de un tipo de token para "Se esperaba ..."."""
+    fijo = LEXEMA_FIJO[codigo]
+    return f"'{fijo}'" if fijo else _DESCRIPCION.get(codigo, TokenType(codigo).name)
+
+
+class Parser:
+    """
+    Analizador sintáctico de un programa CAOS ya tokenizado.
+
+    Parámetros:
+        tokens (TokenBuffer): tokens del programa, sin tokens ERROR. El EOF
+                              final es opcional (el fin del buffer cuenta
+                              como fin de archivo).
+    """
+
+    def __init__(self, tokens: TokenBuffer):
+        self.tokens = tokens
+        self.tipos = tokens.tipos
+        self.n = len(tokens)
+        self.pos = 0
+        self.arbol = Arbol(tokens)
+        self.errores: list[str] = []
+        self._profundidad = 0
+        self._ultimo_error: Optional[tuple[int, int]] = None
+
+        # Token inicial de una sentencia → método que la analiza
+        self._sentencias_por_token: dict[int, Callable[[], int]] = {
+            TokenType.KW_INT: self._declaracion,
+            TokenType.KW_REAL: self._declaracion,
+            TokenType.KW_FLOAT: self._declaracion,
+            TokenType.IDENTIFIER: self._asignacion,
+            TokenType.KW_IF: self._si,
+            TokenType.KW_WHILE: self._mientras,
+            TokenType.KW_DO: self._hacer,
+            TokenType.KW_FOR: self._para,
+            TokenType.KW_SWITCH: self._segun,
+            TokenType.KW_CIN: self._leer,
+            TokenType.KW_COUT: self._escribir,
+            TokenType.KW_BREAK: self._romper,
+            TokenType.KW_RETURN: self._retorno,
+        }
+
+    def analizar(self) -> Arbol:
+        """
+        Analiza el programa completo y retorna su AST (raíz PROGRAMA). Los
+        errores quedan en `errores`; si hay alguno el árbol es parcial (con
+        nodos ERROR) y la arena puede tener nodos sin padre.
+        """
+        sentencias: list[int] = []
+        inicio = -1
+        try:
+            inicio = self._exigir(TokenType.KW_MAIN)
+            self._exigir(TokenType.LLAVE_IZQ)
+            while True:
+                sentencias.extend(self._sentencias(_FIN_PROGRAMA))
+                actual = self._actual()
+                if actual == _EOF:
+                    self._exigir(TokenType.LLAVE_DER)
+                    break
+                # '}' final (el fin del buffer también cuenta como EOF), '}'
+                # antes del final o un cierre sin bloque que cerrar
+                if actual == TokenType.LLAVE_DER:
+                    siguiente = self.pos + 1
+                    if siguiente >= self.n or self.tipos[siguiente] == _EOF:
+                        self.pos = siguiente
+                        break
+                    mensaje = "Se esperaba fin de archivo después de '}'"
+                else:
+                    mensaje = "Se esperaba una sentencia"
+                self._registrar(self._error(mensaje, en_token=True))
+                self.pos += 1
+                if self.pos < self.n and self.tipos[self.pos] == _EOF:
+                    break
+        except _DemasiadosErrores:
+            pass
+        self.arbol.agregar(Nodo.PROGRAMA, inicio, sentencias)
+        return self.arbol
+
+    # -- Tokens -----------------------------------------------------------------
+
+    def _actual(self) -> int:
+        return self.tipos[self.pos] if self.pos < self.n else _EOF
+
+    def _esperar(self, codigo: int, descripcion: Optional[str] = None) -> int:
+        """Consume un token de tipo `codigo` y retorna su índice."""
+        if self._actual() != codigo:
+            raise self._error(f"Se esperaba {descripcion or _describir(codigo)}")
+        self.pos += 1
+        return self.pos - 1
+
+    def _exigir(self, codigo: int, descripcion: Optional[str] = None) -> int:
+        """
+        Como _esperar, pero si falta el token registra el error, no consume
+        nada (lo da por insertado) y retorna -1.
+        """
+        if self._actual() != codigo:
+            self._registrar(self._error(f"Se esperaba {descripcion or _describir(codigo)}"))
+            return -1
+        self.pos += 1
+        return self.pos - 1
+
+    def _registrar(self, error: ErrorSintactico) -> None:
+        """Agrega el error a `errores` (salvo si repite la posición del anterior)."""
+        posicion = (error.linea, error.columna)
+        if posicion == self._ultimo_error:
+            return
+        self._ultimo_error = posicion
+        self.errores.append(str(error))
+        if len(self.errores) >= MAX_ERRORES:
+            self.errores.append(
+                f"[SINTACTICO] Demasiados errores ({MAX_ERRORES}): se detiene el análisis "
+                f"en línea {error.linea}, columna {error.columna}"
+            )
+            raise _DemasiadosErrores()
+
+    def _saltar(self, parada: frozenset[int], linea: int) -> None:
+        """
+        Descarta tokens hasta uno de `parada`, un cierre de bloque, el inicio
+        de una sentencia (un identificador cuenta si está después de `linea`)
+        o EOF. No consume el token de parada.
+        """
+        tipos, lineas, n = self.tipos, self.tokens.lineas, self.n
+        pos = self.pos
+        while pos < n:
+            actual = tipos[pos]
+            if (
+                actual in parada or actual in _CIERRES or actual in _INICIO_SENTENCIA
+                or actual == _EOF
+                or (actual == TokenType.IDENTIFIER and lineas[pos] > linea)
+            ):
+                break
+            pos += 1
+        self.pos = pos
+
+    def _recuperar(self, error: ErrorSintactico, parada: frozenset[int]) -> int:
+        """Registra `error`, salta hasta `parada` y retorna un nodo ERROR."""
+        self._registrar(error)
+        self._saltar(parada, error.linea)
+        return self.arbol.agregar(Nodo.ERROR, min(self.pos, self.n - 1))
+
+    def _error(self, mensaje: str, en_token: bool = False) -> ErrorSintactico:
+        """
+        Error en la posición actual. Si falta algo al final de una línea
+        (el token encontrado está en otra línea o es el fin de archivo) se
+        ubica justo después del último token, salvo con `en_token`.
+        """
+        tokens, pos = self.tokens, self.pos
+        actual = self._actual()
+        encontrado = "fin de archivo" if actual == _EOF else f"'{tokens.valor(pos)}'"
+        anterior = pos - 1
+        if not en_token and anterior >= 0 and (
+            actual == _EOF or tokens.lineas[pos] > tokens.lineas[anterior]
+        ):
+            linea = tokens.lineas[anterior]
+            columna = tokens.columnas[anterior] + len(tokens.valor(anterior))
+        elif pos < self.n:
+            linea, columna = tokens.lineas[pos], tokens.columnas[pos]
+        else:
+            linea, columna = 1, 1
+        return ErrorSintactico(
+            f"[SINTACTICO] {mensaje} en línea {linea}, columna {columna} "
+            f"— se encontró {encontrado}",
+            linea,
+            columna,
+        )
+
+    # -- Sentencias -------------------------------------------------------------
+
+    def _sentencias(self, fin: frozenset[int]) -> list[int]:
+        """
+        Sentencias hasta un token de `fin`, cualquier otro cierre de bloque
+        (que no se consumen) o EOF. Una sentencia con error se descarta y se
+        sigue con la siguiente (ver _sincronizar).
+        """
+        sentencias: list[int] = []
+        por_token = self._sentencias_por_token
+        while True:
+            actual = self._actual()
+            if actual in fin or actual in _CIERRES or actual == _EOF:
+                return sentencias
+            if actual == TokenType.PUNTO_COMA:
+                self.pos += 1
+                continue
+            analizar = por_token.get(actual)
+            try:
+                if analizar is None:
+                    raise self._error("Se esperaba una sentencia", en_token=True)
+                sentencias.append(analizar())
+            except ErrorSintactico as error:
+                self._sincronizar(error, consumir=analizar is None)
+
+    def _sincronizar(self, error: ErrorSintactico, consumir: bool) -> None:
+        """
+        Registra el error de una sentencia y salta hasta pasar el ';' que la
+        termina o hasta el inicio de la siguiente. Con `consumir` descarta
+        primero el token actual (no inicia ninguna sentencia).
+        """
+        self._registrar(error)
+        if consumir:
+            self.pos += 1
+        self._saltar(_PUNTO_COMA, error.linea)
+        if self._actual() == TokenType.PUNTO_COMA:
+            self.pos += 1
+
+    def _condicion(self, parada: frozenset[int]) -> int:
+        """Expresión de una construcción; si falla se salta hasta `parada`."""
+        try:
+            return self._expresion()
+        except ErrorSintactico as error:
+            return self._recuperar(error, parada)
+
+    def _bloque(self, fin: frozenset[int]) -> int:
+        """Nodo BLOQUE con las sentencias hasta `fin`."""
+        if self._profundidad >= MAX_ANIDAMIENTO:
+            # No hay de dónde retomar sin volver a anidar: se abandona el análisis
+            self._registrar(self._error(
+                f"Demasiados bloques anidados (máximo {MAX_ANIDAMIENTO})", en_token=True
+            ))
+            raise _DemasiadosErrores()
+        self._profundidad += 1
+        inicio = self.pos if self.pos < self.n else -1
+        sentencias = self._sentencias(fin)
+        self._profundidad -= 1
+        return self.arbol.agregar(Nodo.BLOQUE, inicio, sentencias)
+
+    def _bloque_llaves(self) -> int:
+        """{ sentencia* } como nodo BLOQUE."""
+        self._exigir(TokenType.LLAVE_IZQ)
+        bloque = self._bloque(_FIN_LLAVES)
+        self._exigir(TokenType.LLAVE_DER)
+        return bloque
+
+    def _identificador(self) -> int:
+        return self.arbol.agregar(Nodo.IDENTIFICADOR, self._esperar(TokenType.IDENTIFIER))
+
+    def _declaracion(self) -> int:
+        tipo = self.pos
+        self.pos += 1
+        nombres = [self._identificador()]
+        while self._actual() == TokenType.COMA:
+            self.pos += 1
+            nombres.append(self._identificador())
+        self._esperar(TokenType.PUNTO_COMA)
+        return self.arbol.agregar(Nodo.DECLARACION, tipo, nombres)
+
+    def _asignacion(self) -> int:
+        asignacion = self._asignacion_simple()
+        self._esperar(TokenType.PUNTO_COMA)
+        return asignacion
+
+    def _asignacion_simple(self) -> int:
+        """IDENT = expresion | IDENT ++ | IDENT -- (sin el ';')."""
+        nombre = self._identificador()
+        operador = self.pos
+        actual = self._actual()
+        if actual == TokenType.ASIGNACION:
+            self.pos += 1
+            return self.arbol.agregar(Nodo.ASIGNACION, operador, (nombre, self._expresion()))
+        if actual in (TokenType.INCREMENTO, TokenType.DECREMENTO):
+            self.pos += 1
+            return self.arbol.agregar(Nodo.INCREMENTO, operador, (nombre,))
+        raise self._error("Se esperaba '=', '++' o '--'")
+
+    def _si(self) -> int:
+        inicio = self.pos
+        self.pos += 1
+        hijos = [self._condicion(_HASTA_THEN)]
+        self._exigir(TokenType.KW_THEN)
+        hijos.append(self._bloque(_FIN_ENTONCES))
+        if self._actual() == TokenType.KW_ELSE:
+            self.pos += 1
+            hijos.append(self._bloque(_FIN_SINO))
+        self._exigir(TokenType.KW_END)
+        return self.arbol.agregar(Nodo.SI, inicio, hijos)
+
+    def _mientras(self) -> int:
+        inicio = self.pos
+        self.pos += 1
+        condicion = self._condicion(_HASTA_LLAVE)
+        return self.arbol.agregar(Nodo.MIENTRAS, inicio, (condicion, self._bloque_llaves()))
+
+    def _hacer(self) -> int:
+        inicio = self.pos
+        self.pos += 1
+        cuerpo = self._bloque(_FIN_HACER)
+        self._exigir(TokenType.KW_UNTIL)
+        condicion = self._condicion(_PUNTO_COMA)
+        self._exigir(TokenType.PUNTO_COMA)
+        return self.arbol.agregar(Nodo.HACER, inicio, (cuerpo, condicion))
+
+    def _para(self) -> int:
+        inicio = self.pos
+        self.pos += 1
+        try:
+            self._esperar(TokenType.PAR_IZQ)
+            hijos = [self._parte_para(TokenType.IDENTIFIER, self._asignacion_simple)]
+            self._esperar(TokenType.PUNTO_COMA)
+            hijos.append(self._parte_para(None, self._expresion))
+            self._esperar(TokenType.PUNTO_COMA)
+            hijos.append(self._parte_para(TokenType.IDENTIFIER, self._asignacion_simple))
+            self._esperar(TokenType.PAR_DER)
+        except ErrorSintactico as error:
+            # Cabecera dañada: un nodo ERROR en su lugar y se sigue con el cuerpo
+            hijos = [self._recuperar(error, frozenset({TokenType.LLAVE_IZQ}))]
+        hijos.append(self._bloque_llaves())
+        return self.arbol.agregar(Nodo.PARA, inicio, hijos)
+
+    def _parte_para(self, inicial: Optional[int], analizar: Callable[[], int]) -> int:
+        """Parte de la cabecera de un for; VACIO si se omitió."""
+        actual = self._actual()
+        if actual in (TokenType.PUNTO_COMA, TokenType.PAR_DER) or (
+            inicial is not None and actual != inicial
+        ):
+            return self.arbol.agregar(Nodo.VACIO)
+        return analizar()
+
+    def _segun(self) -> int:
+        inicio = self.pos
+        self.pos += 1
+        hijos = [self._condicion(_HASTA_LLAVE)]
+        self._exigir(TokenType.LLAVE_IZQ)
+        while True:
+            actual = self._actual()
+            if actual == TokenType.PUNTO_COMA:
+                self.pos += 1
+            elif actual == TokenType.KW_CASE:
+                caso = self.pos
+                self.pos += 1
+                valor = self._condicion(_HASTA_LLAVE)
+                hijos.append(self.arbol.agregar(Nodo.CASO, caso, (valor, self._bloque_llaves())))
+            elif actual == TokenType.KW_DEFAULT:
+                defecto = self.pos
+                self.pos += 1
+                hijos.append(self.arbol.agregar(Nodo.DEFECTO, defecto, (self._bloque_llaves(),)))
+                break
+            elif actual in _CIERRES or actual == _EOF:
+                break
+            else:
+                # Algo que no es un caso: se descarta hasta el siguiente
+                error = self._error("Se esperaba 'case', 'default' o '}'", en_token=True)
+                self.pos += 1
+                self._recuperar(error, _HASTA_CASO)
+        self._exigir(TokenType.LLAVE_DER, "'case', 'default' o '}'")
+        return self.arbol.agregar(Nodo.SEGUN, inicio, hijos)
+
+    def _leer(self) -> int:
+        inicio = self.pos
+        self.pos += 1
+        nombre = self._identificador()
+        self._esperar(TokenType.PUNTO_COMA)
+        return self.arbol.agregar(Nodo.LEER, inicio, (nombre,))
+
+    def _escribir(self) -> int:
+        inicio = self.pos
+        self.pos += 1
+        valor = self._expresion()
+        self._esperar(TokenType.PUNTO_COMA)
+        return self.arbol.agregar(Nodo.ESCRIBIR, inicio, (valor,))
+
+    def _romper(self) -> int:
+        inicio = self.pos
+        self.pos += 1
+        self._esperar(TokenType.PUNTO_COMA)
+        return self.arbol.agregar(Nodo.ROMPER, inicio)
+
+    def _retorno(self) -> int:
+        inicio = self.pos
+        self.pos += 1
+        hijos = [] if self._actual() == TokenType.PUNTO_COMA else [self._expresion()]
+        self._esperar(TokenType.PUNTO_COMA)
+        return self.arbol.agregar(Nodo.RETORNO, inicio, hijos)
+
+    # -- Expresiones ------------------------------------------------------------
+
+    def _expresion(self) -> int:
+        """
+        Expresión por precedencia de operadores, sin recursión. Termina en el
+        primer token que no puede continuarla (un ')' sin '(' abierto en esta
+        expresión también la termina: es de la sentencia que la contiene).
+        """
+        tipos, n, pos = self.tipos, self.n, self.pos
+        agregar = self.arbol.agregar
+        operandos: list[int] = []
+        operadores: list[tuple[int, int]] = []  # (precedencia, token)
+        abiertos = 0
+
+        while True:
+            # Prefijos y paréntesis que abren, luego el operando
+            actual = tipos[pos] if pos < n else _EOF
+            while actual in _PREFIJOS or actual == TokenType.PAR_IZQ:
+                if actual == TokenType.PAR_IZQ:
+                    operadores.append((_PARENTESIS, pos))
+                    abiertos += 1
+                else:
+                    operadores.append((_PRECEDENCIA_PREFIJO, pos))
+                pos += 1
+                actual = tipos[pos] if pos < n else _EOF
+            nodo = _OPERANDOS.get(actual)
+            if nodo is None:
+                self.pos = pos
+                raise self._error("Se esperaba una expresión", en_token=actual != _EOF)
+            operandos.append(agregar(nodo, pos))
+            pos += 1
+
+            # Paréntesis que cierran
+            actual = tipos[pos] if pos < n else _EOF
+            while actual == TokenType.PAR_DER and abiertos:
+                while operadores[-1][0] != _PARENTESIS:
+                    self._reducir(operadores, operandos)
+                operadores.pop()
+                abiertos -= 1
+                pos += 1
+                actual = tipos[pos] if pos < n else _EOF
+
+            # Operador binario: antes se reducen los de mayor precedencia
+            precedencia = _PRECEDENCIA.get(actual)
+            if precedencia is None:
+                break
+            minima = precedencia + 1 if actual in _DERECHA else precedencia
+            while operadores and operadores[-1][0] >= minima:
+                self._reducir(operadores, operandos)
+            operadores.append((precedencia, pos))
+            pos += 1
+
+        self.pos = pos
+        if abiertos:
+            raise self._error("Se esperaba ')'")
+        while operadores:
+            self._reducir(operadores, operandos)
+        return operandos[0]
+
+    def _reducir(self, operadores: list[tuple[int, int]], operandos: list[int]) -> None:
+        """Aplica el operador del tope de la pila a sus operandos."""
+        precedencia, token = operadores.pop()
+        if precedencia == _PRECEDENCIA_PREFIJO:
+            operandos[-1] = self.arbol.agregar(Nodo.UNARIO, token, (operandos[-1],))
+        else:
+            derecha = operandos.pop()
+            operandos[-1] = self.arbol.agregar(Nodo.BINARIO, token, (operandos[-1], derecha))
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Tamaño máximo por defecto de la cache (bytes estimados de lo guardado)
+MAX_BYTES = 64 * 1024 * 1024
+
+# Clave de los artefactos intermedios de un fuente dentro de la cache
+_ARTEFACTOS = "artefactos"
+
+
+def huella(contenido: bytes, version: str) -> str:
+    """Hash del contenido del fuente y de la versión del compilador."""
+    h = hashlib.blake2b(version.encode("utf-8"), digest_size=20)
+    h.update(b"\0")
+    h.update(contenido)
+    return h.hexdigest()
+
+
+def tamano(valor: Any, _vistos: Optional[set[int]] = None) -> int:
+    """
+    Bytes aproximados de `valor` y de todo lo que referencia (str, arreglos,
+    contenedores, dataclasses y objetos con __slots__ como TokenBuffer).
+    Cada objeto se cuenta una vez.
+    """
+    vistos = set() if _vistos is None else _vistos
+    if id(valor) in vistos:
+        return 0
+    vistos.add(id(valor))
+    total = sys.getsizeof(valor)
+    if isinstance(valor, (str, bytes, bytearray, int, float, bool, type(None))):
+        return total
+    if isinstance(valor, dict):
+        return total + sum(
+            tamano(k, vistos) + tamano(v, vistos) for k, v in valor.items()
+        )
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return total + sum(tamano(v, vistos) for v in valor)
+    if hasattr(valor, "__dict__"):
+        total += tamano(vars(valor), vistos)
+    for nombre in getattr(type(valor), "__slots__", ()):
+        total += tamano(getattr(valor, nombre, None), vistos)
+    return total
+
+
+class CompileCache:
+    """
+    Resultados de compilación por huella del fuente (contenido + versión del
+    compilador, ver huella()) y fase, con desalojo LRU acotado en memoria.
+
+    Guarda dos clases de entradas:
+      - resultado(h, fase): el CompilerResult de compilar ese fuente hasta
+        esa fase; pedir de nuevo la misma fase sobre el mismo archivo no
+        vuelve a compilar.
+      - artefactos(h): lo que Compilacion.artefactos() dejó de la última
+        compilación de ese fuente (por ahora el TokenBuffer, "tokens"), con
+        los nombres de los parámetros de compilar(): una fase posterior sobre
+        el mismo fuente retoma desde ahí sin volver a tokenizar.
+
+    Cada entrada cuenta su tamaño estimado (tamano()); al pasar de
+    `max_bytes` se desalojan las usadas hace más tiempo. Una entrada mayor
+    que `max_bytes` no se guarda. Puede usarse desde varios hilos.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entradas: OrderedDict[tuple[str, str], tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    @property
+    def bytes(self) -> int:
+        """Tamaño estimado de todo lo guardado."""
+        return self._bytes
+
+    def resultado(self, h: str, fase: str):
+        """CompilerResult guardado para (h, fase), o None."""
+        return self._obtener((h, fase))
+
+    def guardar_resultado(self, h: str, fase: str, resultado) -> None:
+        self._guardar((h, fase), resultado)
+
+    def artefactos(self, h: str) -> dict[str, Any]:
+        """Artefactos intermedios guardados para `h` ({} si no hay)."""
+        return dict(self._obtener((h, _ARTEFACTOS)) or {})
+
+    def guardar_artefactos(self, h: str, artefactos: dict[str, Any]) -> None:
+        """Agrega `artefactos` a los ya guardados para `h`."""
+        if not artefactos:
+            return
+        self._guardar((h, _ARTEFACTOS), {**self.artefactos(h), **artefactos})
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def _obtener(self, clave: tuple[str, str]):
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            self._entradas.move_to_end(clave)
+            return entrada[0]
+
+    def _guardar(self, clave: tuple[str, str], valor: Any) -> None:
+        # El tamaño se estima fuera del lock: puede recorrer objetos grandes
+        peso = tamano(valor)
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+            if peso > self.max_bytes:
+                return
+            self._entradas[clave] = (valor, peso)
+            self._bytes += peso
+            while self._bytes > self.max_bytes:
+                _, (_, liberado) = self._entradas.popitem(last=False)
+                self._bytes -= liberado
@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import importlib.util
+import json
+import queue
 import subprocess
 import sys
-from dataclasses import dataclass, field
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Optional
+from types import ModuleType
+from typing import TYPE_CHECKING, Optional
+
+from core.compile_cache import MAX_BYTES, CompileCache, huella
+
+if TYPE_CHECKING:
+    from core.token_cache import TokenCache
 
 # Rutas base (relativas al directorio del IDE)
 
@@ -20,6 +33,13 @@ _OUTPUTS_DIR = _IDE_DIR / "outputs"
 # Intérprete Python a usar (el mismo que está ejecutando el IDE)
 _PYTHON = sys.executable
 
+# Formas de invocar el compilador (parámetro `backend` de CompilerRunner)
+BACKENDS = ("auto", "inprocess", "subprocess", "worker")
+
+# Paquetes del compilador (junto a compiler_stub.py) que forman parte de su
+# versión en la cache de compilación
+_PAQUETES_COMPILADOR = ("lexer", "sintactico", "semantico", "intermedio")
+
 
 # Mapa archivo-de-salida → clave de panel
 
@@ -35,6 +55,16 @@ OUTPUT_FILE_MAP: dict[str, str] = {
     "exec.txt": "ejecucion",
 }
 
+# Clave de "salidas" en el documento JSON del compilador → clave de panel
+DOCUMENT_OUTPUT_MAP: dict[str, str] = {
+    "lexico": "lexico",
+    "sintactico": "sintactico",
+    "semantico": "semantico",
+    "intermedio": "intermedio",
+    "simbolos": "simbolos",
+    "ejecutar": "ejecucion",
+}
+
 # Prefijos reconocidos dentro de errors.txt para clasificar por fase
 # (el compilador stub puede incluir líneas como "[LEXICO] Error: ...")
 _PHASE_KEYWORDS: dict[str, str] = {
@@ -64,6 +94,25 @@ class CompilerResult:
     outputs: dict[str, str] = field(default_factory=dict)
     errors_by_phase: dict[str, str] = field(default_factory=dict)
     failed_phase: Optional[str] = None
+    # Errores con posición: {"fase", "linea", "columna", "mensaje"}
+    # (vacío si el compilador solo produjo errors.txt)
+    errors: list[dict] = field(default_factory=list)
+    # Métricas por fase: {"fase", "segundos", "cpu_segundos", "memoria_pico",
+    # "tokens", "bytes"} (vacío si el compilador no las reporta)
+    metrics: list[dict] = field(default_factory=list)
+    # Tabla de símbolos: {"nombre", "tipo", "ambito", "nivel", "linea",
+    # "columna", "usos"} por variable declarada (vacía si no corrió el
+    # semántico o el compilador solo produjo symbols.txt)
+    symbols: list[dict] = field(default_factory=list)
+    # True si salió de la cache de CompilerRunner sin volver a compilar
+    # (outputs, errores y métricas son los de la compilación original)
+    cached: bool = False
+
+
+def _decodificar(contenido: bytes) -> str:
+    """Texto de un fuente leído en bytes, como lo lee open() en modo texto."""
+    texto = contenido.decode("utf-8", errors="replace")
+    return texto.replace("\r\n", "\n").replace("\r", "\n")
 
 
 # CompilerRunner
@@ -78,6 +127,48 @@ class CompilerRunner:
     compiler_path : Path al script del compilador (por defecto: compiler_stub.py).
     outputs_dir   : Directorio donde el compilador escribe sus archivos de salida.
     timeout       : Segundos máximos de espera antes de matar el proceso.
+    backend       : Cómo se invoca el compilador:
+                      "inprocess"  → importa compiler_stub una sola vez y llama
+                                     a compilar() en este proceso; salidas y
+                                     errores se arman en memoria (sin disco).
+                      "subprocess" → lanza `python compiler_path ... --format json`
+                                     y lee el documento JSON de su stdout; si
+                                     no lo hay (compilador externo), lee los
+                                     archivos de outputs_dir.
+                      "worker"     → mantiene un proceso `compiler_path --serve`
+                                     abierto y le envía cada compilación por
+                                     stdin; se reinicia si termina o se cuelga.
+                                     Aísla al IDE de fallos del compilador sin
+                                     pagar el arranque de Python en cada fase.
+                      "auto"       → "inprocess" si compiler_path es un script
+                                     Python con compilar(); si no, "subprocess".
+                    En modo "inprocess" no se aplica `timeout`: la llamada no se
+                    puede interrumpir.
+    token_cache   : TokenCache (core/token_cache.py) compartido con el resaltado
+                    de sintaxis. En modo "inprocess", si el archivo tiene el
+                    mismo texto que el editor se compila con sus tokens sin
+                    volver a tokenizar, y si no, los tokens del archivo quedan
+                    en la cache. Los otros backends no pueden compartirlo.
+    measure_memory: Pedir al compilador la memoria pico de cada fase
+                    (tracemalloc; hace la compilación más lenta). El resto de
+                    las métricas (tiempos, tokens, bytes) llega siempre en
+                    CompilerResult.metrics.
+    cache_bytes   : Tamaño máximo de la cache de compilación (0 = sin cache).
+                    run() guarda cada resultado por huella del archivo
+                    (contenido + versión del compilador: tamaño y fecha de
+                    sus módulos .py) y fase: compilar de nuevo la misma fase
+                    de un archivo sin cambios lo retorna sin invocar al
+                    compilador (con cached=True). El archivo se lee una vez
+                    y se compila ese mismo contenido (salvo en modo
+                    "subprocess", que no guarda el resultado si el archivo
+                    cambió durante la compilación). En modo
+                    "inprocess" guarda también los resultados intermedios
+                    (Compilacion.artefactos(), p. ej. los tokens) y otra fase
+                    del mismo fuente retoma desde ellos. Desalojo LRU.
+
+    run() es bloqueante y puede llamarse desde un hilo secundario (el IDE
+    compila en segundo plano); cancel() se llama desde otro hilo para abortar
+    la compilación en curso. Un mismo runner atiende una compilación a la vez.
     """
 
     def __init__(
@@ -85,10 +176,28 @@ class CompilerRunner:
         compiler_path: Path = _COMPILER_STUB,
         outputs_dir: Path = _OUTPUTS_DIR,
         timeout: int = 30,
+        backend: str = "auto",
+        token_cache: Optional[TokenCache] = None,
+        measure_memory: bool = False,
+        cache_bytes: int = MAX_BYTES,
     ):
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Backend desconocido: {backend!r}. Opciones: {', '.join(BACKENDS)}"
+            )
         self.compiler_path = Path(compiler_path)
         self.outputs_dir = Path(outputs_dir)
         self.timeout = timeout
+        self.backend = backend
+        self.token_cache = token_cache
+        self.measure_memory = measure_memory
+        self.cache = CompileCache(cache_bytes) if cache_bytes > 0 else None
+        self._compiler_module: Optional[ModuleType] = None
+        # (firma del script, versión) de la última _compiler_version()
+        self._version: Optional[tuple[str, str]] = None
+        self._worker: Optional[_CompilerWorker] = None
+        self._proc: Optional[subprocess.Popen] = None  # subproceso en curso
+        self._cancelled = threading.Event()
         self.outputs_dir.mkdir(parents=True, exist_ok=True)
 
         # Asegurar que el directorio de salida exista antes de lanzar
@@ -98,24 +207,372 @@ class CompilerRunner:
     def run(self, source_file: str, phase: str = "all") -> CompilerResult:
         """
         Ejecuta el compilador sobre `source_file` y retorna un `CompilerResult`.
+        Si se cancela con cancel(), retorna un resultado con código -4.
         """
+        self._cancelled.clear()
+        target = phase if phase and phase != "all" else "ejecutar"
+        # Con cache, el archivo se lee una sola vez: la huella y la compilación
+        # (en proceso o en el worker) usan los mismos bytes aunque se vuelva a
+        # guardar mientras tanto
+        key = texto = firma = None
+        leido = self._read_source(source_file) if self.cache is not None else None
+        if leido is not None:
+            contenido, firma = leido
+            key = self._source_key(contenido)
+            texto = _decodificar(contenido)
+        if key is not None:
+            cached = self.cache.resultado(key, target)
+            if cached is not None:
+                return replace(cached, cached=True)
+
+        result = self._run(source_file, phase, key, texto)
+        # Solo se guardan resultados del compilador (no timeouts, cancelaciones
+        # ni errores internos) y si el archivo no cambió mientras tanto (el
+        # subproceso lo vuelve a leer por su cuenta)
+        if (
+            key is not None
+            and result.returncode >= 0
+            and not self._cancelled.is_set()
+            and self._file_signature(source_file) == firma
+        ):
+            self.cache.guardar_resultado(key, target, result)
+        return result
+
+    def _run(
+        self, source_file: str, phase: str, key: Optional[str], texto: Optional[str] = None
+    ) -> CompilerResult:
+        """
+        run() sin la consulta a la cache de resultados. Con `texto` (el
+        contenido ya leído del archivo) los backends en proceso y worker
+        compilan ese texto en vez de volver a leer `source_file`.
+        """
+        if self.backend == "worker":
+            return self._run_worker(source_file, phase, texto)
+        if self.backend != "subprocess":
+            try:
+                module = self._load_compiler_module()
+            except Exception:  # noqa: BLE001
+                # Solo en modo "inprocess": no hay otro backend al que caer
+                return self._internal_error_result()
+            if module is not None:
+                return self._run_inprocess(module, source_file, phase, key, texto)
+
         cmd = self._build_command(source_file, phase)
         proc_result = self._execute(cmd)
-        outputs = self._read_output_files()
-        errors_by_phase = self._parse_errors()
-        failed_phase = self._detect_failed_phase(
-            proc_result.returncode, errors_by_phase
+        if self._cancelled.is_set():
+            return self._cancelled_result()
+        document = self._parse_document(proc_result.stdout or "")
+        if document is not None:
+            return self._result_from_document(document, stderr=proc_result.stderr or "")
+        return self._build_result(
+            proc_result.returncode,
+            self._read_output_files(),
+            stdout=proc_result.stdout or "",
+            stderr=proc_result.stderr or "",
+        )
+
+    def cancel(self):
+        """
+        Aborta la compilación en curso (llamado desde otro hilo que run()).
+
+        Con los backends "subprocess" y "worker" el proceso del compilador se
+        mata y run() retorna de inmediato; el worker se relanza en la
+        siguiente compilación. En modo "inprocess" la llamada a compilar() no
+        se puede interrumpir: run() termina normalmente y quien la lanzó debe
+        descartar el resultado.
+        """
+        self._cancelled.set()
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def close(self):
+        """Termina el proceso worker, si hay uno abierto."""
+        if self._worker is not None:
+            self._worker.stop()
+
+    @staticmethod
+    def _file_signature(source_file: str) -> Optional[tuple[int, int]]:
+        """(tamaño, fecha de modificación) del archivo, o None si no existe."""
+        try:
+            stat = Path(source_file).stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _read_source(self, source_file: str) -> Optional[tuple[bytes, tuple[int, int]]]:
+        """(contenido, firma) del archivo fuente, o None si no se puede leer."""
+        firma = self._file_signature(source_file)
+        try:
+            contenido = Path(source_file).read_bytes()
+        except OSError:
+            return None
+        return contenido, firma
+
+    def _source_key(self, contenido: bytes) -> Optional[str]:
+        """
+        Huella del contenido del fuente y de la versión del compilador (ver
+        _compiler_version), o None si el compilador no se puede leer.
+        """
+        try:
+            version = self._compiler_version()
+        except OSError:
+            return None
+        return huella(contenido, version)
+
+    def _compiler_version(self) -> str:
+        """
+        Ruta, tamaño y fecha de modificación del script del compilador y, si
+        es compiler_stub.py, de los módulos .py de sus paquetes (lexer/,
+        sintactico/, ...). Los paquetes se recorren una vez por runner y de
+        nuevo solo cuando cambia el script; los backends en proceso y worker
+        tampoco recargan los módulos ya importados.
+        """
+        stat = self.compiler_path.stat()
+        script = f"{self.compiler_path}:{stat.st_size}:{stat.st_mtime_ns}"
+        if self._version is None or self._version[0] != script:
+            partes = [script]
+            if self.compiler_path.suffix == ".py":
+                base = self.compiler_path.parent
+                for paquete in _PAQUETES_COMPILADOR:
+                    for archivo in sorted((base / paquete).rglob("*.py")):
+                        modulo = archivo.stat()
+                        partes.append(f"{archivo}:{modulo.st_size}:{modulo.st_mtime_ns}")
+            self._version = (script, "\n".join(partes))
+        return self._version[1]
+
+    @staticmethod
+    def _cancelled_result() -> CompilerResult:
+        return CompilerResult(
+            success=False,
+            returncode=-4,
+            stdout="",
+            stderr="[CompilerRunner] Compilación cancelada.",
+            failed_phase="cancelado",
         )
 
+    @staticmethod
+    def _internal_error_result() -> CompilerResult:
+        """Resultado de una excepción del compilador (con su traceback en stderr)."""
         return CompilerResult(
-            success=proc_result.returncode == 0,
-            returncode=proc_result.returncode,
-            stdout=proc_result.stdout or "",
-            stderr=proc_result.stderr or "",
+            success=False,
+            returncode=-3,
+            stdout="",
+            stderr="[CompilerRunner] Error inesperado en el compilador:\n"
+            + traceback.format_exc(),
+            failed_phase="desconocido",
+        )
+
+    def _build_result(
+        self,
+        returncode: int,
+        files: dict[str, str],
+        stdout: str = "",
+        stderr: str = "",
+    ) -> CompilerResult:
+        """
+        Arma el `CompilerResult` a partir del contenido de los archivos de
+        salida ({ "tokens.txt": ..., "errors.txt": ... }), vengan del disco o
+        de memoria.
+        """
+        outputs = {
+            panel_key: files.get(filename, "")
+            for filename, panel_key in OUTPUT_FILE_MAP.items()
+        }
+        errors_by_phase = self._parse_errors(files.get("errors.txt", ""))
+        return CompilerResult(
+            success=returncode == 0,
+            returncode=returncode,
+            stdout=stdout,
+            stderr=stderr,
             outputs=outputs,
             errors_by_phase=errors_by_phase,
-            failed_phase=failed_phase,
+            failed_phase=self._detect_failed_phase(returncode, errors_by_phase),
+        )
+
+    def _result_from_document(
+        self, document: dict, stdout: str = "", stderr: str = ""
+    ) -> CompilerResult:
+        """
+        Arma el `CompilerResult` a partir del documento JSON del compilador
+        (Compilacion.documento(): codigo, salidas, errores con posición).
+        """
+        salidas = document.get("salidas", {})
+        errors = document.get("errores", [])
+        returncode = document["codigo"]
+        outputs = {
+            panel_key: salidas.get(key, "")
+            for key, panel_key in DOCUMENT_OUTPUT_MAP.items()
+        }
+        errors_by_phase = self._parse_errors(
+            "\n".join(error["mensaje"] for error in errors)
+        )
+        return CompilerResult(
+            success=returncode == 0,
+            returncode=returncode,
+            stdout=stdout,
+            stderr=stderr,
+            outputs=outputs,
+            errors_by_phase=errors_by_phase,
+            failed_phase=self._detect_failed_phase(returncode, errors_by_phase),
+            errors=errors,
+            metrics=document.get("metricas", []),
+            symbols=document.get("simbolos", []),
+        )
+
+    @staticmethod
+    def _parse_document(stdout: str) -> Optional[dict]:
+        """
+        Retorna el documento JSON que `--format json` deja en stdout, o None
+        si stdout no lo tiene (compilador que solo escribe archivos).
+        """
+        try:
+            document = json.loads(stdout)
+        except ValueError:
+            return None
+        if not isinstance(document, dict) or "codigo" not in document:
+            return None
+        return document
+
+    # Backend en proceso
+
+    def _load_compiler_module(self) -> Optional[ModuleType]:
+        """
+        Importa el script del compilador como módulo (solo la primera vez).
+        Retorna None si no es un script Python con `compilar()`; en modo
+        "auto" eso hace caer al backend de subproceso. Si el script falla al
+        importarse, en modo "inprocess" la excepción se propaga (run() la
+        convierte en un resultado con código -3) y en "auto" retorna None.
+        """
+        if self._compiler_module is not None:
+            return self._compiler_module
+        if self.compiler_path.suffix != ".py" or not self.compiler_path.exists():
+            return None
+
+        spec = importlib.util.spec_from_file_location(
+            self.compiler_path.stem, self.compiler_path
         )
+        if spec is None or spec.loader is None:
+            return None
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception:  # noqa: BLE001
+            del sys.modules[spec.name]
+            if self.backend == "inprocess":
+                raise
+            return None
+        if not hasattr(module, "compilar"):
+            return None
+
+        self._compiler_module = module
+        return module
+
+    def _run_inprocess(
+        self,
+        module: ModuleType,
+        source_file: str,
+        phase: str,
+        key: Optional[str] = None,
+        texto: Optional[str] = None,
+    ) -> CompilerResult:
+        """
+        Llama a `compilar()` del módulo del compilador y arma el
+        `CompilerResult` en memoria, igual al que produce el subproceso.
+
+        Con `key` (la huella del fuente en la cache) retoma desde los
+        artefactos guardados de una compilación anterior del mismo fuente y
+        guarda los de esta. Con `texto` compila ese contenido (el mismo de
+        la huella) sin volver a leer el archivo.
+        """
+        source_path = Path(source_file)
+        target = None if not phase or phase == "all" else phase
+        artefactos = self.cache.artefactos(key) if key is not None else {}
+        try:
+            if texto is None and self.token_cache is None and not artefactos:
+                with source_path.open("r", encoding="utf-8", errors="replace") as source:
+                    compilacion = module.compilar(
+                        source, target, medir_memoria=self.measure_memory
+                    )
+            else:
+                if texto is None:
+                    texto = source_path.read_text(encoding="utf-8", errors="replace")
+                if "tokens" not in artefactos and self.token_cache is not None:
+                    artefactos["tokens"] = self.token_cache.tokens(texto)
+                compilacion = module.compilar(
+                    texto, target, medir_memoria=self.measure_memory, **artefactos
+                )
+        except FileNotFoundError:
+            message = f"[LEXICO] Archivo fuente no encontrado: {source_path}"
+            return self._result_from_document({
+                "codigo": 1,
+                "errores": [
+                    {"fase": "lexico", "linea": None, "columna": None, "mensaje": message}
+                ],
+            })
+        except Exception:  # noqa: BLE001
+            return self._internal_error_result()
+
+        if key is not None and hasattr(compilacion, "artefactos"):
+            self.cache.guardar_artefactos(key, compilacion.artefactos())
+        return self._result_from_document(compilacion.documento())
+
+    # Backend worker
+
+    def _run_worker(
+        self, source_file: str, phase: str, texto: Optional[str] = None
+    ) -> CompilerResult:
+        """
+        Envía la compilación al proceso worker y arma el `CompilerResult` con
+        su respuesta. `timeout` se aplica a esta petición: si se excede, el
+        worker se mata y se relanza en la siguiente. Con `texto` el fuente va
+        en la petición ("source") en vez de la ruta del archivo.
+        """
+        if self._worker is None:
+            self._worker = _CompilerWorker(
+                [_PYTHON, str(self.compiler_path), "--serve"], self.outputs_dir
+            )
+
+        if texto is not None:
+            request: dict = {"source": texto}
+        else:
+            request = {"path": str(Path(source_file).resolve())}
+        if phase and phase != "all":
+            request["phase"] = phase
+        if self.measure_memory:
+            request["memoria"] = True
+
+        try:
+            response = self._worker.request(request, self.timeout)
+        except InterruptedError:
+            return self._cancelled_result()
+        except TimeoutError:
+            return self._build_result(
+                -1, {},
+                stderr="[CompilerRunner] El compilador superó el tiempo límite de "
+                f"{self.timeout} segundos.",
+            )
+        except FileNotFoundError:
+            return self._build_result(
+                -2, {},
+                stderr=f"[CompilerRunner] No se encontró el compilador en:\n"
+                f"  {self.compiler_path}",
+            )
+        except Exception as exc:  # noqa: BLE001
+            return self._build_result(
+                -3, {},
+                stderr=f"[CompilerRunner] Error inesperado en el worker del compilador:\n{exc}",
+            )
+
+        if "error" in response:
+            return self._build_result(
+                -3, {},
+                stderr=f"[CompilerRunner] Error interno del compilador:\n{response['error']}",
+            )
+        return self._result_from_document(response)
 
     # Construir el comando
 
@@ -127,9 +584,13 @@ class CompilerRunner:
             _PYTHON,
             str(self.compiler_path),
             str(source_file),
+            "--format",
+            "json",
         ]
         if phase and phase != "all":
             cmd += ["--phase", phase]
+        if self.measure_memory:
+            cmd.append("--memory")
         return cmd
 
     # Ejecutar con subprocess
@@ -138,18 +599,29 @@ class CompilerRunner:
         """
         Lanza el compilador como subproceso y captura stdout/stderr.
         Si se excede `timeout` mata el proceso y retorna código -1.
+        El proceso queda en `_proc` mientras corre para que cancel() lo mate.
         """
         try:
-            result = subprocess.run(
+            self._proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
                 encoding="utf-8",
                 errors="replace",
-                timeout=self.timeout,
                 cwd=str(self.outputs_dir),  # el compilador escribe en outputs/
             )
-            return result
+            if self._cancelled.is_set():  # cancel() llegó antes del arranque
+                self._proc.kill()
+            try:
+                stdout, stderr = self._proc.communicate(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.communicate()
+                raise
+            return subprocess.CompletedProcess(
+                cmd, self._proc.returncode, stdout, stderr
+            )
         except subprocess.TimeoutExpired:
             return subprocess.CompletedProcess(
                 args=cmd,
@@ -173,27 +645,29 @@ class CompilerRunner:
                 stdout="",
                 stderr=f"[CompilerRunner] Error inesperado al lanzar el compilador:\n{exc}",
             )
+        finally:
+            self._proc = None
 
     # Leer archivos de salida
 
     def _read_output_files(self) -> dict[str, str]:
         """
-        Lee cada archivo de `OUTPUT_FILE_MAP` desde `outputs_dir`.
+        Lee cada archivo de `OUTPUT_FILE_MAP` y `errors.txt` desde `outputs_dir`.
 
-        Retorna un dict { panel_key: contenido_str }.
+        Retorna un dict { nombre_archivo: contenido_str }.
         Los archivos inexistentes o vacíos producen una cadena vacía.
         """
-        outputs: dict[str, str] = {}
-        for filename, panel_key in OUTPUT_FILE_MAP.items():
-            path = self.outputs_dir / filename
-            outputs[panel_key] = self._safe_read(path)
-        return outputs
+        return {
+            filename: self._safe_read(self.outputs_dir / filename)
+            for filename in [*OUTPUT_FILE_MAP, "errors.txt"]
+        }
 
-    # Parsear errors.txt y clasificar por fase
+    # Clasificar los errores por fase
 
-    def _parse_errors(self) -> dict[str, str]:
+    def _parse_errors(self, raw: str) -> dict[str, str]:
         """
-        Lee `errors.txt` y separa los mensajes según la fase a la que pertenecen.
+        Separa el contenido de `errors.txt` según la fase a la que pertenece
+        cada mensaje.
 
         Formato esperado (flexible):
             [LEXICO] Caracter inesperado '@' en línea 3
@@ -203,9 +677,6 @@ class CompilerRunner:
 
         Retorna dict { panel_err_key: texto_multilinea }.
         """
-        errors_path = self.outputs_dir / "errors.txt"
-        raw = self._safe_read(errors_path)
-
         if not raw.strip():
             return {}
 
@@ -286,3 +757,153 @@ class CompilerRunner:
             return ""
         except OSError as exc:
             return f"[Error al leer {path.name}: {exc}]"
+
+
+# Proceso worker (backend "worker")
+
+
+class _CompilerWorker:
+    """
+    Proceso `compiler_stub.py --serve` reutilizado entre compilaciones.
+
+    Las peticiones y respuestas son líneas JSON (ver _serve en
+    compiler_stub.py). Un hilo lee stdout y deja cada línea en una cola, de
+    modo que la espera de cada respuesta puede tener su propio límite de
+    tiempo. Si el proceso termina, se cuelga o responde algo ilegible, se
+    descarta y se lanza uno nuevo en la siguiente petición. cancel() mata el
+    proceso desde otro hilo y la petición en curso lanza InterruptedError.
+    """
+
+    def __init__(self, cmd: list[str], cwd: Path):
+        self.cmd = cmd
+        self.cwd = cwd
+        self._proc: Optional[subprocess.Popen] = None
+        self._responses: queue.Queue = queue.Queue()
+        self._stderr: deque[str] = deque(maxlen=50)
+        self._stderr_thread: Optional[threading.Thread] = None
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def request(self, payload: dict, timeout: float) -> dict:
+        """
+        Envía una petición y espera su respuesta.
+        Lanza TimeoutError si no llega en `timeout` segundos, RuntimeError
+        si el proceso terminó antes de responder, o InterruptedError si la
+        petición se canceló con cancel().
+
+        Si un worker ya usado resulta estar muerto (terminó entre dos
+        peticiones), la petición se reintenta una vez con uno nuevo.
+        """
+        with self._lock:
+            self._cancelled.clear()
+            deadline = time.monotonic() + timeout
+            reused = self._proc is not None and self._proc.poll() is None
+            if not reused:
+                self._start()
+            try:
+                return self._exchange(payload, deadline)
+            except RuntimeError:
+                if self._cancelled.is_set():
+                    self._discard()
+                    raise InterruptedError from None
+                if not reused:
+                    raise
+                self._start()
+                return self._exchange(payload, deadline)
+
+    def cancel(self):
+        """
+        Mata el proceso para abortar la petición en curso. No toma el lock
+        (lo tiene request()); el hilo de request() ve el fin del proceso y
+        lanza InterruptedError.
+        """
+        self._cancelled.set()
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+
+    def _exchange(self, payload: dict, deadline: float) -> dict:
+        assert self._proc is not None and self._proc.stdin is not None
+
+        self._last_id += 1
+        request_id = self._last_id
+        try:
+            self._proc.stdin.write(json.dumps({**payload, "id": request_id}) + "\n")
+            self._proc.stdin.flush()
+        except OSError:
+            message = self._crash_message()
+            self._discard()
+            raise RuntimeError(message)
+
+        while True:
+            try:
+                line = self._responses.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self._discard()
+                raise TimeoutError
+            if line is None:
+                message = self._crash_message()
+                self._discard()
+                raise RuntimeError(message)
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue  # salida ajena al protocolo
+            if response.get("id") == request_id:
+                return response
+
+    def stop(self):
+        """Termina el proceso (si está vivo)."""
+        with self._lock:
+            self._discard()
+
+    def _start(self):
+        self._discard()
+        self._stderr.clear()
+        self._proc = subprocess.Popen(
+            self.cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            cwd=str(self.cwd),
+        )
+        # Cola nueva por proceso: las líneas de un proceso anterior no se mezclan
+        self._responses = queue.Queue()
+        threading.Thread(
+            target=self._pump, args=(self._proc.stdout, self._responses), daemon=True
+        ).start()
+        self._stderr_thread = threading.Thread(
+            target=self._pump_stderr, args=(self._proc.stderr,), daemon=True
+        )
+        self._stderr_thread.start()
+
+    def _discard(self):
+        if self._proc is None:
+            return
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._proc.wait()
+        self._proc = None
+
+    def _crash_message(self) -> str:
+        # Dar tiempo a que llegue el final de stderr (traceback del worker)
+        if self._stderr_thread is not None:
+            self._stderr_thread.join(timeout=1)
+        detail = "".join(self._stderr).strip()
+        message = "El proceso del compilador terminó inesperadamente."
+        return f"{message}\n{detail}" if detail else message
+
+    @staticmethod
+    def _pump(stream, responses: queue.Queue):
+        for line in stream:
+            responses.put(line)
+        responses.put(None)  # EOF: el proceso terminó
+
+    def _pump_stderr(self, stream):
+        for line in stream:
+            self._stderr.append(line)
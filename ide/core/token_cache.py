@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from typing import Optional
+
+# El lexer vive en external_compiler/ (un nivel fuera de ide/)
+_EC_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "external_compiler")
+)
+if _EC_DIR not in sys.path:
+    sys.path.insert(0, _EC_DIR)
+
+try:
+    from lexer.dfa_lexer import DFALexer  # type: ignore[import-not-found]
+    from lexer.incremental import Reanalisis  # type: ignore[import-not-found]
+    from lexer.token_buffer import TokenBuffer  # type: ignore[import-not-found]
+    LEXER_DISPONIBLE = True
+except ImportError:
+    LEXER_DISPONIBLE = False
+
+
+class TokenCache:
+    """
+    Último resultado del DFALexer (texto y TokenBuffer con ERROR y EOF),
+    compartido entre el resaltado de sintaxis y la compilación en proceso.
+
+    El resaltador lo actualiza de forma incremental tras cada edición
+    (editar → DFALexer.retokenize) y CompilerRunner lo consulta con el texto
+    del archivo a compilar (tokens): si es el mismo texto no se vuelve a
+    tokenizar, y si no, los tokens que produce quedan para el resaltador.
+
+    Se usa desde el hilo de Tk y desde el hilo de compilación: el lock solo
+    protege el par (texto, tokens); el análisis se hace fuera de él. Los
+    TokenBuffer guardados no se modifican nunca (retokenize arma uno nuevo),
+    así que quien obtuvo uno puede leerlo sin lock.
+    """
+
+    def __init__(self):
+        if not LEXER_DISPONIBLE:
+            raise RuntimeError("El paquete lexer de external_compiler no está disponible")
+        self._lexer = DFALexer(engine="tabla")
+        self._lock = threading.Lock()
+        self._texto: Optional[str] = None
+        self._tokens: Optional[TokenBuffer] = None
+
+    @property
+    def texto(self) -> Optional[str]:
+        """Texto del último análisis guardado (None si aún no hay)."""
+        return self._texto
+
+    def tokens(self, texto: str) -> TokenBuffer:
+        """
+        Tokens de `texto`: los guardados si es el mismo texto; si no, lo
+        tokeniza completo y guarda el resultado.
+        """
+        with self._lock:
+            if self._texto is not None and (self._texto is texto or self._texto == texto):
+                return self._tokens
+        tokens = self._lexer.tokenize_buffer(texto)
+        self._guardar(texto, tokens)
+        return tokens
+
+    def editar(self, anterior: str, inicio: int, eliminados: int, texto: str) -> Optional[Reanalisis]:
+        """
+        Actualiza el análisis de `anterior` tras reemplazar `eliminados`
+        caracteres en la posición `inicio` (`texto` es el resultado). Solo se
+        vuelve a recorrer la zona afectada.
+
+        Retorna None, sin tokenizar nada, si lo guardado ya no es `anterior`
+        (otro texto pasó por la cache, p. ej. una compilación): quien llama
+        debe pedir tokens(texto).
+        """
+        with self._lock:
+            if self._texto is not anterior:
+                return None
+            tokens = self._tokens
+        insertados = len(texto) - len(anterior) + eliminados
+        r = self._lexer.retokenize(
+            tokens, inicio, eliminados, texto[inicio:inicio + insertados], texto
+        )
+        self._guardar(texto, r.tokens)
+        return r
+
+    def _guardar(self, texto: str, tokens: TokenBuffer):
+        with self._lock:
+            self._texto = texto
+            self._tokens = tokens
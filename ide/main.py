@@ -7,6 +7,7 @@ def main():
     root = tk.Tk()
     app = IDEWindow(root)
     root.mainloop()
+    app.compiler.close()
 
 
 if __name__ == "__main__":
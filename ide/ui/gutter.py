@@ -0,0 +1,98 @@
+import tkinter as tk
+
+#Posicion y colores de la numeracion
+X_NUMERO = 18
+COLOR_NUMERO = "black"
+COLOR_NUMERO_ERROR = "white"
+COLOR_FONDO_ERROR = "#FF0000"
+
+
+class Gutter:
+    #Numeracion de lineas del editor (canvas a la izquierda del texto)
+    #
+    #Mantiene un pool de items del canvas, uno por linea visible: cada
+    #casilla tiene un rectangulo (fondo rojo de las lineas con error, oculto
+    #en las demas) y el texto con el numero. Al redibujar solo se tocan las
+    #casillas cuyo numero, posicion o marca de error cambiaron; las que
+    #sobran se ocultan y se reutilizan despues. Las lineas con error se
+    #guardan como un conjunto (set_error_lines), calculado una vez por
+    #compilacion y no en cada scroll; se ven en el siguiente redraw().
+
+    def __init__(self, parent, text_widget: tk.Text, width: int = 35, bg: str = "lightgray"):
+        self.text = text_widget
+        self.width = width
+        self.canvas = tk.Canvas(parent, width=width, bg=bg)
+        self._error_lines: frozenset[int] = frozenset()
+        #Por casilla: (rectangulo, texto) y lo que muestra (linea, y, alto, error)
+        self._casillas: list[tuple[int, int]] = []
+        self._mostrado: list[tuple[int, int, int, bool] | None] = []
+        self._visibles = 0 #Casillas en uso desde el ultimo redibujado
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def set_error_lines(self, lines):
+        #Reemplaza el conjunto de lineas marcadas con error
+        self._error_lines = frozenset(lines)
+
+    def clear_errors(self):
+        self.set_error_lines(())
+
+    def redraw(self, event=None):
+        #Ajusta el pool a las lineas visibles del editor
+        first_line = int(self.text.index("@0,0").split(".")[0])
+        last_line = int(self.text.index(f"@0,{self.text.winfo_height()}").split(".")[0])
+
+        usadas = 0
+        for line in range(first_line, last_line + 1):
+            dline = self.text.dlineinfo(f"{line}.0")
+            if not dline:
+                continue
+            if usadas == len(self._casillas):
+                self._nueva_casilla()
+            self._mostrar(usadas, (line, dline[1], dline[3], line in self._error_lines))
+            usadas += 1
+
+        for i in range(usadas, self._visibles):
+            rect, numero = self._casillas[i]
+            self.canvas.itemconfigure(rect, state="hidden")
+            self.canvas.itemconfigure(numero, state="hidden")
+            self._mostrado[i] = None
+        self._visibles = usadas
+
+    def _nueva_casilla(self):
+        #El rectangulo se crea antes para quedar debajo del numero
+        rect = self.canvas.create_rectangle(
+            2, 0, self.width - 2, 0, fill=COLOR_FONDO_ERROR, outline="", state="hidden"
+        )
+        numero = self.canvas.create_text(X_NUMERO, 0, anchor="nw", state="hidden")
+        self._casillas.append((rect, numero))
+        self._mostrado.append(None)
+
+    def _mostrar(self, i: int, vista: tuple[int, int, int, bool]):
+        #Actualiza la casilla `i` solo en lo que cambio respecto de lo mostrado
+        anterior = self._mostrado[i]
+        if anterior == vista:
+            return
+        rect, numero = self._casillas[i]
+        line, y, alto, error = vista
+        if anterior is None or anterior[1] != y:
+            self.canvas.coords(numero, X_NUMERO, y)
+        opciones = {}
+        if anterior is None:
+            opciones["state"] = "normal"
+        if anterior is None or anterior[0] != line:
+            opciones["text"] = str(line)
+        if anterior is None or anterior[3] != error:
+            opciones["fill"] = COLOR_NUMERO_ERROR if error else COLOR_NUMERO
+        if opciones:
+            self.canvas.itemconfigure(numero, **opciones)
+
+        if error:
+            if anterior is None or not anterior[3] or anterior[1:3] != (y, alto):
+                self.canvas.coords(rect, 2, y, self.width - 2, y + alto)
+            if anterior is None or not anterior[3]:
+                self.canvas.itemconfigure(rect, state="normal")
+        elif anterior is not None and anterior[3]:
+            self.canvas.itemconfigure(rect, state="hidden")
+        self._mostrado[i] = vista
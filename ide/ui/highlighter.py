@@ -1,4 +1,6 @@
 import re
+from bisect import bisect_left, bisect_right
+from itertools import islice
 import sys as _sys
 import os as _os
 import tkinter as tk
@@ -24,17 +26,23 @@ except ImportError:
         "for", "return", "break", "then", "until", "default",
     }
 
+#Los tokens salen del DFALexer (compartidos con la compilacion, ver
+#core/token_cache.py); los patrones de abajo quedan como respaldo si el
+#paquete del lexer no esta disponible
+from core.token_cache import LEXER_DISPONIBLE, TokenCache
+
 #Definicion de tokens con patrones y tags
 #Los patrones mas especificos importan
 TOKEN_PATTERNS = [
-    #Comentarios multilinea /* ... */
-    ("comment", r"/\*[\s\S]*?\*/"),
+    #Comentarios multilinea /* ... */ (sin cerrar: hasta el final del texto,
+    #como en el DFA; tambien cubre un comentario cortado al final de la region)
+    ("comment", r"/\*[\s\S]*?(?:\*/|\Z)"),
     #Comentarios de una linea //
     ("comment", r"//[^\n]*"),
-    #Cadenas de texto "..."
-    ("string", r'"[^"]*"'),
+    #Cadenas de texto "..." (de una sola linea, como en el DFA)
+    ("string", r'"[^"\n]*"'),
     #Caracteres ' ... '
-    ("string", r"'[^']*'"),
+    ("string", r"'[^'\n]*'"),
     #Numeros reales
     ("number", r"\b\d+\.\d+\b"),
     #Numeros enteros
@@ -49,8 +57,10 @@ TOKEN_PATTERNS = [
     ("assign", r"=(?!=)"),
     #Simbolos
     ("symbol", r"[(){},;]"),
-    #Identificadores y palabras reservadas
-    ("identifier", r"\b[a-zA-Z_][a-zA-Z0-9]*\b"),
+    #Palabras reservadas (antes que los identificadores)
+    ("reserved", r"\b(?:" + "|".join(sorted(RESERVED_WORDS, key=len, reverse=True)) + r")\b"),
+    #Identificadores
+    ("identifier", r"\b[a-zA-Z_][a-zA-Z0-9_]*\b"),
     #Error lexico
     ("error", r"[^\s]"),
 ]
@@ -70,6 +80,60 @@ TAG_COLORS = {
     "error": {"foreground": "#FF0000", "underline": True},
 }
 
+#Los tramos llevan el tag como su indice en TAGS (orden de prioridad)
+TAGS = tuple(TAG_COLORS)
+_ID_TAG = {tag: i for i, tag in enumerate(TAGS)}
+_ID_COMENTARIO = _ID_TAG["comment"]
+
+#Modo viewport: lineas extra que se resaltan arriba y abajo de la vista
+MARGEN_LINEAS = 50
+
+#Rangos (pares de indices) por llamada a tag_add
+LOTE_TAGS = 5000
+
+#Estado del analisis al inicio de una linea
+FUERA_DE_COMENTARIO = 0
+EN_COMENTARIO = 1
+
+#Saltos de linea (tabla de inicios de linea de un tramo)
+_SALTO = re.compile("\n")
+
+#Resto de un comentario /* */ que viene abierto desde una linea anterior
+_CIERRE_COMENTARIO = re.compile(r"[\s\S]*?\*/")
+
+#Comentario dentro del hueco entre dos tokens del DFALexer
+_COMENTARIO = re.compile(r"//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)")
+
+#Tag por nombre de tipo de token del DFALexer (las KW_* son "reserved")
+_TAG_POR_NOMBRE = {
+    "INT_NUM": "number", "FLOAT_NUM": "number",
+    "IDENTIFIER": "identifier", "RESERVED": "reserved",
+    "SUMA": "arithmetic", "INCREMENTO": "arithmetic", "RESTA": "arithmetic",
+    "DECREMENTO": "arithmetic", "MULTIPLICACION": "arithmetic",
+    "DIVISION": "arithmetic", "MODULO": "arithmetic", "POTENCIA": "arithmetic",
+    "AND": "logical", "OR": "logical", "NEGACION": "logical",
+    "MAYOR": "relational", "MENOR": "relational", "MAYOR_IGUAL": "relational",
+    "MENOR_IGUAL": "relational", "DIFERENTE": "relational", "IGUAL": "relational",
+    "ASIGNACION": "assign",
+    "PAR_IZQ": "symbol", "PAR_DER": "symbol", "LLAVE_IZQ": "symbol",
+    "LLAVE_DER": "symbol", "COMA": "symbol", "PUNTO_COMA": "symbol",
+    "STRING": "string", "CHAR": "string",
+    "ERROR": "error",
+}
+
+def _tags_por_tipo() -> tuple:
+    #Codigo de tipo (valor de TokenType) -> id de tag; None para EOF
+    if not LEXER_DISPONIBLE:
+        return ()
+    from lexer.token_types import TokenType  # type: ignore[import-not-found]
+    tags: list[int | None] = [None] * (max(TokenType) + 1)
+    for tipo in TokenType:
+        tag = "reserved" if tipo.name.startswith("KW_") else _TAG_POR_NOMBRE.get(tipo.name)
+        tags[tipo] = _ID_TAG[tag] if tag else None
+    return tuple(tags)
+
+_TAG_POR_TIPO = _tags_por_tipo()
+
 #Regex combinado con grupos nombrados
 _COMBINED_PATTERN = re.compile(
     "|".join(f"(?P<{tag}_{i}>{pattern})"
@@ -77,13 +141,65 @@ _COMBINED_PATTERN = re.compile(
     re.MULTILINE
 )
 
+#Indice del grupo que hizo match (match.lastindex, 1-indexed) -> id de tag.
+#Los patrones no tienen grupos internos, asi que lastindex es su posicion
+#en TOKEN_PATTERNS mas uno
+_TAG_POR_GRUPO = (None,) + tuple(_ID_TAG[tag] for tag, _ in TOKEN_PATTERNS)
+
 class SyntaxHighlighter:
     #Resaltado de la sintaxis en tiempo real para el editor de texto
 
-    def __init__(self, text_widget: tk.Text):
+    #Cache por linea: el estado al inicio de la linea (dentro de /* */ o no)
+    #y su analisis: los tramos (tag, col_inicio, col_fin), el estado al final
+    #y el estado inicial con que se hizo (solo vale si coincide con el
+    #actual). Las ediciones llegan como deltas (linea, lineas eliminadas,
+    #lineas insertadas) desde un proxy del comando Tcl del widget y solo las
+    #lineas tocadas pierden su cache. Al resaltar se reanalizan esas lineas y
+    #se sigue mientras el estado al inicio de la siguiente difiera del
+    #guardado; los tags se cambian solo en las lineas reanalizadas.
+    #
+    #Con viewport=True solo se resaltan las lineas visibles (mas MARGEN_LINEAS)
+    #y el resto se completa al desplazar la vista (on_scroll); el costo depende
+    #del alto de la ventana, no del tamaño del archivo. Si el estado cambia
+    #mas alla de la vista (se abrio o cerro un comentario), los estados
+    #siguientes se marcan como desconocidos y se recalculan al verse. Con
+    #viewport=False se resalta el documento completo.
+    #
+    #Con el lexer disponible los tramos salen de los tokens del DFALexer
+    #guardados en `token_cache` (la misma TokenCache que usa CompilerRunner)
+    #y no del regex: el proxy tambien registra cada edicion como
+    #(posicion, eliminados, insertados) y al resaltar la cache se actualiza
+    #con DFALexer.retokenize. Los comentarios no son tokens: son los huecos
+    #entre tokens que contienen "/". Las lineas de la zona que el lexer volvio
+    #a recorrer pierden su cache; los estados por linea no hacen falta.
+
+    def __init__(
+        self,
+        text_widget: tk.Text,
+        viewport: bool = True,
+        token_cache: TokenCache | None = None,
+        debounce_ms: int = 100,
+    ):
         self.text = text_widget
+        self.viewport = viewport
+        self.debounce_ms = debounce_ms #Espera tras la ultima llamada a highlight()
+        if token_cache is None and LEXER_DISPONIBLE:
+            token_cache = TokenCache()
+        self.token_cache = token_cache
         self._after_id = None #Para el debounce
+        self._scroll_id = None #Resaltado pendiente tras un scroll
+        self._estados: list[int | None] = []
+        self._analisis: list[tuple[list, int, int] | None] = []
+        self._sucias: set[int] = set() #Lineas editadas aun sin propagar
+        self._texto: str | None = None #Texto de los tokens en uso
+        self._tokens = None
+        #Ediciones desde _texto, unidas en una sola: (inicio, fin en _texto,
+        #fin en el texto actual)
+        self._edicion: tuple[int, int, int] | None = None
+        self._reiniciar_cache()
         self._configure_tags()
+        if hasattr(self.text, "tk"):
+            self._install_proxy()
 
     def _configure_tags(self):
         #Configura los tags de color en el widget text
@@ -111,48 +227,474 @@ class SyntaxHighlighter:
         #Aplica resaltado con debounce de ms para no saturar mientras el usuario escribe rapido
         if self._after_id:
             self.text.after_cancel(self._after_id)
-        self._after_id = self.text.after(100, self._apply_highlight)
-
-    def _apply_highlight(self):
-        #Aplica el resaltado al contenido completo del editor
-        content = self.text.get("1.0", tk.END)
+        self._after_id = self.text.after(self.debounce_ms, self._apply_highlight)
 
-        #Limpiar todos los tags antes de replicar
-        for tag in TAG_COLORS:
-            self.text.tag_remove(tag, "1.0", tk.END)
-
-        #Aplicar cada match
-        for match in _COMBINED_PATTERN.finditer(content):
-            start_idx = match.start()
-            end_idx = match.end()
-
-            #Convertir indice de caracter a linea.columna de Tkinter
-            start = self._index(start_idx)
-            end = self._index(end_idx)
+    def on_scroll(self):
+        #Llamado cuando la vista se desplaza: resalta (en el siguiente idle)
+        #las lineas que entraron en la vista y aun no estan resaltadas
+        if not self.viewport or self._scroll_id:
+            return
+        self._scroll_id = self.text.after_idle(self._on_scroll_idle)
 
-            #Determinar el tag base del grupo que hizo match
-            tag = self._get_tag(match)
-            if not tag:
-                continue
+    def _on_scroll_idle(self):
+        self._scroll_id = None
+        self._highlight_viewport()
 
-            #Si es identificador verificar si es palabra reservada
-            if tag == "identifier" and match.group() in RESERVED_WORDS:
-                tag = "reserved"
+    def _apply_highlight(self):
+        #Aplica el resaltado tras una edicion
+        self._after_id = None
+        if not self.viewport:
+            self._highlight_lines(1, self._total_lines())
+            return
+        self._highlight_viewport()
+
+    def _highlight_viewport(self):
+        #Resalta las lineas de la vista (mas el margen)
+        primera = int(self.text.index("@0,0").split(".")[0])
+        ultima = int(self.text.index(f"@0,{self.text.winfo_height()}").split(".")[0])
+        total = self._total_lines()
+        self._highlight_lines(
+            max(1, primera - MARGEN_LINEAS), min(total, ultima + MARGEN_LINEAS)
+        )
 
-            self.text.tag_add(tag, start, end)
+    #Proxy de ediciones
+
+    def _install_proxy(self):
+        #Renombra el comando Tcl del widget y pone uno propio delante para ver
+        #cada insert/delete/replace (del teclado, de FileManager, del
+        #portapapeles) sin comparar el texto completo
+        widget = str(self.text)
+        self._orig_command = widget + "_orig"
+        self.text.tk.call("rename", widget, self._orig_command)
+        self.text.tk.createcommand(widget, self._proxy)
+
+    def _proxy(self, *args):
+        delta = self._delta_edicion(args)
+        cambio = None
+        if delta is not None and self.token_cache is not None:
+            cambio = self._delta_texto(args)
+        result = self.text.tk.call((self._orig_command,) + args)
+        if delta is not None:
+            self._registrar_edicion(*delta)
+            if self.token_cache is not None:
+                self._registrar_texto(cambio)
+        return result
+
+    def _delta_edicion(self, args: tuple) -> tuple[int, int, int] | None:
+        #(linea, lineas eliminadas, lineas insertadas) de un comando del widget,
+        #calculado antes de ejecutarlo; None si el comando no edita
+        if not args or args[0] not in ("insert", "delete", "replace"):
+            return None
+        ultima = self._total_lines()
+        if args[0] == "insert":
+            linea = min(self._linea(args[1]), ultima)
+            return linea, 0, "".join(args[2::2]).count("\n")
+
+        if args[0] == "delete" and len(args) > 3:
+            #Varios rangos a la vez: se invalida todo
+            return 1, ultima - 1, -1
+        inicio = min(self._linea(args[1]), ultima)
+        fin_indice = args[2] if len(args) > 2 else f"{args[1]} + 1c"
+        fin = min(self._linea(fin_indice), ultima)
+        insertadas = "".join(args[3::2]).count("\n") if args[0] == "replace" else 0
+        return inicio, max(fin - inicio, 0), insertadas
+
+    def _delta_texto(self, args: tuple) -> tuple[int, int, int] | None:
+        #(posicion, caracteres eliminados, caracteres insertados) de un
+        #comando que edita, calculado antes de ejecutarlo; None si son varios
+        #rangos
+        total = self._offset("end-1c")
+        if args[0] == "insert":
+            return min(self._offset(args[1]), total), 0, len("".join(args[2::2]))
+        if args[0] == "delete" and len(args) > 3:
+            return None
+        inicio = min(self._offset(args[1]), total)
+        fin = min(self._offset(args[2]), total) if len(args) > 2 else min(inicio + 1, total)
+        insertados = len("".join(args[3::2])) if args[0] == "replace" else 0
+        return inicio, max(fin - inicio, 0), insertados
+
+    def _registrar_texto(self, cambio: tuple[int, int, int] | None):
+        #Une la edicion con las pendientes desde _texto: la zona [inicio, fin)
+        #de _texto que paso a ser [inicio, fin_nuevo) del texto actual
+        if self._texto is None:
+            return
+        if cambio is None:
+            self._texto = None #Sin posicion conocida: se tokeniza de nuevo
+            return
+        inicio, eliminados, insertados = cambio
+        fin = inicio + eliminados
+        if self._edicion is None:
+            self._edicion = (inicio, fin, inicio + insertados)
+            return
+        desde, hasta, hasta_nuevo = self._edicion
+        self._edicion = (
+            min(desde, inicio),
+            max(hasta, fin - (hasta_nuevo - hasta)),
+            max(hasta_nuevo, fin) + insertados - eliminados,
+        )
 
-    def _get_tag(self, match: re.Match) -> str | None:
-        #Extrae el nombre del tag desde el grupo con el que hizo match
-        for group_name, value in match.groupdict().items():
-            if value is not None:
-                #El nombre del grupo es tag_index
-                return group_name.rsplit("_", 1)[0]
+    def _registrar_edicion(self, linea: int, eliminadas: int, insertadas: int):
+        #Descarta la cache de las lineas tocadas por una edicion; las demas
+        #conservan la suya (solo cambia su posicion en las listas). La linea
+        #queda como "sucia" hasta que se propague su nuevo estado final
+        if insertadas < 0 or len(self._estados) < linea + eliminadas:
+            self._reiniciar_cache()
+            return
+        i = linea - 1
+        self._estados[i:i + eliminadas + 1] = [self._estados[i]] + [None] * insertadas
+        self._analisis[i:i + eliminadas + 1] = [None] * (insertadas + 1)
+
+        desplazamiento = insertadas - eliminadas
+        self._sucias = {
+            max(linea, sucia + desplazamiento) if sucia > linea else sucia
+            for sucia in self._sucias
+        }
+        self._sucias.add(linea)
+
+    def _reiniciar_cache(self):
+        lineas = self._total_lines()
+        self._estados = [FUERA_DE_COMENTARIO] + [None] * (lineas - 1)
+        self._analisis = [None] * lineas
+        self._sucias = set()
+        self._texto = None
+        self._tokens = None
+        self._edicion = None
+
+    #Analisis por lineas
+
+    def _highlight_lines(self, primera: int, ultima: int):
+        #Resalta las lineas [primera, ultima] que no tengan cache valida
+        total = self._total_lines()
+        if len(self._estados) != total:
+            self._reiniciar_cache() #Ediciones que no pasaron por el proxy
+        if self.token_cache is not None:
+            self._sincronizar()
+            self._recorrer_tokens(primera, ultima)
+            return
 
-        return None
+        #Las ediciones de mas arriba pueden haber cambiado el estado con que
+        #empieza el rango: se propagan primero (hasta que el estado coincida
+        #con la cache). Las de mas abajo esperan a que se resalten.
+        sucias = sorted(self._sucias)
+        self._sucias = {sucia for sucia in sucias if sucia > ultima}
+        for sucia in sucias:
+            if sucia < primera:
+                self._recorrer(sucia, sucia, total)
+        self._recorrer(primera, ultima, total)
+
+    def _recorrer(self, primera: int, ultima: int, total: int):
+        #Reanaliza las lineas de [primera, ultima] sin cache valida y sigue
+        #mas alla mientras el estado al inicio de la siguiente linea difiera
+        #del guardado. Cada tramo de lineas consecutivas sin cache se lee con
+        #un solo get() y los tags se aplican al final, en lotes por tag
+        i = primera - 1
+        estado = self._estados[i]
+        if estado is None:
+            estado = self._estado_en(primera)
+        quitar: list[tuple[int, int]] = [] #Rangos de lineas [desde, hasta)
+        agregar: list[list[str]] = [[] for _ in TAGS] #Indices por id de tag
+
+        while True:
+            analisis = self._analisis[i]
+            if analisis is not None and analisis[2] == estado:
+                estado = analisis[1]
+                i += 1
+            else:
+                j = i + 1
+                while j < ultima and self._analisis[j] is None:
+                    j += 1
+                texto = self.text.get(f"{i + 1}.0", f"{j}.end")
+                for k, nuevo in enumerate(self._analizar_tramo(texto, estado), i):
+                    anterior = self._analisis[k]
+                    #Una linea con cache no cambio de texto: si sus tramos
+                    #son los mismos, sus tags ya son correctos
+                    if anterior is None or anterior[0] != nuevo[0]:
+                        numero = k + 1
+                        if quitar and quitar[-1][1] == numero:
+                            quitar[-1] = (quitar[-1][0], numero + 1)
+                        else:
+                            quitar.append((numero, numero + 1))
+                        for tag, inicio, fin in nuevo[0]:
+                            agregar[tag] += (f"{numero}.{inicio}", f"{numero}.{fin}")
+                    self._estados[k] = estado
+                    self._analisis[k] = (nuevo[0], nuevo[1], estado)
+                    estado = nuevo[1]
+                i = j
+
+            if i >= total:
+                break
+            if i >= ultima:
+                if self._estados[i] == estado:
+                    break
+                if self._estados[i] is None or (
+                    self.viewport and i >= ultima + MARGEN_LINEAS
+                ):
+                    #Linea aun sin analizar, o el estado sigue cambiando lejos
+                    #del rango (se abrio o cerro un comentario): el resto se
+                    #recalcula al verse
+                    self._estados[i] = estado
+                    self._estados[i + 1:] = [None] * (total - i - 1)
+                    break
+
+        self._aplicar_tags(quitar, agregar)
+
+    #Tramos a partir de los tokens del DFALexer
+
+    def _sincronizar(self):
+        #Pone los tokens al dia con las ediciones pendientes (reanalisis
+        #incremental en la TokenCache) y descarta la cache de las lineas de la
+        #zona que el lexer volvio a recorrer
+        if self._texto is not None and self._edicion is None:
+            return
+        texto = self.text.get("1.0", "end-1c")
+        self._sucias.clear()
+        reanalisis = None
+        if self._texto is not None and self._edicion is not None:
+            inicio, fin, fin_nuevo = self._edicion
+            if len(texto) - len(self._texto) == fin_nuevo - fin:
+                reanalisis = self.token_cache.editar(self._texto, inicio, fin - inicio, texto)
+        self._edicion = None
+
+        if reanalisis is None:
+            #Primera vez, edicion sin posicion conocida u otro texto en la
+            #cache: tokens del texto completo (de la cache si ya los tiene)
+            self._tokens = self.token_cache.tokens(texto)
+            self._texto = texto
+            self._analisis = [None] * len(self._analisis)
+            return
 
-    def _index(self, char_pos: int) -> str:
-        #Convierte la posicion de caracter a formato linea-columna del Tkinter
-        return self.text.index(f"1.0 + {char_pos}c")
+        self._texto = texto
+        self._tokens = reanalisis.tokens
+        desde = min(reanalisis.inicio, inicio)
+        hasta = max(reanalisis.fin, fin_nuevo)
+        primera = texto.count("\n", 0, desde)
+        ultima = primera + texto.count("\n", desde, hasta)
+        self._analisis[primera:ultima + 1] = [None] * (ultima - primera + 1)
+
+    def _recorrer_tokens(self, primera: int, ultima: int):
+        #Resalta las lineas de [primera, ultima] sin cache; cada tramo de
+        #lineas consecutivas sin cache se arma de una vez
+        quitar: list[tuple[int, int]] = []
+        agregar: list[list[str]] = [[] for _ in TAGS]
+        i = primera - 1
+        while i < ultima:
+            if self._analisis[i] is not None:
+                i += 1
+                continue
+            j = i + 1
+            while j < ultima and self._analisis[j] is None:
+                j += 1
+            quitar.append((i + 1, j + 1))
+            tramos_tramo = self._tramos_de_tokens(self._texto, self._tokens, i + 1, j)
+            for k, tramos in enumerate(tramos_tramo, i):
+                numero = k + 1
+                for tag, inicio, fin in tramos:
+                    agregar[tag] += (f"{numero}.{inicio}", f"{numero}.{fin}")
+                self._analisis[k] = (tramos, FUERA_DE_COMENTARIO, FUERA_DE_COMENTARIO)
+            i = j
+        self._aplicar_tags(quitar, agregar)
+
+    @staticmethod
+    def _tramos_de_tokens(texto: str, tokens, primera: int, ultima: int) -> list[list]:
+        #Tramos (id de tag, col_inicio, col_fin) de cada linea de
+        #[primera, ultima] a partir de los tokens de `texto` (TokenBuffer con
+        #EOF) y de los comentarios en los huecos entre ellos
+        tipos, inicios_t, fines_t = tokens.tipos, tokens.inicios, tokens.fines
+
+        #Inicio de `primera`: el de la linea del primer token que empieza en
+        #ella o despues (el EOF siempre esta), retrocediendo las lineas sin tokens
+        k = bisect_left(tokens.lineas, primera)
+        linea = tokens.lineas[k]
+        pos = inicios_t[k] - (tokens.columnas[k] - 1)
+        while linea > primera:
+            pos = texto.rfind("\n", 0, pos - 1) + 1
+            linea -= 1
+
+        inicios = [pos]
+        inicios.extend(m.end() for m in islice(_SALTO.finditer(texto, pos), ultima - primera))
+        fin_texto = texto.find("\n", inicios[-1])
+        if fin_texto < 0:
+            fin_texto = len(texto)
+        inicios.append(fin_texto + 1) #Centinela: inicio de una linea mas
+        tramos: list[list] = [[] for _ in range(len(inicios) - 1)]
+        base = inicios[0]
+        linea = 0
+        siguiente = inicios[1]
+
+        def repartir(tag: int, inicio: int, fin: int):
+            #Agrega [inicio, fin) recortado al tramo y partido por lineas
+            inicio = max(inicio, inicios[0])
+            fin = min(fin, fin_texto)
+            linea = bisect_right(inicios, inicio) - 1
+            while fin >= inicios[linea + 1]:
+                fin_linea = inicios[linea + 1] - 1
+                if fin_linea > inicio:
+                    tramos[linea].append((tag, inicio - inicios[linea], fin_linea - inicios[linea]))
+                linea += 1
+                inicio = inicios[linea]
+            if fin > inicio:
+                tramos[linea].append((tag, inicio - inicios[linea], fin - inicios[linea]))
+
+        tags = _TAG_POR_TIPO
+        n = len(tipos)
+        k = bisect_right(fines_t, inicios[0]) #Primer token que termina despues
+        previo = fines_t[k - 1] if k > 0 else 0 #Inicio del hueco antes del token k
+        while k < n:
+            inicio = inicios_t[k]
+            if inicio > previo:
+                barra = texto.find("/", previo, min(inicio, fin_texto))
+                while barra >= 0:
+                    comentario = _COMENTARIO.match(texto, barra, inicio)
+                    if comentario is None:
+                        break
+                    repartir(_ID_COMENTARIO, barra, comentario.end())
+                    barra = texto.find("/", comentario.end(), min(inicio, fin_texto))
+            if inicio >= fin_texto:
+                break
+
+            tag = tags[tipos[k]]
+            fin = fines_t[k]
+            if tag is not None:
+                if inicio >= siguiente:
+                    linea = bisect_right(inicios, inicio, linea) - 1
+                    base = inicios[linea]
+                    siguiente = inicios[linea + 1]
+                if inicio >= base and fin < siguiente:
+                    tramos[linea].append((tag, inicio - base, fin - base))
+                else:
+                    repartir(tag, inicio, fin)
+            previo = fin
+            k += 1
+        return tramos
+
+    def _aplicar_tags(self, quitar: list[tuple[int, int]], agregar: list[list[str]]):
+        #Quita los tags de las lineas reanalizadas y agrega los nuevos con una
+        #llamada por tag (hasta LOTE_TAGS rangos cada una)
+        for desde, hasta in quitar:
+            for tag in TAG_COLORS:
+                self.text.tag_remove(tag, f"{desde}.0", f"{hasta}.0")
+        paso = 2 * LOTE_TAGS
+        for tag, indices in zip(TAGS, agregar):
+            for k in range(0, len(indices), paso):
+                self.text.tag_add(tag, *indices[k:k + paso])
+
+    def _estado_en(self, numero: int) -> int:
+        #Estado al inicio de la linea `numero` sin analizar todo el texto
+        #previo. text.search (recorrido en C hacia atras) da la ultima linea
+        #con "/*" antes de `numero`; entre esa linea y `numero` solo un "*/"
+        #puede cambiar el estado. El estado al inicio de esa linea sale de la
+        #cache o de la misma busqueda, repetida hacia atras; no hace falta si
+        #la linea termina en el mismo estado empiece como empiece (el caso
+        #comun: "x = 1; /* nota */").
+        pendientes = []
+        linea = numero
+        texto = None #Texto de `linea` si ya se conoce el estado al final
+        while True:
+            estado = self._estados[linea - 1]
+            if estado is not None:
+                break
+            apertura = self.text.search("/*", f"{linea}.0", backwards=True, stopindex="1.0")
+            if not apertura:
+                estado = FUERA_DE_COMENTARIO
+                break
+            pendientes.append(linea)
+            linea = int(apertura.split(".")[0])
+            texto = self.text.get(f"{linea}.0", f"{linea}.end")
+            estado = self._analizar_tramo(texto, FUERA_DE_COMENTARIO)[0][1]
+            if estado == self._analizar_tramo(texto, EN_COMENTARIO)[0][1]:
+                break
+            texto = None
+
+        while pendientes:
+            destino = pendientes.pop()
+            if texto is None:
+                texto = self.text.get(f"{linea}.0", f"{linea}.end")
+                estado = self._analizar_tramo(texto, estado)[0][1]
+            texto = None
+            if (
+                estado == EN_COMENTARIO
+                and linea + 1 < destino
+                and self.text.search("*/", f"{linea + 1}.0", stopindex=f"{destino}.0")
+            ):
+                estado = FUERA_DE_COMENTARIO
+            linea = destino
+            self._estados[linea - 1] = estado
+        return estado
+
+    @staticmethod
+    def _analizar_tramo(texto: str, estado: int) -> list[tuple[list, int]]:
+        #Analiza un tramo de lineas completas que empieza en `estado`. Retorna,
+        #por linea, sus tramos (id de tag, col_inicio, col_fin) y el estado al
+        #final. El tag sale de match.lastindex con _TAG_POR_GRUPO (las palabras
+        #reservadas tienen su propio patron), sin groupdict().
+        #Las posiciones del regex se pasan a linea/columna con la tabla de
+        #inicios de linea (bisect), sin consultar al widget
+        inicios = [0]
+        inicios.extend(m.end() for m in _SALTO.finditer(texto))
+        inicios.append(len(texto) + 1) #Centinela: inicio de una linea mas
+        n = len(inicios) - 1
+        tramos: list[list] = [[] for _ in range(n)]
+        finales = [FUERA_DE_COMENTARIO] * n
+
+        def repartir(tag: int, inicio: int, fin: int) -> int:
+            #Agrega [inicio, fin) partido por lineas (un comentario de varias
+            #lineas); las lineas que atraviesa terminan dentro del comentario.
+            #Retorna la linea donde termina
+            linea = bisect_right(inicios, inicio) - 1
+            while fin >= inicios[linea + 1]:
+                fin_linea = inicios[linea + 1] - 1
+                if fin_linea > inicio:
+                    tramos[linea].append((tag, inicio - inicios[linea], fin_linea - inicios[linea]))
+                finales[linea] = EN_COMENTARIO
+                linea += 1
+                inicio = inicios[linea]
+            if fin > inicio:
+                tramos[linea].append((tag, inicio - inicios[linea], fin - inicios[linea]))
+            return linea
+
+        pos = 0
+        linea = 0
+        if estado == EN_COMENTARIO:
+            cierre = _CIERRE_COMENTARIO.match(texto)
+            pos = cierre.end() if cierre else len(texto)
+            linea = repartir(_ID_COMENTARIO, 0, pos)
+            if cierre is None:
+                finales[-1] = EN_COMENTARIO
+        base = inicios[linea]
+        siguiente = inicios[linea + 1]
+
+        tags = _TAG_POR_GRUPO
+        for match in _COMBINED_PATTERN.finditer(texto, pos):
+            tag = tags[match.lastindex]
+            inicio, fin = match.span()
+            if inicio >= siguiente:
+                linea = bisect_right(inicios, inicio, linea) - 1
+                base = inicios[linea]
+                siguiente = inicios[linea + 1]
+            if fin < siguiente:
+                tramos[linea].append((tag, inicio - base, fin - base))
+                if tag != _ID_COMENTARIO or texto[inicio + 1] != "*":
+                    continue
+            else:
+                linea = repartir(tag, inicio, fin)
+                base = inicios[linea]
+                siguiente = inicios[linea + 1]
+
+            #Un /* sin */ sigue abierto hasta el final del tramo
+            if fin - inicio < 4 or not texto.startswith("*/", fin - 2):
+                finales[-1] = EN_COMENTARIO
+
+        return list(zip(tramos, finales))
+
+    def _total_lines(self) -> int:
+        return int(self.text.index("end-1c").split(".")[0])
+
+    def _linea(self, index: str) -> int:
+        return int(self.text.index(index).split(".")[0])
+
+    def _offset(self, index: str) -> int:
+        #Posicion (en caracteres) de un indice, contada por Tk en C
+        return int(self.text.tk.call(self._orig_command, "count", "-chars", "1.0", index))
 
     #Marcado de errores lexicos
 
@@ -200,32 +742,11 @@ class SyntaxHighlighter:
         #Elimina todas las marcas de error del editor
         self.text.tag_remove("error_mark", "1.0", tk.END)
 
-    def mark_error_lines(self, errors_content: str, line_numbers_canvas):
-        line_numbers_canvas.delete("error_line")
-
-        if not errors_content.strip():
-            return
-
-        error_lines = set()
-        for line in errors_content.splitlines():
-            match = self._ERROR_PATTERN.search(line)
-            if match:
-                error_lines.add(int(match.group(1)))
-
-        for linea in error_lines:
-            dline = self.text.dlineinfo(f"{linea}.0")
-            if dline:
-                y = dline[1]
-                h = dline[3]
-                line_numbers_canvas.create_rectangle(
-                    2, y, 33, y + h,
-                    fill = "#FF0000",
-                    outline = "",
-                    tags = "error_line"
-                )
-                line_numbers_canvas.create_text(
-                    18, y, anchor = "nw",
-                    text = str(linea),
-                    fill = "white",
-                    tags = "error_line"
-                )
+    @classmethod
+    def error_lines(cls, errors_content: str) -> set[int]:
+        #Lineas con error segun el contenido de errors.txt (para el Gutter)
+        return {
+            int(match.group(1))
+            for match in map(cls._ERROR_PATTERN.search, errors_content.splitlines())
+            if match
+        }
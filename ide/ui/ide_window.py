@@ -1,25 +1,63 @@
 import os
+import queue
+import threading
 import tkinter as tk
-from tkinter import messagebox
+import traceback
+from tkinter import messagebox, ttk
 
-from core.compiler_runner import CompilerRunner
+from core.compiler_runner import CompilerResult, CompilerRunner
 from core.file_manager import FileManager
 from core.state import AppState
+from core.token_cache import LEXER_DISPONIBLE, TokenCache
 
 # Lexico
+from ui.gutter import Gutter
 from ui.highlighter import SyntaxHighlighter
 from ui.menu import Menu
 from ui.panels import Panels
 from ui.toolbar import Toolbar
 
+# Intervalo (ms) con que el hilo de Tk revisa si terminó la compilación
+_POLL_MS = 50
+
+# Trabajo de la vista del editor que se acumula hasta el siguiente idle
+# (ver _schedule), en el orden en que _flush lo ejecuta
+_ERROR_MARKS = "error_marks"  # aplicar o quitar las marcas de error
+_GUTTER = "gutter"            # redibujar la numeración de líneas
+_CURSOR = "cursor"            # "Ln x, Col y" de la barra de estado
+_HIGHLIGHT = "highlight"      # resaltado (con el debounce del resaltador)
+_FLUSH_ORDER = (_ERROR_MARKS, _GUTTER, _CURSOR, _HIGHLIGHT)
+
 
 class IDEWindow:
-    def __init__(self, root):
+    def __init__(self, root, highlight_debounce_ms: int = 100, measure_memory: bool = False):
         self.root = root
         self.root.geometry("800x600")
         self.state = AppState()
         self._last_errors_content = ""
         self._suppress_modified = False
+        self._highlight_debounce_ms = highlight_debounce_ms
+
+        # Eventos del editor (tecla, scroll, modificación) solo marcan qué
+        # trabajo quedó pendiente; _flush lo hace una vez por idle
+        self._dirty: set[str] = set()
+        self._flush_id: str | None = None
+
+        # Compilación en segundo plano: el hilo deja (fase, resultado) en la
+        # cola y _poll_compile la revisa con after(). Hay a lo sumo un hilo;
+        # una petición nueva queda en _pending_phase hasta que termine.
+        self._compile_thread: threading.Thread | None = None
+        self._compile_results: queue.Queue = queue.Queue()
+        self._compile_cancelled = False
+        self._pending_phase: str | None = None
+
+        # Filas de la tabla de símbolos mostrada en la pestaña Simbolos
+        # (doble clic en una fila lleva a la declaración)
+        self._symbols: list[dict] = []
+
+        # Tokens del DFALexer compartidos por el resaltado y la compilación
+        self.token_cache = TokenCache() if LEXER_DISPONIBLE else None
+
         self._create_ui()
 
         self.file_manager = FileManager(
@@ -29,7 +67,18 @@ class IDEWindow:
             set_content=self._set_editor_content,
             update_title=self._on_title_update,
         )
-        self.compiler = CompilerRunner()
+        # En proceso, con la misma TokenCache que el resaltador: el archivo
+        # guardado tiene el texto del editor, así que la fase léxica reutiliza
+        # sus tokens. Sin el lexer, worker persistente (se cancela matando su
+        # proceso y no compite por el GIL con el hilo de Tk).
+        # measure_memory: memoria pico por fase en la pestaña Rendimiento
+        # (tracemalloc hace más lenta la compilación)
+        if self.token_cache is not None:
+            self.compiler = CompilerRunner(
+                backend="inprocess", token_cache=self.token_cache, measure_memory=measure_memory
+            )
+        else:
+            self.compiler = CompilerRunner(backend="worker", measure_memory=measure_memory)
 
         self._bind_keyboard_shortcuts()
         self._bind_editor_events()
@@ -87,10 +136,6 @@ class IDEWindow:
         frame = tk.Frame(self.panels.editor_frame)
         frame.pack(fill=tk.BOTH, expand=True)
 
-        # Numeración de líneas
-        self.line_numbers = tk.Canvas(frame, width=35, bg="lightgray")
-        self.line_numbers.pack(side=tk.LEFT, fill=tk.Y)
-
         # Scrollbar vertical
         self.scrollbar = tk.Scrollbar(frame)
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -104,8 +149,16 @@ class IDEWindow:
             yscrollcommand=self._on_yscroll,
         )
         self.text_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Numeración de líneas (a la izquierda del editor)
+        self.gutter = Gutter(frame, self.text_area)
+        self.gutter.pack(side=tk.LEFT, fill=tk.Y, before=self.text_area)
         self.scrollbar.config(command=self.text_area.yview)
-        self.highlighter = SyntaxHighlighter(self.text_area)
+        self.highlighter = SyntaxHighlighter(
+            self.text_area,
+            token_cache=self.token_cache,
+            debounce_ms=self._highlight_debounce_ms,
+        )
 
     # Barra de estado (fila inferior)
     def _create_status_bar(self):
@@ -128,6 +181,23 @@ class IDEWindow:
         )
         self.status_file.pack(side=tk.RIGHT)
 
+        # Progreso y cancelación de la compilación (visibles solo mientras corre)
+        self.compile_box = tk.Frame(bar)
+        self.compile_progress = ttk.Progressbar(
+            self.compile_box, mode="indeterminate", length=100
+        )
+        self.compile_progress.pack(side=tk.LEFT, padx=4, pady=1)
+        self.compile_cancel_btn = tk.Button(
+            self.compile_box,
+            text="Cancelar",
+            relief=tk.FLAT,
+            padx=4,
+            pady=0,
+            cursor="hand2",
+            command=self.cancel_compile,
+        )
+        self.compile_cancel_btn.pack(side=tk.LEFT)
+
     # Bindings
     def _bind_keyboard_shortcuts(self):
         """Registra todos los atajos de teclado"""
@@ -151,16 +221,53 @@ class IDEWindow:
     def _bind_editor_events(self):
         """Bindings propios del área de texto."""
         self.text_area.bind("<<Modified>>", self._on_text_modified)
-        self.text_area.bind("<KeyRelease>", self._on_key_release_highlight)
-        self.text_area.bind("<ButtonRelease-1>", self._update_cursor_position)
-        self._update_line_numbers()
-        self._update_cursor_position()
+        self.text_area.bind("<KeyRelease>", self._on_key_release)
+        self.text_area.bind("<ButtonRelease-1>", self._on_key_release)
+        self.panels.tab_simbolos.bind("<Double-Button-1>", self._goto_symbol)
+        self._schedule(_GUTTER, _CURSOR)
+
+    def _schedule(self, *work: str):
+        """
+        Marca trabajo pendiente de la vista del editor y, si no hay uno ya,
+        programa _flush para el siguiente idle. Una tecla genera varios
+        eventos (<<Modified>>, scroll, <KeyRelease>); así todos se atienden
+        en una sola pasada.
+        """
+        self._dirty.update(work)
+        if self._flush_id is None:
+            self._flush_id = self.root.after_idle(self._flush)
+
+    def _flush(self):
+        """Ejecuta una vez el trabajo marcado desde el último idle."""
+        self._flush_id = None
+        dirty, self._dirty = self._dirty, set()
+        if _ERROR_MARKS in dirty:
+            self._apply_error_marks()
+            dirty.add(_GUTTER)
+        if _GUTTER in dirty:
+            self.gutter.redraw()
+        if _CURSOR in dirty:
+            self._update_cursor_position()
+        if _HIGHLIGHT in dirty:
+            self.highlighter.highlight()
+
+    def _apply_error_marks(self):
+        """Marca (o limpia) en el editor y en la numeración los errores de _last_errors_content."""
+        if self._last_errors_content:
+            self.highlighter.mark_errors(self._last_errors_content)
+            self.gutter.set_error_lines(
+                self.highlighter.error_lines(self._last_errors_content)
+            )
+        else:
+            self.highlighter.clear_error_marks()
+            self.gutter.clear_errors()
 
     def _on_yscroll(self, first: float, last: float) -> None:
         """Intercepta el scroll vertical del editor.
         Actualiza la scrollbar y sincroniza el canvas de números de línea."""
         self.scrollbar.set(first, last)
-        self._update_line_numbers()
+        self._schedule(_GUTTER)
+        self.highlighter.on_scroll()
 
     def _on_text_modified(self, event=None):
         """Se dispara via <<Modified>> cuando el contenido del editor cambia.
@@ -169,57 +276,38 @@ class IDEWindow:
         self.text_area.edit_modified(False)
         if self._suppress_modified:
             return
-        self._sync()
+        self._schedule(_GUTTER, _CURSOR, _HIGHLIGHT)
         # Limpiar marcas de error al detectar cualquier cambio de contenido
         if self._last_errors_content:
             self._last_errors_content = ""
-            self.highlighter.clear_error_marks()
-            self.line_numbers.delete("error_line")
+            self._schedule(_ERROR_MARKS)
         self._mark_as_modified()
 
-    def _sync(self, event=None):
-        self._update_line_numbers()
-        self._update_cursor_position()
-
     def _mark_as_modified(self):
         """Marca el documento como modificado y refleja el cambio en la UI."""
         if not self.state.is_modified:
             self.state.mark_modified()
             self._refresh_title_and_status()
 
-    def _update_line_numbers(self, event=None):
-        self.line_numbers.delete("all")
-        first_line = int(self.text_area.index("@0,0").split(".")[0])
-        last_line = int(
-            self.text_area.index(f"@0,{self.text_area.winfo_height()}").split(".")[0]
-        )
-        for line in range(first_line, last_line + 1):
-            dline = self.text_area.dlineinfo(f"{line}.0")
-            if dline:
-                y = dline[1]
-                self.line_numbers.create_text(18, y, anchor="nw", text=str(line))
-
-        # Redibujar las lineas de error si existen
-        if hasattr(self, "_last_errors_content") and self._last_errors_content:
-            self.highlighter.mark_error_lines(
-                self._last_errors_content, self.line_numbers
-            )
-
     def _update_cursor_position(self, event=None):
         pos = self.text_area.index(tk.INSERT)
         line, col = pos.split(".")
         self.status_cursor.config(text=f"Ln {line}, Col {int(col) + 1}")
 
-    def _on_key_release_highlight(self, event=None):
-        """Actualiza numeración, cursor y resaltado al soltar una tecla."""
-        self._update_line_numbers()
-        self._update_cursor_position()
-        self.highlighter.highlight()
+    def _on_key_release(self, event=None):
+        """
+        Tecla o clic: el cursor pudo moverse. Si además cambió el texto,
+        <<Modified>> ya marcó la numeración y el resaltado.
+        """
+        self._schedule(_CURSOR)
 
     # Callbacks inyectados en FileManager
     def _get_editor_content(self) -> str:
-        """Devuelve el texto del editor sin el '\n' final que añade tk.Text."""
-        return self.text_area.get("1.0", tk.END).rstrip("\n")
+        """
+        Devuelve el texto del editor sin el '\n' final que añade tk.Text (y
+        solo ese: el archivo guardado coincide con el texto de la TokenCache).
+        """
+        return self.text_area.get("1.0", "end-1c")
 
     def _set_editor_content(self, content: str):
         """Reemplaza el contenido completo del editor."""
@@ -230,9 +318,7 @@ class IDEWindow:
             False
         )  # Descartar el <<Modified>> generado al cargar
         self._suppress_modified = False
-        self._update_line_numbers()
-        self._update_cursor_position()
-        self.highlighter.highlight()
+        self._schedule(_GUTTER, _CURSOR, _HIGHLIGHT)
 
     def _on_title_update(self, path: str | None, modified: bool):
         """
@@ -309,6 +395,15 @@ class IDEWindow:
     def run_ejecutar(self):
         self._run_phase("ejecutar")
 
+    def cancel_compile(self):
+        """Cancela la compilación en curso (y la que estuviera en espera)."""
+        if not self._compiling():
+            return
+        self._pending_phase = None
+        self._compile_cancelled = True
+        self.compiler.cancel()
+        self.status_bar.config(text="\u23f3 Cancelando compilaci\u00f3n...", fg="#7f8c8d")
+
     def _run_phase(self, phase: str):
 
         # Guardar antes de compilar
@@ -324,22 +419,87 @@ class IDEWindow:
             )
             return
 
+        # Una petición nueva reemplaza a la que sigue corriendo: se cancela
+        # y la nueva arranca cuando el hilo anterior termine.
+        if self._compiling():
+            self._pending_phase = phase
+            self._compile_cancelled = True
+            self.compiler.cancel()
+            self.status_bar.config(
+                text=f"\u23f3 En espera: {phase.capitalize()}...", fg="#7f8c8d"
+            )
+            return
+
+        self._start_compile(phase)
+
+    def _compiling(self) -> bool:
+        return self._compile_thread is not None
+
+    def _start_compile(self, phase: str):
+        """Lanza la compilación de `phase` en un hilo secundario."""
         # Limpiar paneles
         self.panels.clear_all()
+        self._symbols = []
         self.status_bar.config(
             text=f"\u23f3 Ejecutando fase: {phase.capitalize()}...", fg="#7f8c8d"
         )
-        self.root.update_idletasks()  # Refrescar UI antes de bloquear
         # Limpiar marcas anteriores
-        self.highlighter.clear_error_marks()
-        self.line_numbers.delete("error_line")
+        self._last_errors_content = ""
+        self._schedule(_ERROR_MARKS)
 
-        # Ejecutar compilador
-        result = self.compiler.run(
-            source_file=self.state.current_file,
-            phase=phase,
+        self._compile_cancelled = False
+        self._compile_thread = threading.Thread(
+            target=self._compile_in_background,
+            args=(phase, self.state.current_file),
+            daemon=True,
         )
+        self._compile_thread.start()
+
+        self.compile_box.pack(side=tk.RIGHT, before=self.status_file)
+        self.compile_progress.start(15)
+        self.root.after(_POLL_MS, self._poll_compile)
+
+    def _compile_in_background(self, phase: str, source_file: str):
+        """
+        Cuerpo del hilo: no toca widgets, solo deja el resultado en la cola.
+        Siempre deja uno (aunque run() falle): _poll_compile lo espera para
+        liberar la compilación.
+        """
+        try:
+            result = self.compiler.run(source_file=source_file, phase=phase)
+        except Exception:  # noqa: BLE001
+            result = CompilerResult(
+                success=False,
+                returncode=-3,
+                stdout="",
+                stderr="[CompilerRunner] Error inesperado en el compilador:\n"
+                + traceback.format_exc(),
+                failed_phase="desconocido",
+            )
+        self._compile_results.put((phase, result))
+
+    def _poll_compile(self):
+        """Revisa (en el hilo de Tk) si llegó el resultado de la compilación."""
+        try:
+            phase, result = self._compile_results.get_nowait()
+        except queue.Empty:
+            self.root.after(_POLL_MS, self._poll_compile)
+            return
+
+        self._compile_thread = None
+        self.compile_progress.stop()
+        self.compile_box.pack_forget()
 
+        if self._pending_phase is not None:
+            phase, self._pending_phase = self._pending_phase, None
+            self._start_compile(phase)
+        elif self._compile_cancelled:
+            self.status_bar.config(text="Compilaci\u00f3n cancelada", fg="#7f8c8d")
+        else:
+            self._show_result(phase, result)
+
+    def _show_result(self, phase: str, result):
+        """Vuelca en la UI el resultado de una compilación terminada."""
         # Volcar salidas en paneles de resultados
         panel_map = {
             "lexico": self.panels.tab_lexico,
@@ -365,13 +525,26 @@ class IDEWindow:
             if content.strip():
                 self.panels.write(widget, content)
 
-        # stderr del proceso (error interno del compilador)
-
-        # Marcar errores en el editor
-        errors_content = result.errors_by_phase.get("err_lexico", "")
-        self._last_errors_content = errors_content
-        self.highlighter.mark_errors(errors_content)
-        self.highlighter.mark_error_lines(errors_content, self.line_numbers)
+        # Tabla de símbolos estructurada: se muestra en vez de symbols.txt
+        if result.symbols:
+            self._symbols = result.symbols
+            self.panels.write(self.panels.tab_simbolos, self._format_symbols(result.symbols))
+
+        # Métricas por fase (pestaña Rendimiento)
+        if result.metrics:
+            self.panels.write(self.panels.tab_rendimiento, self._format_metrics(result.metrics))
+
+        # Marcar errores en el editor (salvo que el texto haya cambiado
+        # mientras se compilaba: las líneas ya no corresponderían). Los de
+        # todas las fases: el sintáctico reporta todos los suyos de una pasada
+        errors_content = "\n".join(
+            result.errors_by_phase.get(key, "")
+            for key in ("err_lexico", "err_sintactico", "err_semantico")
+            if result.errors_by_phase.get(key, "").strip()
+        )
+        if not self.state.is_modified:
+            self._last_errors_content = errors_content
+            self._schedule(_ERROR_MARKS)
 
         # stderr del proceso (error interno del compilador)
         if result.stderr.strip():
@@ -383,19 +556,86 @@ class IDEWindow:
         # Navegar a la pestaña del resultado de esta fase
         self._focus_result_tab(phase, result.success)
 
-        # Actualizar barra de estado
+        # Actualizar barra de estado (con el tiempo total de las fases)
+        duracion = ""
+        if result.metrics:
+            total = sum(metrica["segundos"] for metrica in result.metrics)
+            duracion = f"  [{total * 1000:.1f} ms]"
+        if result.cached:
+            duracion = "  [sin cambios: resultado en cache]"
         if result.success:
             self.status_bar.config(
-                text=f"\u2714 Fase '{phase.capitalize()}' completada sin errores",
+                text=f"\u2714 Fase '{phase.capitalize()}' completada sin errores{duracion}",
                 fg="#27ae60",
             )
         else:
             fase_fallida = result.failed_phase or "desconocida"
             self.status_bar.config(
-                text=f"\u2716 Error en fase: {fase_fallida}  (c\u00f3d. {result.returncode})",
+                text=f"\u2716 Error en fase: {fase_fallida}  (c\u00f3d. {result.returncode}){duracion}",
                 fg="#c0392b",
             )
 
+    @staticmethod
+    def _format_metrics(metrics: list[dict]) -> str:
+        """Tabla de la pestaña Rendimiento: una fila por fase y el total."""
+        def celda(valor, formato: str = "d") -> str:
+            return "-" if valor is None else format(valor, formato)
+
+        filas = [
+            f"{'Fase':<12} {'Tiempo ms':>10} {'CPU ms':>9} {'Memoria KB':>11} "
+            f"{'Tokens':>8} {'Bytes':>9}",
+            "-" * 64,
+        ]
+        for metrica in metrics:
+            memoria = metrica.get("memoria_pico")
+            filas.append(
+                f"{metrica['fase']:<12} {metrica['segundos'] * 1000:>10.2f} "
+                f"{metrica['cpu_segundos'] * 1000:>9.2f} "
+                f"{celda(memoria and memoria / 1024, '.1f'):>11} "
+                f"{celda(metrica.get('tokens')):>8} {celda(metrica.get('bytes')):>9}"
+            )
+        filas.append("-" * 64)
+        filas.append(
+            f"{'Total':<12} {sum(m['segundos'] for m in metrics) * 1000:>10.2f} "
+            f"{sum(m['cpu_segundos'] for m in metrics) * 1000:>9.2f}"
+        )
+        if all(metrica.get("memoria_pico") is None for metrica in metrics):
+            filas.append("\n(Memoria: IDEWindow(measure_memory=True) para medirla)")
+        return "\n".join(filas) + "\n"
+
+    # Filas de encabezado de _format_symbols antes del primer símbolo
+    _SYMBOLS_HEADER = 3
+
+    @staticmethod
+    def _format_symbols(symbols: list[dict]) -> str:
+        """Tabla de la pestaña Simbolos: un símbolo por fila, indentado por nivel."""
+        filas = [
+            f"{'Nombre':<24} {'Tipo':<6} {'Ámbito':>6} {'Línea':>6} {'Col':>5} {'Usos':>5}",
+            "-" * 57,
+            "(doble clic en una fila: ir a la declaración)",
+        ]
+        for simbolo in symbols:
+            nombre = "  " * simbolo["nivel"] + simbolo["nombre"]
+            filas.append(
+                f"{nombre:<24} {simbolo['tipo']:<6} {simbolo['ambito']:>6} "
+                f"{simbolo['linea']:>6} {simbolo['columna']:>5} {simbolo['usos']:>5}"
+            )
+        return "\n".join(filas) + "\n"
+
+    def _goto_symbol(self, event):
+        """Doble clic en la pestaña Simbolos: cursor a la declaración del símbolo."""
+        fila = int(event.widget.index(f"@{event.x},{event.y}").split(".")[0])
+        indice = fila - 1 - self._SYMBOLS_HEADER
+        if not 0 <= indice < len(self._symbols):
+            return "break"
+        simbolo = self._symbols[indice]
+        posicion = f"{simbolo['linea']}.{simbolo['columna'] - 1}"
+        self.text_area.mark_set(tk.INSERT, posicion)
+        self.text_area.see(posicion)
+        self.text_area.focus_set()
+        self._schedule(_CURSOR)
+        return "break"
+
     # Navegación automática de pestañas tras compilar
     # Mapa fase → (notebook_attr, tab_widget_attr)
     _PHASE_TAB = {
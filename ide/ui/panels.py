@@ -67,6 +67,7 @@ class Panels:
         self.tab_semantico = self._make_result_tab("Semantico")
         self.tab_intermedio = self._make_result_tab("Intermedio")
         self.tab_simbolos = self._make_result_tab("Simbolos")
+        self.tab_rendimiento = self._make_result_tab("Rendimiento")
 
     #Panel inferior "Errores y ejecucion"
     def _build_bottom_panel(self):
@@ -122,7 +123,7 @@ class Panels:
 
         for widget in [
             self.tab_lexico, self.tab_sintactico, self.tab_semantico,
-            self.tab_intermedio, self.tab_simbolos,
+            self.tab_intermedio, self.tab_simbolos, self.tab_rendimiento,
             self.tab_err_lexico, self.tab_err_sintactico,
             self.tab_err_semantico, self.tab_ejecucion
         ]:
@@ -0,0 +1,2 @@
+# Pruebas del compilador CAOS
+# Se ejecutan desde la raíz del repositorio con: python -m pytest tests
@@ -0,0 +1,12 @@
+# Configuración de pytest: los módulos del compilador se importan como en
+# compiler_stub.py (lexer, sintactico, ... desde external_compiler/).
+
+import os
+import sys
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_EC_DIR = os.path.join(_RAIZ, "external_compiler")
+if _EC_DIR not in sys.path:
+    sys.path.insert(0, _EC_DIR)
+
+MUESTRA = os.path.join(_RAIZ, "ide", "samples", "TestIDE.caos")
@@ -0,0 +1,153 @@
+"""
+test_compilador.py
+------------------
+Parser con recuperación de errores, plegado de constantes del semántico y
+código intermedio (cuádruplos y grafo de flujo) sobre programas válidos y
+con errores.
+"""
+
+import compiler_stub
+from intermedio import GeneradorIntermedio, GrafoFlujo
+from lexer.dfa_lexer import DFALexer
+from semantico import AnalizadorSemantico
+from sintactico import Nodo, Parser
+
+from tests.conftest import MUESTRA
+
+
+def _parsear(source):
+    parser = Parser(DFALexer(engine="tabla").tokenize_buffer(source))
+    return parser.analizar(), parser.errores
+
+
+def _analizar(source):
+    arbol, errores = _parsear(source)
+    assert errores == []
+    analizador = AnalizadorSemantico(arbol)
+    analizador.analizar()
+    return analizador
+
+
+def _codigo(source, plegar=True):
+    generador = GeneradorIntermedio(_analizar(source), plegar=plegar)
+    codigo = generador.generar()
+    assert generador.errores == []
+    return [codigo.legible(i) for i in range(len(codigo))], GrafoFlujo(codigo)
+
+
+# -- Parser -----------------------------------------------------------------------
+
+def test_programa_valido():
+    arbol, errores = _parsear(
+        "main { int x, i; real a; cin x;"
+        " for (i = 0; i < x; i++) { a = a + i / 2.0; }"
+        " switch (x) { case 1 { cout \"uno\"; } default { cout x; } }"
+        " do x--; until (x <= 0); }"
+    )
+    assert errores == []
+    assert arbol.tipo(arbol.raiz) == Nodo.PROGRAMA
+    assert Nodo.ERROR not in arbol.tipos
+
+
+def test_todos_los_errores_en_una_pasada():
+    arbol, errores = _parsear("main { int x x = 1; while (x < ) { x++; } cout x }")
+    assert errores == [
+        "[SINTACTICO] Se esperaba ';' en línea 1, columna 14 — se encontró 'x'",
+        "[SINTACTICO] Se esperaba una expresión en línea 1, columna 32 — se encontró ')'",
+        "[SINTACTICO] Se esperaba ';' en línea 1, columna 50 — se encontró '}'",
+    ]
+    assert Nodo.ERROR in arbol.tipos
+
+
+def test_llave_sobrante():
+    _, errores = _parsear("main { int x; } }")
+    assert errores == [
+        "[SINTACTICO] Se esperaba fin de archivo después de '}' en línea 1, "
+        "columna 15 — se encontró '}'"
+    ]
+
+
+def test_testide_reporta_todos_los_errores():
+    with open(MUESTRA, encoding="utf-8") as f:
+        resultado = compiler_stub.compilar(f, "sintactico")
+    sintacticos = [e for e in resultado.errores if e.startswith("[SINTACTICO]")]
+    lineas = [int(e.split("línea ")[1].split(",")[0]) for e in sintacticos]
+    assert lineas == [1, 1, 1, 3, 20, 50]
+    assert resultado.fase_fallida == "lexico"
+    assert "parcial" in resultado.salidas["sintactico"]
+
+
+# -- Plegado de constantes ------------------------------------------------------------
+
+def test_plegado():
+    analizador = _analizar(
+        "main { int x; real a;"
+        " x = 2 + 3 * 4; a = 24.0+4-1/3*2+34-1; x = -7 / 2; x = 7 % -3;"
+        " if (4 > 2 && 1) then x = 1; end; }"
+    )
+    plegadas = {analizador.texto(n): analizador.valores[n] for n in analizador.plegadas}
+    assert plegadas == {
+        "2 + 3 * 4": 14,
+        "24.0+4-1/3*2+34-1": 61.0,
+        "-7 / 2": -3,          # la división entera trunca hacia cero
+        "7 % -3": 1,
+        "4 > 2 && 1": True,
+    }
+    assert analizador.errores == []
+
+
+def test_errores_de_tipos():
+    analizador = _analizar('main { int x; x = 32.32; x = "a" + 1; y = 1; }')
+    assert len(analizador.errores) == 3
+    assert "se asigna un valor real a 'x'" in analizador.errores[0]
+    assert "Operandos inválidos para '+'" in analizador.errores[1]
+    assert "'y'" in analizador.errores[2]
+
+
+# -- Código intermedio ------------------------------------------------------------
+
+def test_cuadruplos_de_un_ciclo():
+    lineas, grafo = _codigo("main { int x; cin x; while (x < 10) { x = x * 2 + 1; } cout x; }")
+    assert lineas == [
+        "cin x",
+        "L1:", "t1 = x < 10", "ifFalse t1 goto L2",
+        "t2 = x * 2", "x = t2 + 1", "goto L1",
+        "L2:", "cout x",
+    ]
+    assert len(grafo) == 4
+    assert [list(grafo.sucesores(b)) for b in range(len(grafo))] == [[1], [3, 2], [1], []]
+    assert [list(grafo.predecesores(b)) for b in range(len(grafo))] == [[], [0, 2], [1], [1]]
+
+
+def test_condicion_constante_elimina_la_rama():
+    lineas, grafo = _codigo("main { int y; if (2 > 3) then y = 5; else y = 6; end; }")
+    assert lineas == ["y = 6"]
+    assert len(grafo) == 1
+    sin_plegar, _ = _codigo("main { int y; if (2 > 3) then y = 5; else y = 6; end; }", plegar=False)
+    assert sin_plegar[0] == "t1 = 2 > 3"
+
+
+def test_switch_y_break():
+    lineas, grafo = _codigo(
+        "main { int x, y; cin x;"
+        " switch (x) { case 1 { y = 1; } case 2 { y = 2; break; } default { y = 3; } } }"
+    )
+    assert lineas == [
+        "cin x",
+        "t1 = x == 1", "if t1 goto L2",
+        "t2 = x == 2", "if t2 goto L3",
+        "goto L4",
+        "L2:", "y = 1", "goto L1",
+        "L3:", "y = 2", "goto L1",
+        "L4:", "y = 3", "goto L1",
+        "L1:",
+    ]
+    assert all(grafo.alcanzables())
+
+
+def test_break_fuera_de_ciclo():
+    generador = GeneradorIntermedio(_analizar("main { int x; break; x = 1; }"))
+    generador.generar()
+    assert generador.errores == [
+        "[INTERMEDIO] 'break' fuera de un ciclo o switch en línea 1, columna 15"
+    ]
@@ -0,0 +1,64 @@
+"""
+test_incremental.py
+-------------------
+DFALexer.retokenize contra un tokenize_buffer completo del texto editado,
+sobre ediciones aleatorias (con semilla fija) que abren y cierran
+comentarios de bloque, parten "++" / "==" con saltos de línea y dejan
+números como "32.".
+"""
+
+import random
+
+import pytest
+
+from lexer.dfa_lexer import DFALexer
+
+from tests.conftest import MUESTRA
+
+# Fragmentos que se insertan: los que cambian tokens lejos de la edición
+_FRAGMENTOS = [
+    "/*", "*/", "/* x */", "//", "+", "+\n", "\n+", "=", "=\n", "\n\n=",
+    "32.", "32.5", ".", "5", "x", " ", "\n", '"', "'", "@", "&&", "main",
+]
+
+
+def _filas(buffer):
+    return list(buffer.filas())
+
+
+def _editar(lexer, buffer, texto, rnd):
+    """Aplica una edición aleatoria; retorna (buffer incremental, texto nuevo)."""
+    inicio = rnd.randint(0, len(texto))
+    eliminados = rnd.randint(0, min(6, len(texto) - inicio))
+    insertado = "".join(rnd.choices(_FRAGMENTOS, k=rnd.randint(0, 3)))
+    nuevo = texto[:inicio] + insertado + texto[inicio + eliminados:]
+    return lexer.retokenize(buffer, inicio, eliminados, insertado, nuevo).tokens, nuevo
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_ediciones_aleatorias(semilla):
+    with open(MUESTRA, encoding="utf-8") as f:
+        texto = f.read()
+    lexer = DFALexer(engine="tabla")
+    rnd = random.Random(semilla)
+    buffer = lexer.tokenize_buffer(texto)
+    for paso in range(150):
+        buffer, texto = _editar(lexer, buffer, texto, rnd)
+        completo = lexer.tokenize_buffer(texto)
+        assert _filas(buffer) == _filas(completo), f"semilla {semilla}, edición {paso}"
+
+
+@pytest.mark.parametrize("texto, inicio, eliminados, insertado", [
+    ("a = 1;\nb = 2;\nc = 3;", 0, 0, "/*"),           # abre un comentario de bloque
+    ("/* a = 1;\nb = 2;\nc = 3;", 0, 2, ""),          # y lo vuelve a cerrar
+    ("x = 1;\n/* y */ z = 2;", 12, 2, ""),            # borra el cierre "*/"
+    ("x+\n\n+;", 1, 1, ""),                           # "+ \n\n +" deja de ser "++"
+    ("x\n\n=;", 1, 0, "="),                           # "=\n\n=" pasa a ser "=="
+    ("y = 32;", 6, 0, "."),                           # "32." malformado
+    ("y = 32.;", 7, 0, "5"),                          # y corregido
+])
+def test_ediciones_de_varias_lineas(texto, inicio, eliminados, insertado):
+    lexer = DFALexer(engine="tabla")
+    nuevo = texto[:inicio] + insertado + texto[inicio + eliminados:]
+    r = lexer.retokenize(lexer.tokenize_buffer(texto), inicio, eliminados, insertado, nuevo)
+    assert _filas(r.tokens) == _filas(lexer.tokenize_buffer(nuevo))